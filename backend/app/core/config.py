@@ -4,6 +4,98 @@ from functools import lru_cache
 class Settings:
     port: int = int(os.getenv("PORT", "8000"))
     model_path: str = os.getenv("MODEL_PATH", "./model/joblib_model.pkl")
+    # Micro-batching: gather up to N concurrent predictions or wait at most X ms
+    model_batch_max_size: int = int(os.getenv("MODEL_BATCH_MAX_SIZE", "32"))
+    model_batch_max_wait_ms: float = float(os.getenv("MODEL_BATCH_MAX_WAIT_MS", "2"))
+
+    # MongoDB connection + pool tuning (shared by the async and sync clients)
+    mongodb_uri: str = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+    mongodb_db: str = os.getenv("MONGODB_DB", "fyp")
+    mongodb_max_pool_size: int = int(os.getenv("MONGODB_MAX_POOL_SIZE", "100"))
+    mongodb_min_pool_size: int = int(os.getenv("MONGODB_MIN_POOL_SIZE", "0"))
+    mongodb_max_idle_time_ms: int = int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000"))
+    mongodb_wait_queue_timeout_ms: int = int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+    mongodb_server_selection_timeout_ms: int = int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    mongodb_connect_timeout_ms: int = int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000"))
+    # 0 = no socket timeout (driver default)
+    mongodb_socket_timeout_ms: int = int(os.getenv("MONGODB_SOCKET_TIMEOUT_MS", "0"))
+    # Indexes are created by scripts/migrate.py; opt in to (re)creating them on every worker start
+    mongodb_create_indexes_on_startup: bool = os.getenv("MONGODB_CREATE_INDEXES_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+
+    # Dashboard cache: fresh for TTL seconds, then served stale while refreshing
+    dashboard_cache_ttl: float = float(os.getenv("DASHBOARD_CACHE_TTL", "5"))
+    dashboard_cache_stale_ttl: float = float(os.getenv("DASHBOARD_CACHE_STALE_TTL", "60"))
+
+    # Scam gallery pages cache (seconds)
+    gallery_cache_ttl: float = float(os.getenv("GALLERY_CACHE_TTL", "30"))
+    gallery_cache_stale_ttl: float = float(os.getenv("GALLERY_CACHE_STALE_TTL", "300"))
+
+    # Maximum messages accepted by POST /classify/batch
+    classify_batch_max_messages: int = int(os.getenv("CLASSIFY_BATCH_MAX_MESSAGES", "10000"))
+    # POST /reports/bulk: maximum reports per request, and reports scored/written per batch
+    reports_bulk_max_items: int = int(os.getenv("REPORTS_BULK_MAX_ITEMS", "50000"))
+    reports_bulk_chunk_size: int = int(os.getenv("REPORTS_BULK_CHUNK_SIZE", "1000"))
+    # Request body caps (enforced while streaming, before buffering)
+    max_request_bytes: int = int(os.getenv("MAX_REQUEST_BYTES", str(50 * 1024 * 1024)))
+    screenshot_max_bytes: int = int(os.getenv("SCREENSHOT_MAX_BYTES", str(5 * 1024 * 1024)))
+    # Screenshot OCR process pool: workers, extra queued jobs before 503, per-job deadline (s)
+    ocr_workers: int = int(os.getenv("OCR_WORKERS") or os.cpu_count() or 1)
+    ocr_queue_size: int = int(os.getenv("OCR_QUEUE_SIZE", "8"))
+    ocr_timeout: float = float(os.getenv("OCR_TIMEOUT_SECONDS", "15"))
+
+    # Duplicate-screenshot cache: LRU size, perceptual (dHash) matching, Mongo-backed tier
+    screenshot_cache_size: int = int(os.getenv("SCREENSHOT_CACHE_SIZE", "1024"))
+    screenshot_cache_perceptual: bool = os.getenv("SCREENSHOT_CACHE_PERCEPTUAL", "false").lower() in ("1", "true", "yes")
+    screenshot_cache_max_distance: int = int(os.getenv("SCREENSHOT_CACHE_MAX_DISTANCE", "4"))
+    screenshot_cache_persist: bool = os.getenv("SCREENSHOT_CACHE_PERSIST", "false").lower() in ("1", "true", "yes")
+
+    # Background screenshot uploads: workers, attempts, exponential backoff (s), queue bound
+    upload_workers: int = int(os.getenv("UPLOAD_WORKERS", "2"))
+    upload_max_attempts: int = int(os.getenv("UPLOAD_MAX_ATTEMPTS", "5"))
+    upload_backoff_base: float = float(os.getenv("UPLOAD_BACKOFF_BASE", "0.5"))
+    upload_backoff_max: float = float(os.getenv("UPLOAD_BACKOFF_MAX", "30"))
+    upload_queue_size: int = int(os.getenv("UPLOAD_QUEUE_SIZE", "1000"))
+
+    # Prometheus instrumentation (request middleware + Mongo command listener)
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+    # Shared secret for /admin endpoints (X-Admin-Token); admin endpoints are off when unset
+    admin_token: str = os.getenv("ADMIN_TOKEN", "")
+
+    # Per-request sampling profiler (off unless enabled; see app.middleware.profiling)
+    profiling_enabled: bool = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+    profiling_sample_rate: float = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+    profiling_interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+    profiling_max_concurrent: int = int(os.getenv("PROFILING_MAX_CONCURRENT", "4"))
+    profiling_retention_hours: int = int(os.getenv("PROFILING_RETENTION_HOURS", "24"))
+
+    # In-memory filter of reported numbers; clean numbers skip the database
+    number_filter_enabled: bool = os.getenv("NUMBER_FILTER_ENABLED", "true").lower() in ("1", "true", "yes")
+    number_filter_fp_rate: float = float(os.getenv("NUMBER_FILTER_FP_RATE", "0.01"))
+    number_filter_sync_seconds: float = float(os.getenv("NUMBER_FILTER_SYNC_SECONDS", "5"))
+    number_filter_rebuild_seconds: float = float(os.getenv("NUMBER_FILTER_REBUILD_SECONDS", "3600"))
+
+    # Streaming anomaly detector and the GET /alerts feed
+    alerts_feed_size: int = int(os.getenv("ALERTS_FEED_SIZE", "1000"))
+    alerts_retention_hours: int = int(os.getenv("ALERTS_RETENTION_HOURS", "48"))
+
+    # Near-duplicate message campaigns (MinHash/LSH, see app.services.campaigns)
+    campaign_similarity: float = float(os.getenv("CAMPAIGN_SIMILARITY", "0.5"))
+    campaign_min_numbers: int = int(os.getenv("CAMPAIGN_MIN_NUMBERS", "3"))
+    campaigns_cache_ttl: float = float(os.getenv("CAMPAIGNS_CACHE_TTL", "30"))
+    campaigns_cache_stale_ttl: float = float(os.getenv("CAMPAIGNS_CACHE_STALE_TTL", "300"))
+
+    # Server-Sent Events feed at GET /live
+    live_tick_seconds: float = float(os.getenv("LIVE_TICK_SECONDS", "2"))
+    live_heartbeat_seconds: float = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+    live_client_buffer: int = int(os.getenv("LIVE_CLIENT_BUFFER", "256"))
+    live_send_timeout: float = float(os.getenv("LIVE_SEND_TIMEOUT", "10"))
+    live_max_subscribers: int = int(os.getenv("LIVE_MAX_SUBSCRIBERS", "1000"))
+
+    # Worker processes started by scripts/serve.py
+    web_concurrency: int = int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+    # Seconds between retries of a failed warmup step (GET /health/ready stays 503 meanwhile)
+    warmup_retry_seconds: float = float(os.getenv("WARMUP_RETRY_SECONDS", "2"))
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
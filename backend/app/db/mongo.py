@@ -1,27 +1,179 @@
 import os
-from typing import Optional
-from pymongo import MongoClient, ASCENDING
+from typing import Optional, Dict, Any, List, Tuple
+from pymongo import MongoClient, ASCENDING, DESCENDING
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorCollection
+from app.core.config import get_settings
+from app.services.metrics import mongo_command_metrics
 
+# Async client used by the API (never blocks the event loop)
+_async_client: Optional[AsyncIOMotorClient] = None
+# Sync client kept for CLI scripts (data loaders, migrations)
 _client: Optional[MongoClient] = None
+# Process that created the clients; a forked worker must not reuse its parent's pools
+_client_pid = os.getpid()
+
+REPORT_INDEXES = [
+    # Compound index serves per-number lookups sorted/windowed by created_at
+    [("number_key", ASCENDING), ("created_at", ASCENDING)],
+    [("created_at", ASCENDING)],
+    [("category", ASCENDING)],
+    # Campaign growth rates (app.services.campaigns)
+    [("campaign_id", ASCENDING), ("created_at", ASCENDING)],
+]
+
+NUMBER_STATS_INDEXES = [
+    # All-time leaderboard and windowed leaderboard refresh
+    [("total", DESCENDING)],
+    [("last_report_at", DESCENDING)],
+    # Reported-number filter sync
+    [("updated_at", ASCENDING)],
+    # Member rollups refreshed when their campaign gains numbers
+    [("campaign.id", ASCENDING)],
+]
+
+CAMPAIGNS_INDEXES = [
+    # LSH band lookups (multikey) and the /campaigns listing
+    [("bands", ASCENDING)],
+    [("last_seen", DESCENDING)],
+]
+
+CAMPAIGN_MEMBERS_INDEXES = [
+    # Campaigns of a number (rebuilding rollup campaign summaries)
+    [("number_key", ASCENDING)],
+]
+
+SCREENSHOT_CACHE_INDEXES = [
+    # Perceptual-hash lookups for re-encoded copies of cached screenshots
+    [("phash", ASCENDING), ("variant", ASCENDING)],
+]
+
+SCREENSHOTS_INDEXES = [
+    # Gallery pages: newest first within a folder, _id breaks created_at ties
+    [("folder", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+]
+
+def _pool_options() -> Dict[str, Any]:
+    settings = get_settings()
+    return {
+        "maxPoolSize": settings.mongodb_max_pool_size,
+        "minPoolSize": settings.mongodb_min_pool_size,
+        "maxIdleTimeMS": settings.mongodb_max_idle_time_ms,
+        "waitQueueTimeoutMS": settings.mongodb_wait_queue_timeout_ms,
+        "serverSelectionTimeoutMS": settings.mongodb_server_selection_timeout_ms,
+        "connectTimeoutMS": settings.mongodb_connect_timeout_ms,
+        "socketTimeoutMS": settings.mongodb_socket_timeout_ms or None,
+        # Per-collection command latency for /metrics
+        "event_listeners": [mongo_command_metrics] if settings.metrics_enabled else [],
+    }
+
+def _check_fork() -> None:
+    """Drop clients inherited from a parent process (pymongo clients are not fork-safe)."""
+    global _async_client, _client, _client_pid
+    if _client_pid != os.getpid():
+        # Not closed: the sockets still belong to the parent
+        _async_client = None
+        _client = None
+        _client_pid = os.getpid()
+
+def get_async_client() -> AsyncIOMotorClient:
+    global _async_client
+    _check_fork()
+    if _async_client is None:
+        _async_client = AsyncIOMotorClient(get_settings().mongodb_uri, **_pool_options())
+    return _async_client
 
 def get_client() -> MongoClient:
     global _client
+    _check_fork()
     if _client is None:
-        uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-        _client = MongoClient(uri)
-        _ensure_indexes(_client)
+        _client = MongoClient(get_settings().mongodb_uri, **_pool_options())
     return _client
 
-def _ensure_indexes(client: MongoClient):
-    db = client.get_database(_db_name())
-    reports = db.get_collection("reports")
-    # Index number + created_at for queries
-    reports.create_index([("number", ASCENDING)])
-    reports.create_index([("created_at", ASCENDING)])
-    reports.create_index([("category", ASCENDING)])
+def close_clients() -> None:
+    """Close this process's pools (API shutdown)."""
+    global _async_client, _client
+    _check_fork()
+    if _async_client is not None:
+        _async_client.close()
+        _async_client = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def index_plan() -> List[Tuple[str, Any, Dict[str, Any]]]:
+    """(collection, keys, options) for every index the app relies on."""
+    settings = get_settings()
+    plan = [("reports", keys, {}) for keys in REPORT_INDEXES]
+    plan += [("number_stats", keys, {}) for keys in NUMBER_STATS_INDEXES]
+    plan += [("screenshots", keys, {}) for keys in SCREENSHOTS_INDEXES]
+    plan += [("campaigns", keys, {}) for keys in CAMPAIGNS_INDEXES]
+    plan += [("campaign_members", keys, {}) for keys in CAMPAIGN_MEMBERS_INDEXES]
+    plan += [("screenshot_cache", keys, {"sparse": True}) for keys in SCREENSHOT_CACHE_INDEXES]
+    # Stored request profiles and anomaly alerts expire on their own
+    plan.append(("profiles", "created_at", {"expireAfterSeconds": settings.profiling_retention_hours * 3600}))
+    plan.append(("alerts", "created_at", {"expireAfterSeconds": settings.alerts_retention_hours * 3600}))
+    return plan
+
+def ensure_indexes() -> List[str]:
+    """Create every index with the sync client (scripts/migrate.py); returns the index names."""
+    db = get_client().get_database(_db_name())
+    return [db.get_collection(name).create_index(keys, **options) for name, keys, options in index_plan()]
+
+async def ensure_indexes_async() -> List[str]:
+    """Same as ensure_indexes, through the async client (API startup with MONGODB_CREATE_INDEXES_ON_STARTUP)."""
+    db = get_async_client().get_database(_db_name())
+    return [await db.get_collection(name).create_index(keys, **options) for name, keys, options in index_plan()]
 
 def _db_name() -> str:
-    return os.getenv("MONGODB_DB", "fyp")
+    return get_settings().mongodb_db
+
+def async_reports_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("reports")
+
+def async_number_stats_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("number_stats")
+
+def async_leaderboards_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("leaderboards")
+
+def async_counters_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("counters")
+
+def async_screenshot_cache_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("screenshot_cache")
+
+def async_upload_jobs_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("upload_jobs")
+
+def async_screenshots_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("screenshots")
+
+def async_profiles_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("profiles")
+
+def async_alerts_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("alerts")
+
+def async_campaigns_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("campaigns")
+
+def async_campaign_members_collection() -> AsyncIOMotorCollection:
+    return get_async_client().get_database(_db_name()).get_collection("campaign_members")
 
 def reports_collection():
-    return get_client().get_database(_db_name()).get_collection("reports")
\ No newline at end of file
+    return get_client().get_database(_db_name()).get_collection("reports")
+
+def number_stats_collection():
+    return get_client().get_database(_db_name()).get_collection("number_stats")
+
+def counters_collection():
+    return get_client().get_database(_db_name()).get_collection("counters")
+
+def screenshots_collection():
+    return get_client().get_database(_db_name()).get_collection("screenshots")
+
+def campaigns_collection():
+    return get_client().get_database(_db_name()).get_collection("campaigns")
+
+def campaign_members_collection():
+    return get_client().get_database(_db_name()).get_collection("campaign_members")
@@ -1,15 +1,90 @@
 from fastapi import FastAPI
 from dotenv import load_dotenv
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 load_dotenv()  # load environment variables from .env if present
 from app.routers.health import router as health_router
 from app.routers.classify import router as classify_router
 from app.routers.reports import router as reports_router
 from app.routers.sim_swap import router as sim_swap_router
 from app.routers.screenshot import router as screenshot_router
+from app.routers.uploads import router as uploads_router
+from app.routers.metrics import router as metrics_router
+from app.routers.admin import router as admin_router
+from app.routers.alerts import router as alerts_router
+from app.routers.campaigns import router as campaigns_router
+from app.routers.live import router as live_router
+from app.db.mongo import close_clients, ensure_indexes_async
+from app.core.config import get_settings
+from app.middleware.body_limit import BodyLimitMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.routers.screenshot import MULTIPART_OVERHEAD
+from app.services.trending import leaderboard_refresher
+from app.services.number_filter import number_filter_maintainer
+from app.services.live import live_ticker
+from app.services.model import model_server
+from app.services.ocr import ocr_service
+from app.services.storage import storage_service
+from app.services.uploads import upload_queue
+from app.services.metrics import mark_worker_exit
+from app.services.warmup import readiness, warm_up
 
-app = FastAPI(title="AI-Powered SIM Swap & Fake Number Verification Backend", version="0.0.1")
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Runs inside each worker process, so database/storage clients, pools and
+    # background tasks are created per worker (never inherited across a fork)
+    if settings.mongodb_create_indexes_on_startup:
+        try:
+            await ensure_indexes_async()
+        except Exception as e:
+            print(f"⚠️ Could not create MongoDB indexes: {e}")
+    try:
+        await ocr_service.start()
+    except Exception as e:
+        print(f"⚠️ Could not start OCR pool: {e}")
+    await upload_queue.start()
+    tasks = [
+        # Keep windowed trending boards fresh as reports age out of each window
+        asyncio.create_task(leaderboard_refresher()),
+        # Build the reported-number filter off the startup path; lookups use Mongo until it is ready
+        asyncio.create_task(number_filter_maintainer()),
+        # Shared computation behind the /live push feed
+        asyncio.create_task(live_ticker()),
+        # Model, pool and cache warmup; GET /health/ready answers 503 until it finishes
+        asyncio.create_task(warm_up()),
+    ]
+    try:
+        yield
+    finally:
+        readiness.drain()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await upload_queue.stop()
+        await model_server.stop()
+        ocr_service.stop()
+        close_clients()
+        mark_worker_exit()
+
+app = FastAPI(
+    title="AI-Powered SIM Swap & Fake Number Verification Backend",
+    version="0.0.1",
+    lifespan=lifespan,
+)
+
+# Reject oversized bodies on Content-Length / while streaming, before they are buffered.
+# Added before CORS so CORS wraps it and its 413s carry the CORS headers
+app.add_middleware(
+    BodyLimitMiddleware,
+    default_limit=settings.max_request_bytes,
+    path_limits={"/analyze-screenshot": settings.screenshot_max_bytes + MULTIPART_OVERHEAD},
+)
 
 # CORS configuration (allow frontend calls)
 origins_env = os.getenv("CORS_ORIGINS", "http://localhost:3000")
@@ -20,13 +95,38 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
+# Opt-in; not installed at all unless PROFILING_ENABLED
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.profiling_sample_rate,
+        interval_ms=settings.profiling_interval_ms,
+        admin_token=settings.admin_token or None,
+    )
+
+# Outermost, so 413s from the body limit are timed too
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
 app.include_router(health_router)
 app.include_router(classify_router)
 app.include_router(reports_router)
 app.include_router(sim_swap_router)
 app.include_router(screenshot_router)
+app.include_router(uploads_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(alerts_router)
+app.include_router(campaigns_router)
+app.include_router(live_router)
+
+if storage_service.local_dir:
+    # Serve the local storage stand-in like Supabase's public bucket URLs
+    os.makedirs(storage_service.local_dir, exist_ok=True)
+    app.mount("/local-storage", StaticFiles(directory=storage_service.local_dir), name="local-storage")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,76 @@
+"""
+ASGI middleware that caps request body sizes before they are buffered.
+
+Requests whose `Content-Length` exceeds the limit for their path are
+rejected with 413 without reading a byte of the body. Bodies without a
+length (chunked) or with a false one are counted as they stream in and the
+request is aborted with 413 as soon as the running total passes the limit.
+"""
+
+from typing import Dict, Optional
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+class BodyLimitMiddleware:
+    def __init__(self, app: ASGIApp, default_limit: Optional[int] = None, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.default_limit = default_limit
+        self.path_limits = path_limits or {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        limit = self.path_limits.get(scope["path"], self.default_limit)
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = _content_length(scope)
+        if content_length is not None and content_length > limit:
+            await _too_large(limit)(scope, receive, send)
+            return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # HTTPException passes through FastAPI's body parsing unchanged
+                    raise HTTPException(status_code=413, detail=_detail(limit))
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as e:
+            # Raised outside a route (no exception handler ran)
+            if e.status_code != 413 or response_started:
+                raise
+            await _too_large(limit)(scope, receive, send)
+
+def _content_length(scope: Scope) -> Optional[int]:
+    for name, value in scope["headers"]:
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+def _detail(limit: int) -> str:
+    return f"Request body too large. Maximum {limit // (1024 * 1024)}MB allowed."
+
+def _too_large(limit: int) -> JSONResponse:
+    # Close the connection: the unread body must not be parsed as a next request
+    return JSONResponse({"detail": _detail(limit)}, status_code=413, headers={"Connection": "close"})
@@ -0,0 +1,38 @@
+"""
+ASGI middleware recording request latency per route template and status.
+
+The route label is the matched path template (`/number/{number}`), never the
+raw path, so per-number URLs do not create new series; requests that match
+no route are labelled "unmatched".
+"""
+
+import time
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.metrics import HTTP_REQUEST_DURATION
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        finally:
+            # FastAPI stores the matched route in the (shared) scope while routing
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"], getattr(route, "path", "unmatched"), status,
+            ).observe(time.perf_counter() - start)
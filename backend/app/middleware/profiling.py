@@ -0,0 +1,81 @@
+"""
+ASGI middleware that runs selected requests under the sampling profiler.
+
+A request is profiled when it carries `X-Profile: 1` together with a valid
+`X-Admin-Token`, or when it is picked by `profiling_sample_rate`. Profiled
+responses get an `X-Profile-Id` header to fetch the result from
+/admin/profiles/{id}. The id is generated, except that admin-requested
+profiles use the `X-Request-ID` sent with them: a sampled request's own
+header could otherwise name (and overwrite) an existing profile.
+
+The middleware is only installed when PROFILING_ENABLED is set; unprofiled
+requests then pay for one header scan and one random() call.
+"""
+
+import asyncio
+import hmac
+import random
+import time
+import uuid
+from typing import Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.services.profiling import profile_store
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, sample_rate: float = 0.0, interval_ms: float = 5.0,
+                 admin_token: Optional[str] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.admin_token = admin_token.encode() if admin_token else None
+
+    def _trigger(self, scope: Scope) -> Optional[str]:
+        requested = authorized = False
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                requested = value == b"1"
+            elif name == b"x-admin-token":
+                authorized = self.admin_token is not None and hmac.compare_digest(value, self.admin_token)
+        if requested and authorized:
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+        # The request's own task, sampled until the response is sent
+        sampler = profile_store.begin(asyncio.current_task(), self.interval)
+        if sampler is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = (_request_id(scope) if trigger == "header" else None) or uuid.uuid4().hex
+        status = 500
+        start = time.perf_counter()
+
+        async def tagging_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tagging_send)
+        finally:
+            await profile_store.finish(
+                sampler, profile_id, scope["method"], scope["path"], status, time.perf_counter() - start, trigger,
+            )
+
+def _request_id(scope: Scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"x-request-id":
+            # Only ids that are safe to use as a key and in a URL
+            request_id = value.decode("latin-1")[:64]
+            if request_id and all(c.isalnum() or c in "-_" for c in request_id):
+                return request_id
+    return None
@@ -0,0 +1,41 @@
+import hmac
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+from app.core.config import get_settings
+from app.services.number_filter import reported_numbers
+from app.services.profiling import profile_store
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    token = get_settings().admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)], include_in_schema=False)
+
+@router.get("/profiles")
+async def list_profiles(limit: int = 50):
+    """Most recent request profiles (without their stacks)."""
+    profiles = await profile_store.recent(max(1, min(limit, 200)))
+    return [{**p, "created_at": p["created_at"].isoformat()} for p in profiles]
+
+@router.get("/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: Literal["collapsed", "json"] = "collapsed"):
+    """
+    One request's profile. `collapsed` (default) is plain text for
+    flamegraph.pl / speedscope; `json` includes the request metadata.
+    """
+    profile = await profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "json":
+        return {**profile, "created_at": profile["created_at"].isoformat()}
+    return PlainTextResponse(profile["collapsed"])
+
+@router.post("/number-filter/rebuild")
+async def rebuild_number_filter():
+    """Rebuild this worker's reported-number filter now (e.g. after a bulk load from the CLI)."""
+    await reported_numbers.rebuild()
+    return reported_numbers.stats()
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter
+from app.services.anomalies import anomaly_detector
+
+router = APIRouter()
+
+AlertFlag = Literal[
+    "spike", "burst", "repeated_message",
+    "recent_surge", "otp_focus", "high_prob_cluster", "victim_self_report", "multi_category_attack",
+]
+
+@router.get("/alerts")
+async def get_alerts(limit: int = 50, since: Optional[datetime] = None, flag: Optional[AlertFlag] = None):
+    """
+    Numbers that just raised an anomaly flag, newest first. Poll with
+    `since` set to the newest `created_at` already seen; `flag` keeps only
+    alerts that raised that flag.
+    """
+    limit = max(1, min(limit, 500))
+    alerts = await anomaly_detector.recent(limit, since, flag)
+    return {
+        "items": [{**a, "created_at": a["created_at"].isoformat()} for a in alerts],
+        "limit": limit,
+    }
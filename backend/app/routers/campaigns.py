@@ -0,0 +1,14 @@
+from typing import Optional
+from fastapi import APIRouter
+from app.services.campaigns import active_campaigns
+
+router = APIRouter()
+
+@router.get("/campaigns")
+async def get_campaigns(limit: int = 20, min_numbers: Optional[int] = None):
+    """
+    Clusters of near-duplicate scam texts sent from several numbers, most
+    recently active first, with member numbers, a sample text and growth.
+    """
+    limit = max(1, min(limit, 100))
+    return {"items": await active_campaigns(limit, min_numbers), "limit": limit}
@@ -1,6 +1,15 @@
 from fastapi import APIRouter
-from app.db.mongo import get_client
+from fastapi.responses import JSONResponse
+from app.db.mongo import get_async_client
 from app.services.storage import storage_service
+from app.services.anomalies import anomaly_detector
+from app.services.live import live_broadcaster
+from app.services.model import model_server
+from app.services.number_filter import reported_numbers
+from app.services.ocr import ocr_service
+from app.services.screenshot_cache import screenshot_cache
+from app.services.uploads import upload_queue
+from app.services.warmup import readiness
 
 router = APIRouter()
 
@@ -8,16 +17,46 @@ router = APIRouter()
 async def health():
     return {"status": "ok"}
 
+@router.get("/health/ready")
+async def health_ready():
+    """200 once this worker is warm (Mongo pool, model, number filter, caches); 503 while warming or draining."""
+    return JSONResponse(readiness.stats(), status_code=200 if readiness.ready else 503)
+
 @router.get("/health/db")
 async def health_db():
     try:
         # Simple ping to confirm DB connectivity
-        get_client().admin.command("ping")
+        await get_async_client().admin.command("ping")
         return {"status": "ok", "db": "connected"}
     except Exception as e:
         # Do not leak sensitive details; return brief message
         return {"status": "degraded", "db": "unreachable"}
 
+@router.get("/health/model")
+async def health_model():
+    """Model serving status plus micro-batching stats (batch sizes, queue latency)."""
+    return model_server.stats()
+
+@router.get("/health/number-filter")
+async def health_number_filter():
+    """Reported-number filter size, memory footprint, and expected vs observed false-positive rate."""
+    return reported_numbers.stats()
+
+@router.get("/health/alerts")
+async def health_alerts():
+    """Streaming anomaly detector: reports seen, alerts raised and alert_flags write conflicts."""
+    return anomaly_detector.stats()
+
+@router.get("/health/live")
+async def health_live():
+    """Live feed subscribers, events broadcast and slow-consumer disconnects."""
+    return live_broadcaster.stats()
+
+@router.get("/health/ocr")
+async def health_ocr():
+    """OCR pool occupancy, job outcomes (rejected = 503 fast-fails) and duplicate-cache hit rate."""
+    return {**ocr_service.stats(), "cache": screenshot_cache.stats()}
+
 @router.get("/health/storage")
 async def health_storage():
     """Check if Supabase storage is configured and accessible."""
@@ -37,7 +76,8 @@ async def health_storage():
             "status": "ok",
             "storage": "connected",
             "buckets": bucket_names,
-            "target_bucket": storage_service.bucket
+            "target_bucket": storage_service.bucket,
+            "uploads": upload_queue.stats()
         }
     except Exception as e:
         return {
@@ -0,0 +1,69 @@
+import asyncio
+from fastapi import APIRouter, HTTPException
+from starlette.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
+from app.core.config import get_settings
+from app.services.live import live_broadcaster, Subscriber
+
+router = APIRouter()
+
+class EventStream(StreamingResponse):
+    """
+    text/event-stream response fed from a live subscriber. Unlike a plain
+    StreamingResponse, a write that does not complete within `send_timeout`
+    drops the client instead of blocking on a stalled socket.
+    """
+
+    def __init__(self, subscriber: Subscriber, first: bytes, heartbeat: float, send_timeout: float):
+        super().__init__(
+            iter(()), media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+        self.subscriber = subscriber
+        self.first = first
+        self.heartbeat = heartbeat
+        self.send_timeout = send_timeout
+
+    async def _stream(self, send: Send) -> None:
+        chunk = self.first
+        while chunk is not None:
+            try:
+                await asyncio.wait_for(send({"type": "http.response.body", "body": chunk, "more_body": True}), self.send_timeout)
+            except asyncio.TimeoutError:
+                live_broadcaster.drop(self.subscriber, "send_timeout")
+                return
+            chunk = await self.subscriber.next_chunk(self.heartbeat)
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _wait_disconnect(self, receive: Receive) -> None:
+        while (await receive())["type"] != "http.disconnect":
+            pass
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        stream = asyncio.create_task(self._stream(send))
+        disconnect = asyncio.create_task(self._wait_disconnect(receive))
+        try:
+            await asyncio.wait({stream, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in (stream, disconnect):
+                task.cancel()
+            live_broadcaster.unsubscribe(self.subscriber)
+
+@router.get("/live")
+async def live():
+    """
+    Server-Sent Events: a `snapshot` (dashboard totals and top trending
+    numbers per window), then `report`/`reports`, `dashboard` and `trending`
+    delta events as they happen.
+    """
+    subscriber = live_broadcaster.subscribe()
+    if subscriber is None:
+        raise HTTPException(status_code=503, detail="Too many live subscribers, try again later")
+    try:
+        first = await live_broadcaster.snapshot()
+    except Exception:
+        live_broadcaster.unsubscribe(subscriber)
+        raise
+    settings = get_settings()
+    return EventStream(subscriber, first, settings.live_heartbeat_seconds, settings.live_send_timeout)
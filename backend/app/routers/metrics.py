@@ -0,0 +1,10 @@
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from app.services.metrics import registry
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of app.services.metrics (all workers when running several)."""
+    return Response(generate_latest(registry() or REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
-from app.services.risk import add_report, risk_score, trending, dashboard_summary
+import json
+import time
+from typing import Any, AsyncIterator, List, Literal, Tuple
+from fastapi import APIRouter, HTTPException, Request
+from pydantic import BaseModel, Field, ValidationError, field_validator
+from app.core.config import get_settings
+from app.routers.classify import NDJSON_CONTENT_TYPES
+from app.services.numbers import InvalidNumber, canonical_number
+from app.services.risk import add_report, add_reports, risk_score, dashboard_summary
+from app.services.trending import trending, DEFAULT_WINDOW, LEADERBOARD_SIZE
 
 router = APIRouter()
 
@@ -9,6 +16,12 @@ class ReportIn(BaseModel):
     category: str = Field(..., min_length=2, max_length=40)
     message: str = Field(..., min_length=4, max_length=2000)
 
+    @field_validator("number")
+    @classmethod
+    def valid_number(cls, value: str) -> str:
+        canonical_number(value)  # raises InvalidNumber (a ValueError) -> 422
+        return value
+
 class ReportOut(BaseModel):
     number: str
     category: str
@@ -19,7 +32,7 @@ class ReportOut(BaseModel):
 @router.post("/reports", response_model=ReportOut)
 async def create_report(payload: ReportIn):
     # Basic sanitation
-    entry = add_report(payload.number, payload.category.strip(), payload.message.strip())
+    entry = await add_report(payload.number, payload.category.strip(), payload.message.strip())
     return {
         "number": entry["number"],
         "category": entry["category"],
@@ -28,18 +41,144 @@ async def create_report(payload: ReportIn):
         "scam_probability": round(entry["scam_probability"], 3),
     }
 
+class BulkItemError(BaseModel):
+    index: int  # position in the JSON array, or 1-based line number for NDJSON
+    error: str
+
+class BulkReportResult(BaseModel):
+    received: int
+    inserted: int
+    failed: int
+    errors: List[BulkItemError]
+    elapsed_ms: float
+    reports_per_second: float
+
+def _validation_message(e: ValidationError) -> str:
+    err = e.errors()[0]
+    field = ".".join(str(part) for part in err["loc"])
+    return f"{field}: {err['msg']}" if field else err["msg"]
+
+def _validate(index: int, item: Any, ndjson: bool, valid: List[Tuple[int, ReportIn]],
+              errors: List[BulkItemError]) -> None:
+    try:
+        report = ReportIn.model_validate_json(item) if ndjson else ReportIn.model_validate(item)
+    except ValidationError as e:
+        errors.append(BulkItemError(index=index, error=_validation_message(e)))
+        return
+    valid.append((index, report))
+
+def _parse_bulk(body: bytes) -> Tuple[List[Tuple[int, ReportIn]], List[BulkItemError]]:
+    """Validate every item of a JSON array on its own; bad items are reported instead of failing the batch."""
+    try:
+        data = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid JSON body: {e}")
+    if not isinstance(data, list):
+        raise HTTPException(status_code=422, detail="Expected a JSON array of reports")
+
+    limit = get_settings().reports_bulk_max_items
+    if len(data) > limit:
+        raise HTTPException(status_code=413, detail=f"Too many reports. Maximum {limit} per request.")
+
+    valid: List[Tuple[int, ReportIn]] = []
+    errors: List[BulkItemError] = []
+    for index, item in enumerate(data):
+        _validate(index, item, False, valid, errors)
+    return valid, errors
+
+async def _ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """(1-based line number, line) for each non-blank line, read as the body streams in."""
+    line_no = 0
+    pending = b""
+    async for chunk in request.stream():
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+    if pending.strip():
+        yield line_no + 1, pending
+
+async def _store(chunk: List[Tuple[int, ReportIn]], errors: List[BulkItemError]) -> int:
+    """Score and write one chunk of valid reports; returns how many were stored."""
+    stored, write_errors = await add_reports(
+        [(r.number, r.category.strip(), r.message.strip()) for _, r in chunk]
+    )
+    errors.extend(BulkItemError(index=chunk[pos][0], error=msg) for pos, msg in write_errors)
+    return len(stored)
+
+@router.post("/reports/bulk", response_model=BulkReportResult)
+async def create_reports_bulk(request: Request):
+    """
+    Store many reports in one request.
+
+    Accepts a JSON array of ReportIn objects, or NDJSON (`application/x-ndjson`)
+    with one object per line. Invalid or unwritable items are listed in
+    `errors` and the rest are still stored.
+
+    NDJSON is validated line by line as the body arrives and written every
+    REPORTS_BULK_CHUNK_SIZE valid reports, so only one chunk is held in
+    memory. Lines past REPORTS_BULK_MAX_ITEMS are not read; the first of
+    them is listed in `errors` (the earlier ones are already stored).
+    """
+    started = time.perf_counter()
+    settings = get_settings()
+    chunk_size = settings.reports_bulk_chunk_size
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    errors: List[BulkItemError] = []
+    inserted = 0
+
+    if content_type in NDJSON_CONTENT_TYPES:
+        chunk: List[Tuple[int, ReportIn]] = []
+        items = 0
+        async for line_no, line in _ndjson_lines(request):
+            items += 1
+            if items > settings.reports_bulk_max_items:
+                errors.append(BulkItemError(
+                    index=line_no,
+                    error=f"Too many reports. Maximum {settings.reports_bulk_max_items} per request; "
+                          f"this and later lines were not read.",
+                ))
+                break
+            _validate(line_no, line, True, chunk, errors)
+            if len(chunk) >= chunk_size:
+                inserted += await _store(chunk, errors)
+                chunk = []
+        if chunk:
+            inserted += await _store(chunk, errors)
+    else:
+        valid, errors = _parse_bulk(await request.body())
+        for start in range(0, len(valid), chunk_size):
+            inserted += await _store(valid[start:start + chunk_size], errors)
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda e: e.index)
+    return BulkReportResult(
+        received=inserted + len(errors),
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors,
+        elapsed_ms=round(elapsed * 1000, 1),
+        reports_per_second=round(inserted / elapsed, 1) if elapsed > 0 else 0.0,
+    )
+
 @router.get("/number/{number}")
 async def get_number(number: str):
-    data = risk_score(number)
+    try:
+        data = await risk_score(number)
+    except InvalidNumber as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return data
 
 @router.get("/trending")
-async def get_trending(limit: int = 10):
+async def get_trending(limit: int = 10, window: Literal["1h", "24h", "7d", "all"] = DEFAULT_WINDOW):
+    limit = max(0, min(limit, LEADERBOARD_SIZE))
     return {
-        "items": trending(limit),
-        "limit": limit
+        "items": await trending(limit, window),
+        "limit": limit,
+        "window": window,
     }
 
 @router.get("/dashboard")
 async def get_dashboard():
-    return dashboard_summary()
\ No newline at end of file
+    return await dashboard_summary()
\ No newline at end of file
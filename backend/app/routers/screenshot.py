@@ -1,21 +1,21 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response
 from pydantic import BaseModel
-from typing import List, Optional
-import io
-import os
-from PIL import Image
-from app.services.storage import storage_service
-import pytesseract
-
-# Configure Tesseract path from environment variable (fallback to default Windows path)
-tesseract_path = os.getenv("TESSERACT_PATH", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
-if os.path.exists(tesseract_path):
-    pytesseract.pytesseract.tesseract_cmd = tesseract_path
-else:
-    print(f"⚠️ Tesseract not found at {tesseract_path}. OCR will not work.")
+from typing import List, Literal, Optional, Tuple
+from app.core.config import get_settings
+from app.services.uploads import upload_queue
+from app.services.scoring import analyze_text_for_scam, explain_score
+from app.services.model import model_server, HEURISTIC_MODEL_NAME
+from app.services.screenshot_cache import screenshot_cache, content_hash
+from app.services.gallery import gallery_page, InvalidCursor
+from app.services.metrics import SCORING_DURATION, observe
+from app.services.ocr import ocr_service, OCRBusy, OCRTimeout, InvalidImage, DEFAULT_OCR_MODE
 
 router = APIRouter()
 
+READ_CHUNK_SIZE = 64 * 1024
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
 class ScreenshotAnalysisResponse(BaseModel):
     extracted_text: str
     scam_probability: float
@@ -24,6 +24,8 @@ class ScreenshotAnalysisResponse(BaseModel):
     explanation: str
     image_url: Optional[str] = None
     storage_path: Optional[str] = None
+    upload_job_id: Optional[str] = None
+    cached: bool = False
 
 class ScamGalleryItem(BaseModel):
     name: str
@@ -31,211 +33,162 @@ class ScamGalleryItem(BaseModel):
     path: str
     created_at: Optional[str]
     size: int
+    scam_probability: Optional[float] = None
 
-# Enhanced scam keywords with weighted categories
-# HIGH priority keywords (stronger scam indicators)
-HIGH_PRIORITY_KEYWORDS = [
-    "congratulations", "won", "winner", "prize", "lottery", "lucky draw",
-    "claim now", "claim your", "expired", "expire soon", "urgent action",
-    "verify now", "verify immediately", "confirm now", "suspended account",
-    "blocked account", "unusual activity", "unauthorized", "click here immediately",
-    "limited time offer", "act now", "last chance", "Rs", "rupees",
-    "lakh", "crore", "million", "deposit", "withdraw"
-]
-
-# MEDIUM priority keywords (common in scams)
-MEDIUM_PRIORITY_KEYWORDS = [
-    "otp", "verify", "blocked", "suspended", "urgent", "reward", "offer",
-    "khalti", "esewa", "imepay", "fonepay", "bank", "account", "password", 
-    "pin", "code", "security", "update", "confirm", "click here", "link",
-    "whatsapp", "call", "contact", "number", "malik", "customer care"
-]
-
-# LOW priority keywords (context-dependent)
-LOW_PRIORITY_KEYWORDS = [
-    "message", "dear", "hello", "congratulation", "transfer", "payment",
-    "cash", "winner", "selected", "lucky"
-]
-
-# Suspicious patterns (regex-like checks)
-SUSPICIOUS_PATTERNS = [
-    "tap to learn more",
-    "call me",
-    "contact number",
-    "whatsapp number",
-    "lottery no",
-    "draw offer"
-]
-
-def extract_text_from_image(image_bytes: bytes) -> str:
+async def extract_text_from_image(image_bytes: bytes, mode: str = DEFAULT_OCR_MODE) -> str:
     """
-    Extract text from image using Tesseract OCR.
+    Validate the image and extract its text with Tesseract OCR (in the OCR worker pool).
     """
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        text = pytesseract.image_to_string(image)
-        return text.strip()
+        return await ocr_service.extract_text(image_bytes, mode)
+    except InvalidImage:
+        raise HTTPException(status_code=400, detail="Invalid image file")
+    except OCRBusy:
+        raise HTTPException(status_code=503, detail="OCR service is busy. Please retry shortly.", headers={"Retry-After": "2"})
+    except OCRTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"OCR extraction failed: {str(e)}")
 
-def analyze_text_for_scam(text: str) -> tuple[float, List[str], str]:
-    """Analyze extracted text for scam indicators with weighted scoring."""
-    if not text:
-        return 0.0, [], "No text could be extracted from the image. Please ensure the image is clear and contains readable text."
-    
-    text_lower = text.lower()
-    detected_keywords = []
-    score = 0.0
-    
-    # Check HIGH priority keywords (weight: 0.25 each)
-    for keyword in HIGH_PRIORITY_KEYWORDS:
-        if keyword in text_lower:
-            detected_keywords.append(keyword)
-            score += 0.25
-    
-    # Check MEDIUM priority keywords (weight: 0.15 each)
-    for keyword in MEDIUM_PRIORITY_KEYWORDS:
-        if keyword in text_lower and keyword not in detected_keywords:
-            detected_keywords.append(keyword)
-            score += 0.15
-    
-    # Check LOW priority keywords (weight: 0.08 each)
-    for keyword in LOW_PRIORITY_KEYWORDS:
-        if keyword in text_lower and keyword not in detected_keywords:
-            detected_keywords.append(keyword)
-            score += 0.08
-    
-    # Check suspicious patterns (weight: 0.20 each)
-    pattern_matches = 0
-    for pattern in SUSPICIOUS_PATTERNS:
-        if pattern in text_lower:
-            pattern_matches += 1
-            score += 0.20
-    
-    # Additional red flags
-    # Multiple phone numbers mentioned
-    import re
-    phone_pattern = r'\b\d{10,}\b'
-    phone_numbers = re.findall(phone_pattern, text)
-    if len(phone_numbers) >= 2:
-        score += 0.15
-        detected_keywords.append("multiple phone numbers")
-    
-    # Money amounts mentioned (Rs, lakh, crore)
-    if any(money in text_lower for money in ["rs", "rupees", "lakh", "crore"]):
-        score += 0.10
-    
-    # URLs or links
-    if "http" in text_lower or "www." in text_lower or ".com" in text_lower:
-        score += 0.15
-        detected_keywords.append("contains link")
-    
-    # Urgency indicators
-    urgency_words = ["urgent", "immediately", "now", "today", "expire", "last chance"]
-    urgency_count = sum(1 for word in urgency_words if word in text_lower)
-    if urgency_count >= 2:
-        score += 0.15
-        detected_keywords.append("urgency tactics")
-    
-    # Cap the score at 0.99
-    score = min(score, 0.99)
-    
-    # Generate explanation based on score
-    if score >= 0.75:
-        explanation = f"🚨 HIGH RISK: Strong scam indicators detected! Message contains {len(detected_keywords)} suspicious elements including high-priority scam keywords. This appears to be a lottery/prize scam. DO NOT respond, share OTPs, or click any links."
-    elif score >= 0.50:
-        explanation = f"⚠️ MEDIUM-HIGH RISK: Message contains {len(detected_keywords)} suspicious keywords and patterns. Likely a scam attempt. Verify through official channels only. Never share OTPs or personal information."
-    elif score >= 0.33:
-        explanation = f"⚠️ MEDIUM RISK: Message contains {len(detected_keywords)} suspicious keywords. Exercise caution and verify through official channels before taking any action."
-    else:
-        explanation = "✅ LOW RISK: Few scam indicators detected. However, always verify unsolicited messages through official channels."
-    
-    return score, detected_keywords[:15], explanation  # Return max 15 keywords for display
+def sniff_image_format(head: bytes) -> Optional[str]:
+    """Image format from the file's magic bytes (the client's content_type is not trusted)."""
+    if head.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+async def _read_image(file: UploadFile, max_bytes: int) -> Tuple[bytes, str]:
+    """Read an upload in chunks, failing as soon as it is not an image or exceeds max_bytes."""
+    head = await file.read(READ_CHUNK_SIZE)
+    image_format = sniff_image_format(head)
+    if image_format is None:
+        raise HTTPException(status_code=400, detail="Only JPG, PNG, WEBP images are supported")
+
+    contents = bytearray(head)
+    while True:
+        chunk = await file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        contents += chunk
+        if len(contents) > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum {max_bytes // (1024 * 1024)}MB allowed.")
+    return bytes(contents), image_format
+
+async def _analyze(contents: bytes, filename: str, mode: str) -> dict:
+    """OCR, score and store one screenshot (skipped entirely on a cache hit)."""
+    # Validate it's a valid image and extract text using OCR
+    extracted_text = await extract_text_from_image(contents, mode)
+    result = await _rescore(_score(extracted_text))
+
+    # Upload to Supabase Storage (if configured) in the background; the
+    # final image_url is available from GET /uploads/{job_id}
+    # Upload high-risk images (80%+) to special folder
+    is_high_risk = result["scam_probability"] >= 0.80
+    result["upload_job_id"] = await upload_queue.submit(
+        contents, filename, is_high_risk=is_high_risk,
+        metadata={"sha256": content_hash(contents), "scam_probability": result["scam_probability"]},
+    )
+    result["image_url"] = None
+    result["storage_path"] = None
+    return result
+
+def _score(extracted_text: str) -> dict:
+    # Analyze text (keywords always come from the heuristic; the probability
+    # comes from the model when one is loaded, see _rescore)
+    with observe(SCORING_DURATION, kind="screenshot"):
+        probability, keywords, explanation = analyze_text_for_scam(extracted_text)
+    return {
+        "extracted_text": extracted_text,
+        "scam_probability": probability,
+        "detected_keywords": keywords,
+        "explanation": explanation,
+        "model": HEURISTIC_MODEL_NAME,
+    }
+
+async def _rescore(result: dict) -> dict:
+    """Apply the loaded model's probability if the analysis came from another model."""
+    if result["model"] == model_server.name:
+        return result
+    if not model_server.loaded:
+        # Back to the heuristic (e.g. cached under a model that is no longer loaded)
+        return _score(result["extracted_text"])
+    # Keywords don't depend on the model; only the probability and its explanation change
+    result = {**result, "model": model_server.name}
+    if result["extracted_text"]:
+        result["scam_probability"] = await model_server.predict(result["extracted_text"])
+        result["explanation"] = explain_score(result["scam_probability"], result["detected_keywords"])
+    return result
+
+async def _with_upload(result: dict) -> dict:
+    """Fill in image_url/storage_path once the background upload has finished."""
+    if result["image_url"] or not result["upload_job_id"]:
+        return result
+    job = await upload_queue.status(result["upload_job_id"])
+    if job is None or job["status"] != "done":
+        return result
+    return {**result, "image_url": job["image_url"], "storage_path": job["storage_path"]}
+
+def _risk_level(probability: float) -> str:
+    # Determine risk level
+    if probability > 0.66:
+        return "HIGH"
+    elif probability > 0.33:
+        return "MEDIUM"
+    return "LOW"
 
 @router.post("/analyze-screenshot", response_model=ScreenshotAnalysisResponse)
-async def analyze_screenshot(file: UploadFile = File(...)):
+async def analyze_screenshot(file: UploadFile = File(...), mode: Literal["fast", "accurate"] = DEFAULT_OCR_MODE):
     """
     Analyze a screenshot for scam content using OCR + text classification.
     
     Steps:
-    1. Validate image format and size
-    2. Extract text using OCR
-    3. Analyze text for scam keywords and patterns
-    4. Return risk assessment
+    1. Validate image format (magic bytes) and size while reading
+    2. Return the stored analysis if this image was seen before (no OCR, no upload)
+    3. Extract text using OCR (off the event loop; 503 when the OCR pool is saturated)
+    4. Analyze text for scam keywords and patterns
+    5. Return risk assessment
+
+    `mode=fast` OCRs a lower-resolution image as one text block; `mode=accurate`
+    (default) uses higher resolution and full page layout analysis.
     """
-    # Validate file type
-    if file.content_type not in ["image/jpeg", "image/png", "image/webp"]:
-        raise HTTPException(status_code=400, detail="Only JPG, PNG, WEBP images are supported")
-    
-    # Read file
-    contents = await file.read()
-    
-    # Validate size (max 5MB)
-    if len(contents) > 5 * 1024 * 1024:
-        raise HTTPException(status_code=400, detail="File too large. Maximum 5MB allowed.")
-    
-    # Validate it's a valid image
-    try:
-        image = Image.open(io.BytesIO(contents))
-        image.verify()  # Verify it's a valid image
-    except Exception:
-        raise HTTPException(status_code=400, detail="Invalid image file")
-    
-    # Extract text using OCR
-    extracted_text = extract_text_from_image(contents)
-    
-    # Analyze text
-    probability, keywords, explanation = analyze_text_for_scam(extracted_text)
+    # Read file in chunks (capped) and validate its type from the magic bytes
+    contents, image_format = await _read_image(file, get_settings().screenshot_max_bytes)
     
-    # Determine risk level
-    if probability > 0.66:
-        risk_level = "HIGH"
-    elif probability > 0.33:
-        risk_level = "MEDIUM"
-    else:
-        risk_level = "LOW"
-    
-    # Upload to Supabase Storage (if configured)
-    image_url = None
-    storage_path = None
-    
-    if storage_service.is_available():
-        # Upload high-risk images (80%+) to special folder
-        is_high_risk = probability >= 0.80
-        
-        upload_result = storage_service.upload_screenshot(
-            file_bytes=contents,
-            filename=file.filename or "screenshot.jpg",
-            is_high_risk=is_high_risk
-        )
-        
-        if upload_result:
-            image_url = upload_result["url"]
-            storage_path = upload_result["path"]
+    result, cached = await screenshot_cache.get_or_analyze(
+        contents, lambda: _analyze(contents, f"screenshot.{image_format}", mode), variant=mode
+    )
+    rescored = await _with_upload(await _rescore(result))
+    if rescored is not result:
+        screenshot_cache.update(contents, rescored, variant=mode)
     
     return ScreenshotAnalysisResponse(
-        extracted_text=extracted_text,
-        scam_probability=probability,
-        risk_level=risk_level,
-        detected_keywords=keywords,
-        explanation=explanation,
-        image_url=image_url,
-        storage_path=storage_path
+        extracted_text=rescored["extracted_text"],
+        scam_probability=rescored["scam_probability"],
+        risk_level=_risk_level(rescored["scam_probability"]),
+        detected_keywords=rescored["detected_keywords"],
+        explanation=rescored["explanation"],
+        image_url=rescored["image_url"],
+        storage_path=rescored["storage_path"],
+        upload_job_id=rescored["upload_job_id"],
+        cached=cached
     )
 
 @router.get("/scam-gallery", response_model=List[ScamGalleryItem])
-async def get_scam_gallery(limit: int = 50):
+async def get_scam_gallery(response: Response, limit: int = 50, cursor: Optional[str] = None):
     """
-    Get collection of high-risk scam screenshots (80%+ probability).
+    Get collection of high-risk scam screenshots (80%+ probability), newest first.
     
-    This endpoint returns screenshots that have been flagged as high-risk
-    and saved to the 'high-risk' folder in Supabase Storage.
+    Served from the `screenshots` metadata collection (no storage API calls).
+    When more items exist, the `X-Next-Cursor` response header holds the
+    cursor for the next page: `/scam-gallery?cursor=...`.
     """
-    if not storage_service.is_available():
-        raise HTTPException(
-            status_code=503,
-            detail="Storage service not configured. Please set up Supabase credentials."
-        )
-    
-    screenshots = storage_service.list_high_risk_screenshots(limit=limit)
-    return screenshots
+    try:
+        items, next_cursor = await gallery_page(limit=limit, cursor=cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return items
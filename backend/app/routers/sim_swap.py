@@ -1,5 +1,6 @@
-from fastapi import APIRouter
-from app.services.risk import suspicious_activity_indicators, get_reports_for, normalize_number
+from fastapi import APIRouter, HTTPException
+from app.services.numbers import InvalidNumber
+from app.services.risk import suspicious_activity_indicators, normalize_number
 
 router = APIRouter()
 
@@ -9,8 +10,10 @@ async def suspicious_activity_check(number: str):
     Check for suspicious activity patterns that may indicate post-SIM-swap scam behavior.
     NOTE: This does NOT detect actual SIM swaps (requires telecom operator data).
     """
-    reports = get_reports_for(number)
-    data = suspicious_activity_indicators(number, reports)
+    try:
+        data = await suspicious_activity_indicators(number)
+    except InvalidNumber as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
         "number": normalize_number(number),
         **data
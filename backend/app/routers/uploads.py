@@ -0,0 +1,22 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Optional
+from app.services.uploads import upload_queue
+
+router = APIRouter()
+
+class UploadJobStatus(BaseModel):
+    job_id: str
+    status: str  # queued | uploading | retrying | done | failed
+    storage_path: Optional[str] = None
+    image_url: Optional[str] = None
+    attempts: int
+    error: Optional[str] = None
+
+@router.get("/uploads/{job_id}", response_model=UploadJobStatus)
+async def get_upload(job_id: str):
+    """Status of a background screenshot upload started by /analyze-screenshot."""
+    job = await upload_queue.status(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return job
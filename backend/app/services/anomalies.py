@@ -0,0 +1,154 @@
+"""
+Anomaly flag rules and the detector that raises alerts as reports arrive.
+
+The rules (spike/burst/repeated_message over the last hour, the SIM-swap
+indicators over the last 48h) are shared with the lookup path in
+app.services.risk, which evaluates them on a number's rollup snapshot.
+
+The detector evaluates the same rules on the rollup document that storing a
+report returns (`record_in_rollup`/`record_in_rollups`), i.e. on the shared
+state every worker writes to, so reports for one number spread across
+workers still add up to a spike. The flags a number last alerted on are
+kept on its rollup (`alert_flags`); a report that raises a flag not in that
+set publishes an alert to the feed served at GET /alerts. `alert_flags` is
+replaced with a compare-and-set, so when several workers see the same
+change only one of them alerts. When flags clear as reports age out, the
+stored set shrinks with the next report and the flag can alert again.
+
+Alerts are stored in the `alerts` collection (TTL-expired); the last
+ALERTS_FEED_SIZE alerts raised by this worker are kept in memory as a
+fallback for when Mongo is unavailable.
+"""
+
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+from app.core.config import get_settings
+from app.db.mongo import async_alerts_collection, async_number_stats_collection
+from app.services.metrics import ALERTS_RAISED
+from app.services.stats import snapshot_from_rollup
+
+# Possible post-SIM-swap activity needs at least this many surge flags
+SUSPICIOUS_MIN_FLAGS = 2
+# Rollup fields the detector reads (added to the projections in app.services.risk)
+ROLLUP_FIELDS = {"number": 1, "minutes": 1, "hours": 1, "alert_flags": 1}
+# Attempts at replacing a number's alert_flags when other workers keep changing it
+MAX_FLAG_UPDATES = 3
+
+def hour_flags(last_hour: Dict[str, int]) -> Dict[str, bool]:
+    """Flags over the last hour ({"count", "unique_messages"})."""
+    count = last_hour["count"]
+    return {
+        "spike": count >= 3,  # 3+ reports in last hour
+        "burst": count >= 5,  # stronger flag
+        "repeated_message": count > 1 and last_hour["unique_messages"] <= count / 2,
+    }
+
+def surge_flags(last_48h: Dict[str, Any]) -> Dict[str, bool]:
+    """SIM-swap indicator flags over the last 48h ({"count", "otp", "high_prob", "victim", "categories"})."""
+    count = last_48h["count"]
+    proportion_otp = (last_48h["otp"] / count) if count else 0.0
+    return {
+        "recent_surge": count >= 4,  # 4+ reports in 48h
+        "otp_focus": proportion_otp >= 0.5 and count >= 2,
+        "high_prob_cluster": last_48h["high_prob"] >= 3,
+        "victim_self_report": last_48h["victim"] > 0,
+        # Multiple scam types = coordinated attack
+        "multi_category_attack": len(last_48h["categories"]) >= 3 and count >= 4,
+    }
+
+def is_suspicious(flags: Dict[str, bool]) -> bool:
+    return sum(1 for v in flags.values() if v) >= SUSPICIOUS_MIN_FLAGS
+
+class AnomalyDetector:
+    def __init__(self, feed_size: int = 1000):
+        self._feed: Deque[Dict[str, Any]] = deque(maxlen=feed_size)
+        self.reports_seen = 0
+        self.alerts_raised = 0
+        self.flag_conflicts = 0
+
+    async def observe(self, rollups: List[Dict[str, Any]], reports: int = 0) -> List[Dict[str, Any]]:
+        """
+        Evaluate the flags on rollup documents just updated with new reports
+        (`reports` of them); returns (and publishes) any new alerts.
+        """
+        now = datetime.utcnow()
+        self.reports_seen += reports or len(rollups)
+        alerts = []
+        for rollup in rollups:
+            snapshot = snapshot_from_rollup(rollup["number"], rollup, now)
+            flags = {**hour_flags(snapshot["last_hour"]), **surge_flags(snapshot["last_48h"])}
+            raised = sorted(name for name, on in flags.items() if on)
+            new = await self._swap_flags(rollup["_id"], rollup.get("alert_flags"), raised)
+            if new:
+                alerts.append({
+                    "_id": uuid.uuid4().hex,
+                    "number": snapshot["number"],
+                    "number_key": rollup["_id"],
+                    "flags": raised,
+                    "new_flags": new,
+                    "suspicious_activity_detected": is_suspicious(surge_flags(snapshot["last_48h"])),
+                    "last_hour": snapshot["last_hour"],
+                    "last_48h": snapshot["last_48h"],
+                    "created_at": now,
+                })
+        if alerts:
+            await self._publish(alerts)
+        return alerts
+
+    async def _swap_flags(self, key: int, stored: Optional[List[str]], raised: List[str]) -> List[str]:
+        """Store `raised` as the number's alert_flags; returns the flags this call raised first."""
+        stats = async_number_stats_collection()
+        for _ in range(MAX_FLAG_UPDATES):
+            if stored == raised or (stored is None and not raised):
+                return []
+            # Only replaces the set read with the rollup; None also matches a missing field
+            result = await stats.update_one({"_id": key, "alert_flags": stored}, {"$set": {"alert_flags": raised}})
+            if result.modified_count:
+                return [flag for flag in raised if flag not in (stored or [])]
+            # Another worker stored a set in between: alert only on what it did not
+            self.flag_conflicts += 1
+            current = await stats.find_one({"_id": key}, {"alert_flags": 1})
+            stored = (current or {}).get("alert_flags")
+        return []
+
+    async def _publish(self, alerts: List[Dict[str, Any]]) -> None:
+        self._feed.extend(alerts)
+        self.alerts_raised += len(alerts)
+        for alert in alerts:
+            for flag in alert["new_flags"]:
+                ALERTS_RAISED.labels(flag).inc()
+        try:
+            await async_alerts_collection().insert_many(alerts, ordered=False)
+        except Exception as e:
+            print(f"⚠️ Could not persist {len(alerts)} alerts: {e}")
+
+    async def recent(self, limit: int = 50, since: Optional[datetime] = None,
+                     flag: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest alerts first, from all workers (this worker's own if Mongo is unavailable)."""
+        query: Dict[str, Any] = {}
+        if since is not None:
+            query["created_at"] = {"$gt": since}
+        if flag is not None:
+            query["new_flags"] = flag
+        try:
+            cursor = async_alerts_collection().find(query, {"number_key": 0}).sort("created_at", -1).limit(limit)
+            return await cursor.to_list(limit)
+        except Exception as e:
+            print(f"⚠️ Alert listing failed: {e}")
+            alerts = [
+                {k: v for k, v in a.items() if k != "number_key"} for a in reversed(self._feed)
+                if (since is None or a["created_at"] > since) and (flag is None or flag in a["new_flags"])
+            ]
+            return alerts[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "reports_seen": self.reports_seen,
+            "alerts_raised": self.alerts_raised,
+            # alert_flags changed by another worker between read and compare-and-set
+            "flag_conflicts": self.flag_conflicts,
+        }
+
+anomaly_detector = AnomalyDetector(feed_size=get_settings().alerts_feed_size)
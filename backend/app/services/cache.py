@@ -0,0 +1,95 @@
+"""
+In-process async cache with TTL and stale-while-revalidate refresh.
+
+Values younger than `ttl` are served as-is. Between `ttl` and
+`ttl + stale_ttl` the stale value is still served while a single background
+task reloads it. Older (or missing) values are loaded inline; concurrent
+callers for the same key share one load.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+Loader = Callable[[], Awaitable[Any]]
+
+class SWRCache:
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_entries: int = 128):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    async def get(self, key: Hashable, loader: Loader) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, loaded_at = entry
+            age = time.monotonic() - loaded_at
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return value
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._load(key, loader).add_done_callback(_log_refresh_error)
+                return value
+        self.misses += 1
+        return await asyncio.shield(self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Loader) -> asyncio.Task:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_loader(key, loader))
+            self._inflight[key] = task
+        return task
+
+    async def _run_loader(self, key: Hashable, loader: Loader) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def update(self, key: Hashable, fn: Callable[[Any], Any], stored_before: Optional[float] = None) -> None:
+        """
+        Apply a delta to a cached value in place, keeping its age.
+
+        With `stored_before` (a time.monotonic() reading), only a value stored
+        before then is updated: one loaded later may already include the change.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and (stored_before is None or entry[1] < stored_before):
+            self._entries[key] = (fn(entry[0]), entry[1])
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+def _log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        print(f"⚠️ Background cache refresh failed: {task.exception()}")
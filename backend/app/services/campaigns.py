@@ -0,0 +1,258 @@
+"""
+Near-duplicate message campaigns (MinHash + LSH).
+
+Scam campaigns send slightly varied texts ("Your a/c 1234 is blocked, call
+...") from many numbers. Each report message is normalized (lowercase,
+digit runs -> "0", URLs -> "url"), cut into character 4-gram shingles and
+reduced to a NUM_PERM-value MinHash signature; the fraction of equal
+signature values estimates the Jaccard similarity of two texts.
+
+Signatures are split into BANDS bands of ROWS values, and each band is
+hashed to an integer. A campaign document stores the band hashes of its
+first message in a multikey-indexed `bands` array, so finding candidate
+campaigns for a new message is one indexed `$in` query, however many
+campaigns exist. Candidates are then checked against CAMPAIGN_SIMILARITY
+on their stored signature; the message joins the most similar one or
+starts a new campaign.
+
+Collections:
+  * `campaigns`: {_id, signature, bands, sample, reports, number_count,
+    numbers (most recent members), first_seen, last_seen}
+  * `campaign_members`: one document per (campaign, number), so distinct
+    member counts stay exact without unbounded arrays
+  * reports carry `campaign_id` (indexed with created_at) for growth rates
+  * `number_stats` rollups carry `campaign`, a summary of the largest
+    campaign the number belongs to, so risk lookups read it with the rollup.
+    Members' summaries are refreshed when their campaign gains a number;
+    scripts/rebuild_number_stats.py restores them from `campaign_members`.
+
+Messages with fewer than MIN_SHINGLES shingles are too short to compare and
+are not assigned. Concurrent first sightings of a new text on different
+workers can start two campaigns; later variants join whichever is closer.
+"""
+
+import re
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import numpy as np
+from pymongo import UpdateMany, UpdateOne
+from app.core.config import get_settings
+from app.db.mongo import (
+    async_campaigns_collection, async_campaign_members_collection, async_number_stats_collection, async_reports_collection,
+)
+from app.services.cache import SWRCache
+
+NUM_PERM = 128
+BANDS = 32
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 4
+MIN_SHINGLES = 8
+# Members listed on a campaign document (all members are in campaign_members)
+SAMPLE_NUMBERS = 20
+
+# Universal hashes (a*x + b) mod P over 32-bit shingle hashes; fixed seed so
+# every worker computes the same signatures
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240101)
+_A = _rng.integers(1, 1 << 31, NUM_PERM, dtype=np.uint64)[:, None]
+_B = _rng.integers(0, 1 << 31, NUM_PERM, dtype=np.uint64)[:, None]
+
+_URLS = re.compile(r"(https?://|www\.)\S+")
+_DIGITS = re.compile(r"\d+")
+_NON_WORD = re.compile(r"[^\w]+")
+
+def normalize_message(message: str) -> str:
+    text = _URLS.sub(" url ", message.lower())
+    text = _DIGITS.sub("0", text)
+    return _NON_WORD.sub(" ", text).strip()
+
+def signature(message: str) -> Optional[np.ndarray]:
+    """MinHash signature of a message, or None if it is too short to compare."""
+    text = normalize_message(message)
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((_A * hashes + _B) % _PRIME).min(axis=1)
+
+def band_keys(sig: np.ndarray) -> List[int]:
+    """One integer per band: band index in the high bits, hash of its rows in the low 32."""
+    return [(band << 32) | zlib.crc32(sig[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+async def assign_campaigns(docs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Set `campaign_id` on each report document whose message belongs to an
+    existing or new campaign. Returns the campaigns started by this batch
+    (written by `record_campaigns` once the reports are stored).
+    """
+    threshold = get_settings().campaign_similarity
+    by_text: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for doc in docs:
+        by_text[normalize_message(doc["message"])].append(doc)
+
+    signed = []
+    for group in by_text.values():
+        sig = signature(group[0]["message"])
+        if sig is not None:
+            signed.append((group, sig, band_keys(sig)))
+    if not signed:
+        return {}
+
+    # Candidate campaigns: anything sharing at least one band with a message in the batch
+    all_bands = list({key for _, _, bands in signed for key in bands})
+    signatures: Dict[str, np.ndarray] = {}
+    by_band: Dict[int, List[str]] = defaultdict(list)
+    cursor = async_campaigns_collection().find({"bands": {"$in": all_bands}}, {"signature": 1, "bands": 1})
+    async for campaign in cursor:
+        signatures[campaign["_id"]] = np.array(campaign["signature"], dtype=np.uint64)
+        for key in campaign["bands"]:
+            by_band[key].append(campaign["_id"])
+
+    started: Dict[str, Dict[str, Any]] = {}
+    for group, sig, bands in signed:
+        candidates = {cid for key in bands for cid in by_band.get(key, ())}
+        best, best_score = None, threshold
+        for cid in candidates:
+            score = similarity(sig, signatures[cid])
+            if score >= best_score:
+                best, best_score = cid, score
+        if best is None:
+            best = uuid.uuid4().hex[:16]
+            started[best] = {"signature": sig.tolist(), "bands": bands, "sample": group[0]["message"]}
+            signatures[best] = sig
+            for key in bands:
+                by_band[key].append(best)
+        for doc in group:
+            doc["campaign_id"] = best
+    return started
+
+async def record_campaigns(docs: List[Dict[str, Any]], started: Dict[str, Dict[str, Any]]) -> None:
+    """Count stored reports into their campaigns and add new member numbers."""
+    by_campaign: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for doc in docs:
+        if "campaign_id" in doc:
+            by_campaign[doc["campaign_id"]].append(doc)
+    if not by_campaign:
+        return
+
+    # Upserts that insert tell us which numbers are new members
+    member_ops = []
+    member_of = []
+    for cid, reports in by_campaign.items():
+        for key in {doc["number_key"] for doc in reports}:
+            member_ops.append(UpdateOne(
+                {"_id": f"{cid}:{key}"},
+                {"$setOnInsert": {"campaign": cid, "number_key": key, "joined_at": reports[0]["created_at"]}},
+                upsert=True,
+            ))
+            member_of.append((cid, key))
+    result = await async_campaign_members_collection().bulk_write(member_ops, ordered=False)
+    display = {doc["number_key"]: doc["number"] for doc in docs}
+    new_members: Dict[str, List[str]] = defaultdict(list)
+    for index in result.upserted_ids:
+        cid, key = member_of[index]
+        new_members[cid].append(display[key])
+
+    ops = []
+    for cid, reports in by_campaign.items():
+        first = min(doc["created_at"] for doc in reports)
+        update: Dict[str, Any] = {
+            "$inc": {"reports": len(reports), "number_count": len(new_members.get(cid, ()))},
+            "$min": {"first_seen": first},
+            "$max": {"last_seen": max(doc["created_at"] for doc in reports)},
+        }
+        if cid in started:
+            update["$setOnInsert"] = started[cid]
+        if new_members.get(cid):
+            update["$push"] = {"numbers": {"$each": new_members[cid], "$slice": -SAMPLE_NUMBERS}}
+        ops.append(UpdateOne({"_id": cid}, update, upsert=cid in started))
+    await async_campaigns_collection().bulk_write(ops, ordered=False)
+    await _record_in_rollups(by_campaign, set(new_members))
+
+def campaign_summary(campaign: Dict[str, Any]) -> Dict[str, Any]:
+    """The `campaign` field of a member number's rollup, as returned by risk lookups."""
+    return {
+        "id": campaign["_id"],
+        "numbers": campaign["number_count"],
+        "reports": campaign["reports"],
+        "sample_text": campaign["sample"],
+    }
+
+def replaceable_campaign(summary: Dict[str, Any]) -> Dict[str, Any]:
+    """Rollup filter: no campaign yet, or one no larger than `summary`."""
+    return {"$or": [{"campaign": None}, {"campaign.numbers": {"$lte": summary["numbers"]}}]}
+
+async def _record_in_rollups(by_campaign: Dict[str, List[Dict[str, Any]]], grown: set) -> None:
+    """Store the updated campaigns on the rollups of the reporting numbers (and of all members of grown ones)."""
+    cursor = async_campaigns_collection().find(
+        {"_id": {"$in": list(by_campaign)}}, {"number_count": 1, "reports": 1, "sample": 1},
+    )
+    ops = []
+    async for campaign in cursor:
+        summary = campaign_summary(campaign)
+        keys = list({doc["number_key"] for doc in by_campaign[campaign["_id"]]})
+        ops.append(UpdateMany({"_id": {"$in": keys}, **replaceable_campaign(summary)}, {"$set": {"campaign": summary}}))
+        if campaign["_id"] in grown:
+            ops.append(UpdateMany({"campaign.id": campaign["_id"]}, {"$set": {"campaign": summary}}))
+    if ops:
+        await async_number_stats_collection().bulk_write(ops, ordered=False)
+
+async def _load_campaigns(limit: int, min_numbers: int) -> List[Dict[str, Any]]:
+    now = datetime.utcnow()
+    cursor = (
+        async_campaigns_collection()
+        .find({"number_count": {"$gte": min_numbers}}, {"signature": 0, "bands": 0})
+        .sort("last_seen", -1)
+        .limit(limit)
+    )
+    campaigns = await cursor.to_list(limit)
+    # Growth from the campaign's reports over the last day (campaign_id, created_at index)
+    hour_ago, day_ago = now - timedelta(hours=1), now - timedelta(hours=24)
+    growth = {}
+    pipeline = [
+        {"$match": {"campaign_id": {"$in": [c["_id"] for c in campaigns]}, "created_at": {"$gte": day_ago}}},
+        {"$group": {
+            "_id": "$campaign_id",
+            "last_24h": {"$sum": 1},
+            "last_hour": {"$sum": {"$cond": [{"$gte": ["$created_at", hour_ago]}, 1, 0]}},
+        }},
+    ]
+    async for row in async_reports_collection().aggregate(pipeline):
+        growth[row["_id"]] = row
+    items = []
+    for c in campaigns:
+        g = growth.get(c["_id"], {})
+        last_24h, last_hour = g.get("last_24h", 0), g.get("last_hour", 0)
+        items.append({
+            "id": c["_id"],
+            "sample_text": c["sample"],
+            "numbers": c.get("numbers", []),
+            "number_count": c["number_count"],
+            "reports": c["reports"],
+            "first_seen": c["first_seen"].isoformat(),
+            "last_seen": c["last_seen"].isoformat(),
+            "reports_last_hour": last_hour,
+            "reports_last_24h": last_24h,
+            # Reports per hour over the last day, and the last hour relative to that pace
+            "growth_per_hour": round(last_24h / 24, 3),
+            "acceleration": round(last_hour / (last_24h / 24), 3) if last_24h else 0.0,
+        })
+    return items
+
+_campaigns_cache = SWRCache(
+    ttl=get_settings().campaigns_cache_ttl,
+    stale_ttl=get_settings().campaigns_cache_stale_ttl,
+    max_entries=64,
+)
+
+async def active_campaigns(limit: int = 20, min_numbers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Most recently active campaigns spanning at least `min_numbers` numbers."""
+    min_numbers = get_settings().campaign_min_numbers if min_numbers is None else min_numbers
+    return await _campaigns_cache.get((limit, min_numbers), lambda: _load_campaigns(limit, min_numbers))
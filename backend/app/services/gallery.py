@@ -0,0 +1,96 @@
+"""
+Scam gallery served from the `screenshots` metadata collection.
+
+Every stored screenshot gets a metadata document (path, URL, size, hash,
+score, created_at) when its background upload completes. Gallery pages are
+one indexed range query on (folder, created_at, _id) with an opaque cursor
+pointing at the last item of the previous page, and are cached briefly, so
+listing the gallery never touches the storage API.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+from app.db.mongo import async_screenshots_collection
+from app.services.cache import SWRCache
+from app.services.storage import HIGH_RISK_FOLDER
+
+MAX_PAGE_SIZE = 100
+
+_gallery_cache = SWRCache(
+    ttl=get_settings().gallery_cache_ttl,
+    stale_ttl=get_settings().gallery_cache_stale_ttl,
+    max_entries=256,
+)
+
+class InvalidCursor(ValueError):
+    pass
+
+def encode_cursor(doc: Dict[str, Any]) -> str:
+    raw = f"{doc['created_at'].isoformat()}|{doc['_id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, _id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), _id
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+def screenshot_document(storage_path: str, url: str, size: int, metadata: Dict[str, Any], created_at: datetime) -> Dict[str, Any]:
+    return {
+        "_id": storage_path,
+        "name": storage_path.rsplit("/", 1)[-1],
+        "path": storage_path,
+        "folder": storage_path.split("/", 1)[0],
+        "url": url,
+        "size": size,
+        "sha256": metadata.get("sha256"),
+        "scam_probability": metadata.get("scam_probability"),
+        "created_at": created_at,
+    }
+
+async def record_screenshot(doc: Dict[str, Any]) -> None:
+    """Store metadata for an uploaded screenshot (idempotent per storage path)."""
+    await async_screenshots_collection().update_one({"_id": doc["_id"]}, {"$setOnInsert": doc}, upsert=True)
+    if doc["folder"] == HIGH_RISK_FOLDER:
+        # New items land on the first page; drop cached pages in this worker
+        _gallery_cache.invalidate()
+
+async def _load_page(limit: int, cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    query: Dict[str, Any] = {"folder": HIGH_RISK_FOLDER}
+    if cursor:
+        created_at, _id = decode_cursor(cursor)
+        query["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": _id}},
+        ]
+    docs = await (
+        async_screenshots_collection()
+        .find(query, {"sha256": 0})
+        .sort([("created_at", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(limit + 1)
+    )
+    next_cursor = encode_cursor(docs[limit - 1]) if len(docs) > limit else None
+    items = [
+        {
+            "name": d["name"],
+            "url": d["url"],
+            "path": d["path"],
+            "created_at": d["created_at"].isoformat(),
+            "size": d.get("size", 0),
+            "scam_probability": d.get("scam_probability"),
+        }
+        for d in docs[:limit]
+    ]
+    return items, next_cursor
+
+async def gallery_page(limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Newest high-risk screenshots first; returns (items, next_cursor)."""
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    if cursor:
+        decode_cursor(cursor)  # validate before caching anything under it
+    return await _gallery_cache.get((limit, cursor), lambda: _load_page(limit, cursor))
@@ -0,0 +1,211 @@
+"""
+Server-pushed live updates for the dashboard and trending boards (GET /live).
+
+One shared computation feeds every subscriber:
+  * `report` / `reports` events are published by add_report/add_reports on
+    this worker as reports are stored
+  * a ticker, running only while someone is subscribed, reads the report
+    counters and the leaderboards once every LIVE_TICK_SECONDS (a handful of
+    point reads) and publishes `dashboard` and `trending` deltas when they
+    changed, so reports taken by any worker show up
+
+Each event is serialized once and appended to every subscriber's bounded
+buffer. A subscriber whose buffer overflows, or whose socket does not take
+a write within LIVE_SEND_TIMEOUT, is disconnected (clients reconnect and get
+a fresh snapshot). Idle streams get an SSE comment every
+LIVE_HEARTBEAT_SECONDS so proxies keep them open.
+"""
+
+import asyncio
+import json
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set
+from app.core.config import get_settings
+from app.db.mongo import async_counters_collection, async_leaderboards_collection
+from app.services.metrics import LIVE_SUBSCRIBERS, LIVE_EVENTS, LIVE_DISCONNECTS
+from app.services.stats import category_counts, REPORT_COUNTERS_ID
+from app.services.trending import WINDOWS
+
+# Positions per board carried in snapshots and trending deltas
+TRENDING_SIZE = 20
+HEARTBEAT = b": ping\n\n"
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Not JSON serializable: {type(value).__name__}")
+
+class Subscriber:
+    __slots__ = ("buffer", "wake", "closed", "reason")
+
+    def __init__(self):
+        self.buffer: Deque[bytes] = deque()
+        self.wake = asyncio.Event()
+        self.closed = False
+        self.reason: Optional[str] = None
+
+    def close(self, reason: str) -> None:
+        self.closed = True
+        self.reason = reason
+        self.buffer.clear()
+        self.wake.set()
+
+    async def next_chunk(self, heartbeat: float) -> Optional[bytes]:
+        """Next encoded event, a heartbeat after `heartbeat` idle seconds, or None once closed."""
+        while not self.buffer:
+            if self.closed:
+                return None
+            self.wake.clear()
+            try:
+                await asyncio.wait_for(self.wake.wait(), heartbeat)
+            except asyncio.TimeoutError:
+                return HEARTBEAT
+        return self.buffer.popleft()
+
+class LiveBroadcaster:
+    def __init__(self, buffer_size: int = 256, max_subscribers: int = 1000):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscriber] = set()
+        self._seq = 0
+        self.events = 0
+        self.slow_disconnects = 0
+        # Last state seen by the ticker, to publish only what changed
+        self._counters: Optional[Dict[str, Any]] = None
+        self._boards: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Optional[Subscriber]:
+        if len(self._subscribers) >= self.max_subscribers:
+            return None
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        LIVE_SUBSCRIBERS.set(len(self._subscribers))
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+        LIVE_SUBSCRIBERS.set(len(self._subscribers))
+
+    def drop(self, subscriber: Subscriber, reason: str) -> None:
+        """Disconnect a subscriber that cannot keep up."""
+        subscriber.close(reason)
+        self.unsubscribe(subscriber)
+        self.slow_disconnects += 1
+        LIVE_DISCONNECTS.labels(reason).inc()
+
+    def encode(self, event: str, data: Any) -> bytes:
+        self._seq += 1
+        payload = json.dumps(data, default=_json_default, separators=(",", ":"))
+        return f"id: {self._seq}\nevent: {event}\ndata: {payload}\n\n".encode()
+
+    def publish(self, event: str, data: Any) -> None:
+        """Serialize once and queue for every subscriber; O(1) work per subscriber."""
+        if not self._subscribers:
+            return
+        chunk = self.encode(event, data)
+        self.events += 1
+        LIVE_EVENTS.labels(event).inc()
+        for subscriber in list(self._subscribers):
+            if len(subscriber.buffer) >= self.buffer_size:
+                self.drop(subscriber, "buffer_full")
+                continue
+            subscriber.buffer.append(chunk)
+            subscriber.wake.set()
+
+    def publish_reports(self, docs: List[Dict[str, Any]]) -> None:
+        if not self._subscribers or not docs:
+            return
+        if len(docs) == 1:
+            doc = docs[0]
+            self.publish("report", {
+                "number": doc["number"],
+                "category": doc["category"],
+                "scam_probability": round(doc.get("scam_probability", 0.0), 3),
+                "created_at": doc["created_at"],
+            })
+            return
+        categories: Dict[str, int] = {}
+        for doc in docs:
+            categories[doc["category"]] = categories.get(doc["category"], 0) + 1
+        self.publish("reports", {"count": len(docs), "categories": categories})
+
+    async def _read_state(self):
+        counters = await async_counters_collection().find_one({"_id": REPORT_COUNTERS_ID}) or {}
+        boards = {}
+        async for doc in async_leaderboards_collection().find({"_id": {"$in": WINDOWS}}):
+            boards[doc["_id"]] = doc.get("items", [])[:TRENDING_SIZE]
+        return {"total_reports": counters.get("total", 0), "categories": category_counts(counters)}, boards
+
+    async def snapshot(self) -> bytes:
+        """Current dashboard and boards, sent first to every new subscriber."""
+        counters, boards = await self._read_state()
+        return self.encode("snapshot", {
+            "total_reports": counters["total_reports"],
+            "category_distribution": counters["categories"],
+            "trending": {window: boards.get(window, []) for window in WINDOWS},
+        })
+
+    async def tick(self) -> None:
+        """Publish what changed in the counters and boards since the last tick."""
+        counters, boards = await self._read_state()
+        previous = self._counters
+        if previous is not None and counters["total_reports"] != previous["total_reports"]:
+            self.publish("dashboard", {
+                "total_reports": counters["total_reports"],
+                "added": counters["total_reports"] - previous["total_reports"],
+                "categories": {
+                    c: n for c, n in counters["categories"].items() if previous["categories"].get(c) != n
+                },
+            })
+        self._counters = counters
+
+        for window in WINDOWS:
+            ranked = {
+                item["number"]: {"rank": rank, "reports": item["reports"]}
+                for rank, item in enumerate(boards.get(window, []), start=1)
+            }
+            seen = self._boards.get(window)
+            self._boards[window] = ranked
+            if seen is None:
+                continue
+            changed = [{"number": n, **pos} for n, pos in ranked.items() if seen.get(n) != pos]
+            removed = [n for n in seen if n not in ranked]
+            if changed or removed:
+                self.publish("trending", {"window": window, "changed": changed, "removed": removed})
+
+    def reset(self) -> None:
+        """Forget the ticker's baseline; the next subscriber starts from a fresh snapshot."""
+        self._counters = None
+        self._boards.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "buffer_size": self.buffer_size,
+            "events": self.events,
+            "slow_disconnects": self.slow_disconnects,
+        }
+
+async def live_ticker() -> None:
+    """Background loop started with the app; idles while nobody is subscribed."""
+    interval = get_settings().live_tick_seconds
+    while True:
+        if live_broadcaster.subscribers:
+            try:
+                await live_broadcaster.tick()
+            except Exception as e:
+                print(f"⚠️ Live update tick failed: {e}")
+        else:
+            live_broadcaster.reset()
+        await asyncio.sleep(interval)
+
+live_broadcaster = LiveBroadcaster(
+    buffer_size=get_settings().live_client_buffer,
+    max_subscribers=get_settings().live_max_subscribers,
+)
@@ -0,0 +1,120 @@
+"""
+Prometheus metrics, served at GET /metrics.
+
+Request latency is recorded by app.middleware.metrics, Mongo command
+durations by the pymongo command listener below (registered on both
+clients in app.db.mongo), and the services observe their own OCR, storage
+and scoring timings. Labels are limited to route templates, collection and
+command names, so series counts stay bounded.
+
+With several workers (scripts/serve.py), PROMETHEUS_MULTIPROC_DIR is set
+and every process writes its samples there; /metrics aggregates all of them.
+Per-worker gauges declare how they combine (livesum/livemax). Gauges backed
+by set_function (queue depths) are only exported in single-process mode.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+from pymongo import monitoring
+
+# Sub-millisecond buckets: most requests and Mongo commands finish in < 5ms
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["method", "route", "status"], buckets=FAST_BUCKETS,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["collection", "command"], buckets=FAST_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter(
+    "mongo_command_failures_total", "Failed MongoDB commands", ["collection", "command"],
+)
+OCR_DURATION = Histogram(
+    "ocr_duration_seconds", "Screenshot OCR latency including queueing", ["mode", "outcome"], buckets=SLOW_BUCKETS,
+)
+OCR_QUEUE_DEPTH = Gauge("ocr_queue_depth", "OCR jobs running or queued in the process pool", multiprocess_mode="livesum")
+UPLOAD_QUEUE_DEPTH = Gauge("upload_queue_depth", "Screenshot uploads waiting for a worker", multiprocess_mode="livesum")
+STORAGE_DURATION = Histogram(
+    "storage_request_duration_seconds", "Screenshot storage (Supabase) call latency", ["operation"], buckets=SLOW_BUCKETS,
+)
+STORAGE_ERRORS = Counter("storage_errors_total", "Failed screenshot storage calls", ["operation"])
+SCORING_DURATION = Histogram(
+    "scoring_duration_seconds", "Scam scoring latency", ["kind"], buckets=FAST_BUCKETS,
+)
+NUMBER_FILTER_LOOKUPS = Counter(
+    "number_filter_lookups_total", "Reported-number filter answers (negative = served without Mongo)", ["result"],
+)
+NUMBER_FILTER_ITEMS = Gauge("number_filter_items", "Numbers in the reported-number filter", multiprocess_mode="livemax")
+NUMBER_FILTER_BYTES = Gauge(
+    "number_filter_bytes", "Memory used by the reported-number filter's bit array", multiprocess_mode="livesum",
+)
+ALERTS_RAISED = Counter("alerts_raised_total", "Anomaly flags newly raised by the streaming detector", ["flag"])
+LIVE_SUBSCRIBERS = Gauge("live_subscribers", "Clients connected to GET /live", multiprocess_mode="livesum")
+LIVE_EVENTS = Counter("live_events_total", "Events broadcast to /live subscribers", ["event"])
+LIVE_DISCONNECTS = Counter("live_disconnects_total", "Slow /live subscribers disconnected", ["reason"])
+NUMBER_FILTER_FP_RATE = Gauge(
+    "number_filter_expected_fp_rate", "Expected false-positive rate at the current fill", multiprocess_mode="livemax",
+)
+
+def multiprocess_enabled() -> bool:
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+def registry() -> Optional[CollectorRegistry]:
+    """Registry aggregating every worker's samples, or None for the default (single-process) one."""
+    if not multiprocess_enabled():
+        return None
+    collected = CollectorRegistry()
+    multiprocess.MultiProcessCollector(collected)
+    return collected
+
+def mark_worker_exit() -> None:
+    """Drop this worker's live gauges from the multiprocess directory (API shutdown)."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
+
+@contextmanager
+def observe(histogram: Histogram, errors: Optional[Counter] = None, **labels):
+    """Time a block into `histogram`; count exceptions in `errors` (same labels)."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.labels(**labels).inc()
+        raise
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Records every command's duration by collection and command name."""
+
+    def __init__(self):
+        # (connection, request_id) -> collection, filled at start, popped at finish
+        self._collections: Dict[Tuple[object, int], str] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        target = event.command.get(event.command_name)
+        if isinstance(target, str):
+            return target
+        if event.command_name == "getMore":
+            return event.command.get("collection", "")
+        return ""  # database-level commands (ping, listCollections, ...)
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        self._collections[(event.connection_id, event.request_id)] = self._collection(event)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_DURATION.labels(collection, event.command_name).observe(event.duration_micros / 1e6)
+        MONGO_COMMAND_FAILURES.labels(collection, event.command_name).inc()
+
+mongo_command_metrics = MongoCommandMetrics()
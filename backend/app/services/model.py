@@ -0,0 +1,190 @@
+"""
+In-process model serving for scam-probability scoring.
+
+The joblib TF-IDF/logistic-regression pipeline at `Settings.model_path` is
+loaded once at startup and warmed up. Concurrent `predict()` calls are
+gathered by a micro-batching queue for up to `model_batch_max_wait_ms` (or
+`model_batch_max_size` requests) and scored with a single `predict_proba`
+call in a worker thread, so the event loop never runs inference itself.
+
+When no model file exists (or it fails to load) every call falls back to the
+keyword heuristic in app.services.scoring.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from app.core.config import get_settings
+from app.services.metrics import SCORING_DURATION, observe
+from app.services.scoring import keyword_probability, keyword_probabilities
+
+HEURISTIC_MODEL_NAME = "keyword-heuristic"
+WARMUP_MESSAGES = [
+    "Your eSewa account is blocked. Share the OTP code to verify.",
+    "Meeting moved to 3pm tomorrow.",
+]
+
+class ModelServer:
+    def __init__(self, model_path: str, max_batch_size: int = 32, max_wait_ms: float = 2.0):
+        self.model_path = model_path
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.model: Any = None
+        self.name = HEURISTIC_MODEL_NAME
+        self._positive_column = 1
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+        # Stats
+        self.batches = 0
+        self.requests = 0
+        self.max_seen_batch = 0
+        self._batch_sizes: deque = deque(maxlen=1000)
+        self._queue_latencies: deque = deque(maxlen=1000)
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self) -> bool:
+        """Load and warm up the pipeline; returns False (heuristic mode) if unavailable."""
+        if not os.path.exists(self.model_path):
+            print(f"⚠️ No model at {self.model_path}. Using keyword heuristic for scoring.")
+            return False
+        try:
+            import joblib
+            model = joblib.load(self.model_path)
+            classes = list(getattr(model, "classes_", [0, 1]))
+            self._positive_column = classes.index(1) if 1 in classes else len(classes) - 1
+            for _ in range(3):
+                model.predict_proba(WARMUP_MESSAGES)
+        except Exception as e:
+            print(f"⚠️ Failed to load model from {self.model_path}: {e}. Using keyword heuristic.")
+            return False
+        self.model = model
+        self.name = os.path.splitext(os.path.basename(self.model_path))[0]
+        print(f"✅ Loaded model '{self.name}' from {self.model_path}")
+        return True
+
+    async def start(self) -> None:
+        if self.loaded and self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._batch_loop())
+
+    async def stop(self) -> None:
+        """Stop batching; requests still queued are scored by the heuristic, later calls fall back to it."""
+        queue, worker = self._queue, self._worker
+        self._queue = self._worker = None
+        if worker is not None:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+        if queue is not None:
+            pending = []
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+            self._fall_back(pending)
+
+    @staticmethod
+    def _fall_back(batch: List[Tuple[str, asyncio.Future, float]]) -> None:
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(keyword_probability(text))
+
+    def _predict_batch(self, texts: List[str]) -> np.ndarray:
+        return self.model.predict_proba(texts)[:, self._positive_column]
+
+    async def predict(self, text: str) -> float:
+        """Scam probability for one message (micro-batched when a model is loaded)."""
+        start = time.perf_counter()
+        if not self.loaded or self._queue is None:
+            score = keyword_probability(text)
+        else:
+            future = asyncio.get_running_loop().create_future()
+            self._queue.put_nowait((text, future, start))
+            score = await future
+        SCORING_DURATION.labels("message").observe(time.perf_counter() - start)
+        return score
+
+    async def predict_many(self, texts: List[str]) -> np.ndarray:
+        """Scam probabilities for an already-batched list of messages."""
+        with observe(SCORING_DURATION, kind="batch"):
+            if not self.loaded:
+                return await asyncio.get_running_loop().run_in_executor(None, keyword_probabilities, texts)
+            if not texts:
+                return np.zeros(0)
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._predict_batch, texts)
+
+    async def _batch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        batch = []
+        while True:
+            try:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    try:
+                        batch.append(queue.get_nowait())
+                        continue
+                    except asyncio.QueueEmpty:
+                        pass
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                started = time.perf_counter()
+                texts = [text for text, _, _ in batch]
+                probs = await loop.run_in_executor(self._executor, self._predict_batch, texts)
+            except asyncio.CancelledError:
+                # Stopped mid-batch: don't leave its callers waiting
+                self._fall_back(batch)
+                raise
+            except Exception as e:
+                # Score the batch like the no-model path rather than failing every request in it
+                print(f"⚠️ Model batch of {len(batch)} failed, using keyword heuristic: {e}")
+                self._fall_back(batch)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            self.max_seen_batch = max(self.max_seen_batch, len(batch))
+            self._batch_sizes.append(len(batch))
+            self._queue_latencies.extend(started - enqueued for _, _, enqueued in batch)
+            for (_, future, _), prob in zip(batch, probs.tolist()):
+                if not future.done():
+                    future.set_result(prob)
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = np.array(self._queue_latencies) * 1000 if self._queue_latencies else np.zeros(1)
+        return {
+            "model": self.name,
+            "loaded": self.loaded,
+            "batches": self.batches,
+            "requests": self.requests,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "avg_batch_size": round(float(np.mean(self._batch_sizes)), 2) if self._batch_sizes else 0.0,
+            "max_batch_size": self.max_seen_batch,
+            "queue_latency_ms": {
+                "p50": round(float(np.percentile(latencies, 50)), 3),
+                "p95": round(float(np.percentile(latencies, 95)), 3),
+                "max": round(float(latencies.max()), 3),
+            },
+        }
+
+settings = get_settings()
+model_server = ModelServer(
+    settings.model_path,
+    max_batch_size=settings.model_batch_max_size,
+    max_wait_ms=settings.model_batch_max_wait_ms,
+)
@@ -0,0 +1,269 @@
+"""
+In-memory Bloom filter of every number that has ever been reported.
+
+Most `/number` and `/sim_swap` lookups come from caller ID and are for clean
+numbers. A negative answer from the filter is definite, so those requests
+are answered with the precomputed LOW-risk response without touching
+MongoDB (see app.services.risk). A positive answer may be false (at about
+NUMBER_FILTER_FP_RATE) and falls through to the normal rollup read.
+
+The filter is keyed by `number_key` and kept current three ways:
+  * numbers reported through this worker are added on insert
+  * every NUMBER_FILTER_SYNC_SECONDS, numbers whose rollup was written
+    since the last sync are added (reports taken by other workers, and
+    rollups written by the CLI loaders)
+  * every NUMBER_FILTER_REBUILD_SECONDS, or once it holds more numbers than
+    it was sized for, it is rebuilt from a scan of `number_stats`
+
+The sync goes by the rollup's `updated_at`, the database time of its last
+write, rather than `last_report_at`, which loaders backdate to the original
+report times. Until the first build finishes every lookup answers "maybe"
+and goes to the database.
+"""
+
+import asyncio
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Set
+import numpy as np
+from app.core.config import get_settings
+from app.db.mongo import async_number_stats_collection
+from app.services.metrics import NUMBER_FILTER_BYTES, NUMBER_FILTER_ITEMS, NUMBER_FILTER_FP_RATE, NUMBER_FILTER_LOOKUPS
+
+# Sized for at least this many numbers, and for twice the current count
+MIN_CAPACITY = 100_000
+GROWTH_FACTOR = 2
+SCAN_BATCH_SIZE = 10_000
+
+_MASK64 = (1 << 64) - 1
+_GAMMA, _MUL1, _MUL2 = 0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9, 0x94D049BB133111EB
+
+def _mix64(x: int) -> int:
+    # splitmix64 finalizer: number keys are dense, so scramble them first
+    x = (x + _GAMMA) & _MASK64
+    x = ((x ^ (x >> 30)) * _MUL1) & _MASK64
+    x = ((x ^ (x >> 27)) * _MUL2) & _MASK64
+    return x ^ (x >> 31)
+
+def _mix64_array(x: np.ndarray) -> np.ndarray:
+    # Same as _mix64; uint64 arithmetic wraps like the masks above
+    x = x + np.uint64(_GAMMA)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(_MUL1)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(_MUL2)
+    return x ^ (x >> np.uint64(31))
+
+class BloomFilter:
+    """Fixed-size Bloom filter over integer keys (double hashing, k probes)."""
+
+    def __init__(self, capacity: int, fp_rate: float):
+        self.capacity = max(1, capacity)
+        self.fp_rate = fp_rate
+        self.size = max(64, math.ceil(-self.capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.items = 0
+
+    def _positions(self, key: int):
+        h1 = _mix64(key)
+        h2 = _mix64(h1) | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield ((h1 + i * h2) & _MASK64) % size
+
+    def _positions_array(self, keys: np.ndarray) -> np.ndarray:
+        h1 = _mix64_array(keys)
+        h2 = _mix64_array(h1) | np.uint64(1)
+        probes = np.arange(self.hashes, dtype=np.uint64)[:, None]
+        return (h1 + probes * h2) % np.uint64(self.size)
+
+    def add(self, key: int) -> None:
+        bits = self.bits
+        added = False
+        for pos in self._positions(key):
+            mask = 1 << (pos & 7)
+            if not bits[pos >> 3] & mask:
+                bits[pos >> 3] |= mask
+                added = True
+        # Only count keys that set a new bit, so re-adding a number is free
+        if added:
+            self.items += 1
+
+    def add_many(self, keys: Iterable[int]) -> None:
+        """Vectorized `add` for rebuilds and sync batches."""
+        keys = np.fromiter(keys, dtype=np.uint64)
+        if not len(keys):
+            return
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        positions = self._positions_array(keys)
+        index, masks = positions >> np.uint64(3), (1 << (positions & np.uint64(7))).astype(np.uint8)
+        known = ((bits[index] & masks) != 0).all(axis=0)
+        np.bitwise_or.at(bits, index.ravel(), masks.ravel())
+        self.items += int((~known).sum())
+
+    def __contains__(self, key: int) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def expected_fp_rate(self) -> float:
+        """False-positive probability for the number of keys added so far."""
+        return (1 - math.exp(-self.hashes * self.items / self.size)) ** self.hashes
+
+    def fill_ratio(self) -> float:
+        return int.from_bytes(self.bits, "little").bit_count() / self.size
+
+class ReportedNumbers:
+    def __init__(self, fp_rate: float = 0.01, enabled: bool = True):
+        self.fp_rate = fp_rate
+        self.enabled = enabled
+        self._filter: Optional[BloomFilter] = None
+        # Keys added while a rebuild is scanning, replayed into the new filter
+        self._pending: Optional[Set[int]] = None
+        self._lock = asyncio.Lock()
+        self.built_at: Optional[datetime] = None
+        self.synced_at: Optional[datetime] = None
+        self.build_seconds = 0.0
+        self.negatives = 0
+        self.positives = 0
+        self.false_positives = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    async def wait_ready(self, poll: float = 0.05) -> None:
+        """Until the first build (by number_filter_maintainer) has been swapped in."""
+        while self._filter is None:
+            await asyncio.sleep(poll)
+
+    def might_contain(self, key: int) -> bool:
+        """False only if the number has definitely never been reported."""
+        if not self.enabled or self._filter is None:
+            return True
+        if key in self._filter:
+            self.positives += 1
+            NUMBER_FILTER_LOOKUPS.labels("positive").inc()
+            return True
+        self.negatives += 1
+        NUMBER_FILTER_LOOKUPS.labels("negative").inc()
+        return False
+
+    def false_positive(self) -> None:
+        """Called when a filter hit found no rollup."""
+        self.false_positives += 1
+        NUMBER_FILTER_LOOKUPS.labels("false_positive").inc()
+
+    def add(self, key: int) -> None:
+        self.add_many((key,))
+
+    def add_many(self, keys: Iterable[int]) -> None:
+        keys = list(keys)
+        if self._pending is not None:
+            self._pending.update(keys)
+        if self._filter is None:
+            return
+        if len(keys) == 1:
+            self._filter.add(keys[0])
+        else:
+            self._filter.add_many(keys)
+        self._publish()
+
+    async def rebuild(self) -> None:
+        """Build a right-sized filter from a scan of `number_stats` and swap it in."""
+        async with self._lock:
+            stats = async_number_stats_collection()
+            started = time.perf_counter()
+            # Numbers reported from here on may be missed by the scan; track them
+            self._pending = set()
+            sync_from = datetime.utcnow()
+            try:
+                count = await stats.estimated_document_count()
+                bloom = BloomFilter(max(MIN_CAPACITY, count * GROWTH_FACTOR), self.fp_rate)
+                cursor = stats.find({}, {"_id": 1}, batch_size=SCAN_BATCH_SIZE)
+                batch = []
+                async for doc in cursor:
+                    batch.append(doc["_id"])
+                    if len(batch) >= SCAN_BATCH_SIZE:
+                        bloom.add_many(batch)
+                        batch = []
+                bloom.add_many(batch)
+                bloom.add_many(self._pending)
+            finally:
+                self._pending = None
+            self._filter = bloom
+            self.built_at = self.synced_at = sync_from
+            self.build_seconds = time.perf_counter() - started
+            self._publish()
+
+    async def sync(self, overlap: float) -> None:
+        """Add numbers whose rollups were touched since the last sync (by any worker)."""
+        if self._filter is None:
+            return
+        async with self._lock:
+            since = self.synced_at - timedelta(seconds=overlap)
+            now = datetime.utcnow()
+            cursor = async_number_stats_collection().find({"updated_at": {"$gte": since}}, {"_id": 1})
+            self.add_many([doc["_id"] async for doc in cursor])
+            self.synced_at = now
+
+    def needs_rebuild(self, max_age: float) -> bool:
+        if self._filter is None or self._filter.items > self._filter.capacity:
+            return True
+        return (datetime.utcnow() - self.built_at).total_seconds() >= max_age
+
+    def _publish(self) -> None:
+        NUMBER_FILTER_ITEMS.set(self._filter.items)
+        NUMBER_FILTER_BYTES.set(len(self._filter.bits))
+        NUMBER_FILTER_FP_RATE.set(self._filter.expected_fp_rate())
+
+    def stats(self) -> Dict[str, Any]:
+        bloom = self._filter
+        lookups = self.negatives + self.positives
+        result = {
+            "enabled": self.enabled,
+            "ready": bloom is not None,
+            "lookups": lookups,
+            "negatives": self.negatives,
+            "positives": self.positives,
+            "false_positives": self.false_positives,
+            # Share of lookups answered without a database read
+            "short_circuit_rate": round(self.negatives / lookups, 4) if lookups else 0.0,
+            # Measured: hits that had no rollup, over all clean numbers looked up
+            "observed_fp_rate": round(self.false_positives / (self.negatives + self.false_positives), 6)
+            if self.negatives + self.false_positives else 0.0,
+        }
+        if bloom is not None:
+            result.update({
+                "items": bloom.items,
+                "capacity": bloom.capacity,
+                "bits": bloom.size,
+                "hashes": bloom.hashes,
+                "memory_bytes": len(bloom.bits),
+                "target_fp_rate": bloom.fp_rate,
+                "expected_fp_rate": round(bloom.expected_fp_rate(), 6),
+                "fill_ratio": round(bloom.fill_ratio(), 4),
+                "built_at": self.built_at.isoformat(),
+                "synced_at": self.synced_at.isoformat(),
+                "build_seconds": round(self.build_seconds, 3),
+            })
+        return result
+
+async def number_filter_maintainer() -> None:
+    """Background loop started with the app: initial build, then sync and periodic rebuilds."""
+    settings = get_settings()
+    if not reported_numbers.enabled:
+        return
+    while True:
+        try:
+            if reported_numbers.needs_rebuild(settings.number_filter_rebuild_seconds):
+                await reported_numbers.rebuild()
+            else:
+                await reported_numbers.sync(overlap=settings.number_filter_sync_seconds)
+        except Exception as e:
+            print(f"⚠️ Number filter refresh failed: {e}")
+        await asyncio.sleep(settings.number_filter_sync_seconds)
+
+reported_numbers = ReportedNumbers(
+    fp_rate=get_settings().number_filter_fp_rate,
+    enabled=get_settings().number_filter_enabled,
+)
@@ -0,0 +1,59 @@
+"""
+Canonical phone numbers.
+
+Every number is stored twice: `number`, the E.164 display string
+("+9779801234567"), and `number_key`, the same digits as a 64-bit integer
+(9779801234567). Indexes and lookups use the integer key: it is fixed-width,
+compares faster and makes smaller index entries than the string.
+
+Normalization runs several times per request, so it is a compiled regex
+behind an LRU cache.
+"""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# E.164 allows at most 15 digits, which always fits in an int64
+MAX_DIGITS = 15
+# Country code plus a subscriber number; also the shortest input ReportIn accepts
+MIN_DIGITS = 7
+NEPAL_COUNTRY_CODE = "977"
+
+_NON_DIGITS = re.compile(r"[^0-9]+")
+# Numbers typed in Devanagari digits
+_DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+class InvalidNumber(ValueError):
+    pass
+
+class PhoneNumber(NamedTuple):
+    key: int       # E.164 digits as an integer, used for storage keys and indexes
+    display: str   # "+<digits>"
+
+@lru_cache(maxsize=65536)
+def canonical_number(raw: str) -> PhoneNumber:
+    """
+    Normalize user input to E.164, assuming Nepal (+977) for 10-digit
+    mobile numbers and 0-prefixed domestic numbers. Raises InvalidNumber
+    when no valid number remains.
+
+    Any 10 digits get +977 prepended, leading 0 included, as the legacy
+    `normalize_number` did; stored numbers keep their canonical form.
+    """
+    digits = _NON_DIGITS.sub("", raw.translate(_DEVANAGARI_DIGITS))
+    if len(digits) == 10:
+        digits = NEPAL_COUNTRY_CODE + digits
+    elif digits.startswith("00"):
+        digits = digits[2:]  # international dialing prefix
+    elif digits.startswith("0"):
+        digits = NEPAL_COUNTRY_CODE + digits[1:]  # domestic trunk prefix (01-4xxxxxx)
+    if not MIN_DIGITS <= len(digits) <= MAX_DIGITS or digits[0] == "0":
+        raise InvalidNumber(f"Invalid phone number: {raw!r}")
+    return PhoneNumber(int(digits), "+" + digits)
+
+def number_key(raw: str) -> int:
+    return canonical_number(raw).key
+
+def display_number(key: int) -> str:
+    return f"+{key}"
@@ -0,0 +1,226 @@
+"""
+Screenshot OCR on a dedicated process pool.
+
+Tesseract is CPU-bound and holds its caller for hundreds of milliseconds, so
+images are decoded, preprocessed and OCR'd in worker processes
+(`Settings.ocr_workers`) and the event loop only awaits the result.
+
+Each upload is decoded exactly once and normalized (downscaled, grayscale,
+binarized, cropped) before Tesseract sees it; `OCR_MODES` trades resolution
+and page segmentation for speed ("fast") or recall ("accurate").
+
+Admission is bounded: at most `ocr_workers + ocr_queue_size` jobs may be
+running or waiting. Further jobs fail fast with `OCRBusy` (503) instead of
+piling up. Each job has a deadline (`ocr_timeout`); Tesseract itself is
+killed at the deadline, so a slot is never held by a runaway job.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+from PIL import Image
+import pytesseract
+from app.core.config import get_settings
+from app.services.metrics import OCR_DURATION, OCR_QUEUE_DEPTH
+
+# Configure Tesseract path from environment variable (fallback to default Windows path)
+TESSERACT_PATH = os.getenv("TESSERACT_PATH", r"C:\Program Files\Tesseract-OCR\tesseract.exe")
+
+class OCRBusy(Exception):
+    """All OCR workers and queue slots are taken."""
+
+class OCRTimeout(Exception):
+    """An OCR job exceeded its deadline."""
+
+class InvalidImage(Exception):
+    """The upload could not be decoded as an image."""
+
+def _configure_tesseract() -> bool:
+    if os.path.exists(TESSERACT_PATH):
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_PATH
+        return True
+    return False
+
+# Per-mode OCR settings. Screenshots carry no meaningful DPI, so resolution is
+# set by capping the width (phone text stays ~25-40px tall) and Tesseract is
+# told the equivalent DPI instead of guessing it.
+OCR_MODES = {
+    # Uniform block of text, half the pixels of accurate
+    "fast": {"max_width": 1000, "psm": 6, "dpi": 150},
+    # Full page layout analysis at higher resolution (Tesseract's default psm)
+    "accurate": {"max_width": 2000, "psm": 3, "dpi": 300},
+}
+DEFAULT_OCR_MODE = "accurate"
+CROP_PADDING = 10
+
+def _otsu_threshold(histogram) -> int:
+    total = sum(histogram)
+    weighted_total = sum(i * count for i, count in enumerate(histogram))
+    background = weighted_background = 0
+    best_threshold, best_variance = 127, -1.0
+    for threshold, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        weighted_background += threshold * count
+        mean_background = weighted_background / background
+        mean_foreground = (weighted_total - weighted_background) / foreground
+        variance = background * foreground * (mean_background - mean_foreground) ** 2
+        if variance > best_variance:
+            best_threshold, best_variance = threshold, variance
+    return best_threshold
+
+def preprocess(image_bytes: bytes, mode: str = DEFAULT_OCR_MODE) -> Image.Image:
+    """
+    Decode the upload once and normalize it for Tesseract: downscale to the
+    mode's resolution, grayscale, binarize (Otsu, dark-mode aware) and crop
+    uniform borders. Raises InvalidImage if the bytes don't decode.
+    """
+    max_width = OCR_MODES[mode]["max_width"]
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        if image.width > max_width:
+            # JPEG: let the decoder scale down by 1/2, 1/4, 1/8 directly
+            image.draft("L", (max_width, image.height * max_width // image.width))
+        image.load()
+    except Exception:
+        raise InvalidImage("Invalid image file")
+
+    gray = image.convert("L")
+    if gray.width > max_width:
+        gray.thumbnail((max_width, gray.height), Image.LANCZOS, reducing_gap=1.0)
+
+    histogram = gray.histogram()
+    threshold = _otsu_threshold(histogram)
+    # Text must end up dark on light: invert dark-mode screenshots
+    dark_background = sum(histogram[:threshold + 1]) > sum(histogram[threshold + 1:])
+    lut = [255 if (value > threshold) != dark_background else 0 for value in range(256)]
+    binary = gray.point(lut)
+
+    ink = binary.point([255] + [0] * 255).getbbox()
+    if ink is not None:
+        left, top, right, bottom = ink
+        binary = binary.crop((
+            max(left - CROP_PADDING, 0), max(top - CROP_PADDING, 0),
+            min(right + CROP_PADDING, binary.width), min(bottom + CROP_PADDING, binary.height),
+        ))
+    return binary.convert("1", dither=Image.Dither.NONE)
+
+def _ocr_job(image_bytes: bytes, mode: str, timeout: float) -> str:
+    """Runs in a worker process: decode + preprocess once, then extract the text."""
+    image = preprocess(image_bytes, mode)
+    settings = OCR_MODES[mode]
+    try:
+        # pytesseract kills the tesseract subprocess once `timeout` elapses
+        return pytesseract.image_to_string(
+            image, config=f"--psm {settings['psm']} --dpi {settings['dpi']}", timeout=timeout
+        ).strip()
+    except RuntimeError as e:
+        if "timeout" in str(e).lower():
+            raise OCRTimeout(f"OCR timed out after {timeout}s")
+        raise
+
+def _noop() -> None:
+    return None
+
+class OCRService:
+    def __init__(self, workers: int, queue_size: int, timeout: float):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.timeout = timeout
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        # Stats
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failed = 0
+        if not _configure_tesseract():
+            print(f"⚠️ Tesseract not found at {TESSERACT_PATH}. OCR will not work.")
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: never fork a process that already runs an event loop and DB client threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_configure_tesseract,
+            )
+        return self._pool
+
+    async def start(self) -> None:
+        """Spawn the worker processes up front so the first upload doesn't pay for it."""
+        pool = self._ensure_pool()
+        await asyncio.gather(*(asyncio.wrap_future(pool.submit(_noop)) for _ in range(self.workers)))
+        print(f"✅ OCR pool started with {self.workers} worker(s), capacity {self.capacity}")
+
+    def stop(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def extract_text(self, image_bytes: bytes, mode: str = DEFAULT_OCR_MODE) -> str:
+        """
+        OCR an uploaded image off the event loop.
+
+        Raises OCRBusy when the pool is saturated, OCRTimeout past the deadline
+        and InvalidImage for undecodable uploads.
+        """
+        if self._pending >= self.capacity:
+            self.rejected += 1
+            OCR_DURATION.labels(mode, "busy").observe(0)
+            raise OCRBusy("OCR queue is full")
+        self._pending += 1
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        future = self._ensure_pool().submit(_ocr_job, image_bytes, mode, self.timeout)
+        # The slot is released when the worker actually finishes, not when we stop waiting
+        future.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(self._release))
+        outcome = "error"
+        try:
+            # Backstop for time spent queued or decoding before Tesseract starts
+            text = await asyncio.wait_for(asyncio.wrap_future(future), self.timeout * 2)
+            outcome = "ok"
+        except (asyncio.TimeoutError, OCRTimeout):
+            self.timeouts += 1
+            outcome = "timeout"
+            raise OCRTimeout(f"OCR timed out after {self.timeout}s")
+        except InvalidImage:
+            outcome = "invalid"
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            OCR_DURATION.labels(mode, outcome).observe(time.perf_counter() - start)
+        self.completed += 1
+        return text
+
+    def _release(self) -> None:
+        self._pending -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "failed": self.failed,
+        }
+
+settings = get_settings()
+ocr_service = OCRService(
+    workers=settings.ocr_workers,
+    queue_size=settings.ocr_queue_size,
+    timeout=settings.ocr_timeout,
+)
+OCR_QUEUE_DEPTH.set_function(lambda: ocr_service._pending)
@@ -0,0 +1,167 @@
+"""
+Sampling profiler for individual requests (see app.middleware.profiling).
+
+While a profiled request is in flight, a sampler thread wakes every
+`profiling_interval_ms` and records where that request is:
+
+  * if the request's task is running on the event loop, the loop thread's
+    Python stack (CPU time: scoring, serialization, ...)
+  * otherwise the task's suspended coroutine chain, prefixed with
+    "[await]" (wall time: waiting on MongoDB, the OCR pool, ...)
+
+Samples are aggregated into collapsed stacks ("a;b;c 12" per line), the
+input format of flamegraph.pl and speedscope. Finished profiles are kept in
+memory and mirrored to the `profiles` collection (TTL-expired), so
+GET /admin/profiles/{id} works from any API worker.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.core.config import get_settings
+from app.db.mongo import async_profiles_collection
+
+# Finished profiles kept in memory for lookups (older ones are read from Mongo)
+MAX_TRACKED_PROFILES = 200
+MAX_STACK_DEPTH = 128
+
+_SITE_PACKAGES = [p for p in sys.path if p.endswith("site-packages")]
+_APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    for prefix in (*_SITE_PACKAGES, _APP_ROOT):
+        if filename.startswith(prefix):
+            filename = filename[len(prefix):].lstrip(os.sep)
+            break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+def _thread_stack(frame) -> List[str]:
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        stack.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+def _task_stack(task: asyncio.Task) -> List[str]:
+    # Outermost coroutine first, down to the await the task is parked on
+    return ["[await]"] + [_frame_label(f.f_code) for f in task.get_stack(limit=MAX_STACK_DEPTH)]
+
+class RequestSampler:
+    """Samples one asyncio task from a background thread until stopped."""
+
+    def __init__(self, task: asyncio.Task, loop_thread_id: int, interval: float):
+        self.task = task
+        self.loop_thread_id = loop_thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Signal the thread and wait for its last sample without blocking the loop."""
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._sample()
+            except Exception:
+                # Frames can change under us; drop the sample rather than the profile
+                pass
+
+    def _running(self, frame) -> bool:
+        """Whether the loop thread is inside the task's coroutine, i.e. the task is running."""
+        root = self.task.get_coro().cr_frame
+        while frame is not None and root is not None:
+            if frame is root:
+                return True
+            frame = frame.f_back
+        return False
+
+    def _sample(self) -> None:
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = _thread_stack(frame) if self._running(frame) else _task_stack(self.task)
+        if stack:
+            self.stacks[";".join(stack)] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+class ProfileStore:
+    def __init__(self, max_concurrent: int = 4):
+        self.max_concurrent = max_concurrent
+        self.active = 0
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def begin(self, task: asyncio.Task, interval: float) -> Optional[RequestSampler]:
+        """Start sampling `task` (running on this thread's loop), or None if too many profiles are running."""
+        if self.active >= self.max_concurrent:
+            return None
+        self.active += 1
+        sampler = RequestSampler(task, threading.get_ident(), interval)
+        sampler.start()
+        return sampler
+
+    async def finish(self, sampler: RequestSampler, profile_id: str, method: str, path: str,
+                     status: int, duration: float, trigger: str) -> None:
+        try:
+            await sampler.stop()
+        finally:
+            self.active -= 1
+        profile = {
+            "_id": profile_id,
+            "method": method,
+            "path": path,
+            "status": status,
+            "trigger": trigger,
+            "duration_ms": round(duration * 1000, 2),
+            "interval_ms": round(sampler.interval * 1000, 2),
+            "samples": sampler.samples,
+            "collapsed": sampler.collapsed(),
+            "created_at": datetime.utcnow(),
+        }
+        self._profiles[profile_id] = profile
+        while len(self._profiles) > MAX_TRACKED_PROFILES:
+            self._profiles.popitem(last=False)
+        try:
+            await async_profiles_collection().replace_one({"_id": profile_id}, profile, upsert=True)
+        except Exception as e:
+            print(f"⚠️ Could not persist profile {profile_id}: {e}")
+
+    async def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        profile = self._profiles.get(profile_id)
+        if profile is None:
+            try:
+                profile = await async_profiles_collection().find_one({"_id": profile_id})
+            except Exception as e:
+                print(f"⚠️ Profile lookup failed: {e}")
+        return profile
+
+    async def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        try:
+            return await (
+                async_profiles_collection()
+                .find({}, {"collapsed": 0})
+                .sort("created_at", -1)
+                .limit(limit)
+                .to_list(limit)
+            )
+        except Exception as e:
+            print(f"⚠️ Profile listing failed: {e}")
+            summaries = [{k: v for k, v in p.items() if k != "collapsed"} for p in self._profiles.values()]
+            return list(reversed(summaries))[:limit]
+
+profile_store = ProfileStore(max_concurrent=get_settings().profiling_max_concurrent)
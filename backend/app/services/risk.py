@@ -1,73 +1,228 @@
-from datetime import datetime, timedelta
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
 from math import log
-from typing import List, Dict, Any
-from app.db.mongo import reports_collection
+from typing import List, Dict, Any, Tuple
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import get_settings
+from app.db.mongo import async_reports_collection, async_number_stats_collection, async_counters_collection
+from app.services.anomalies import anomaly_detector, hour_flags, surge_flags, is_suspicious, ROLLUP_FIELDS
+from app.services.cache import SWRCache
+from app.services.live import live_broadcaster
+from app.services.campaigns import assign_campaigns, record_campaigns
+from app.services.model import model_server
+from app.services.number_filter import reported_numbers
+from app.services.numbers import canonical_number, PhoneNumber
+from app.services.scoring import keyword_probability
+from app.services.stats import (
+    rollup_update, rollup_update_many, prune_update, snapshot_from_rollup, window_count_expressions,
+    counters_update, counters_update_many, category_counts, BUCKET_KEYS_PROJECTION, REPORT_COUNTERS_ID,
+)
+from app.services.trending import record_counts, record_counts_many, trending
 
 # MongoDB-backed storage; previous in-memory REPORTS removed.
+# Per-number aggregates live in the `number_stats` rollup (see app.services.stats).
 
-def add_report(number: str, category: str, message: str) -> Dict[str, Any]:
-    prob = classify_probability_stub(message)
+_dashboard_cache = SWRCache(
+    ttl=get_settings().dashboard_cache_ttl,
+    stale_ttl=get_settings().dashboard_cache_stale_ttl,
+    max_entries=1,
+)
+
+async def add_report(number: str, category: str, message: str) -> Dict[str, Any]:
+    prob = await model_server.predict(message)
+    canonical = canonical_number(number)
     doc = {
-        "number": normalize_number(number),
+        "number": canonical.display,
+        "number_key": canonical.key,
         "category": category,
         "message": message,
         "created_at": datetime.utcnow(),
         "scam_probability": prob,
     }
-    reports_collection().insert_one(doc)
+    started = await assign_campaigns([doc])
+    await async_reports_collection().insert_one(doc)
+    reported_numbers.add(doc["number_key"])
+    rollup = await record_in_rollup(doc)
+    await record_in_counters(doc)
+    await anomaly_detector.observe([rollup])
+    await record_campaigns([doc], started)
+    live_broadcaster.publish_reports([doc])
     return doc
 
+async def add_reports(items: List[Tuple[str, str, str]]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+    """
+    Score and store a batch of (number, category, message) reports.
+
+    Messages are scored in one model call and written with a single unordered
+    `insert_many`; rollups, counters and leaderboards are then updated once
+    for the whole batch. Returns the stored documents and (position, error)
+    for items that could not be written.
+    """
+    if not items:
+        return [], []
+    probs = await model_server.predict_many([message for _, _, message in items])
+    now = datetime.utcnow()
+    docs = []
+    for (number, category, message), prob in zip(items, probs.tolist()):
+        canonical = canonical_number(number)
+        docs.append({
+            "number": canonical.display,
+            "number_key": canonical.key,
+            "category": category,
+            "message": message,
+            "created_at": now,
+            "scam_probability": float(prob),
+        })
+    started = await assign_campaigns(docs)
+    errors: List[Tuple[int, str]] = []
+    try:
+        await async_reports_collection().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        errors = [(err["index"], err.get("errmsg", "write failed")) for err in e.details.get("writeErrors", [])]
+    failed = {index for index, _ in errors}
+    stored = [doc for i, doc in enumerate(docs) if i not in failed]
+    if stored:
+        reported_numbers.add_many(doc["number_key"] for doc in stored)
+        rollups = await record_in_rollups(stored)
+        await record_in_counters_many(stored)
+        await anomaly_detector.observe(rollups, reports=len(stored))
+        await record_campaigns(stored, started)
+        live_broadcaster.publish_reports(stored)
+    return stored, errors
+
+async def record_in_counters(doc: Dict[str, Any]) -> None:
+    """Count a stored report globally and apply the delta to the cached dashboard."""
+    # A summary stored after this point may have been read after the $inc and already count it
+    before_write = time.monotonic()
+    await async_counters_collection().update_one({"_id": REPORT_COUNTERS_ID}, counters_update(doc), upsert=True)
+    _dashboard_cache.update("summary", lambda summary: _with_reports(summary, {doc["category"]: 1}),
+                            stored_before=before_write)
+
+async def record_in_counters_many(docs: List[Dict[str, Any]]) -> None:
+    before_write = time.monotonic()
+    await async_counters_collection().update_one({"_id": REPORT_COUNTERS_ID}, counters_update_many(docs), upsert=True)
+    categories = Counter(doc["category"] for doc in docs)
+    _dashboard_cache.update("summary", lambda summary: _with_reports(summary, categories), stored_before=before_write)
+
+async def record_in_rollup(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Fold a stored report into its number's rollup, prune expired buckets and
+    push the number's new window counts to the trending leaderboards.
+    Returns the updated rollup (window buckets included, for the anomaly detector).
+    """
+    stats = async_number_stats_collection()
+    now = datetime.utcnow()
+    updated = await stats.find_one_and_update(
+        {"_id": doc["number_key"]},
+        rollup_update(doc, now),
+        projection={**BUCKET_KEYS_PROJECTION, **ROLLUP_FIELDS, "total": 1, "windows": window_count_expressions(now)},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    prune = prune_update(updated, now)
+    if prune:
+        await stats.update_one({"_id": doc["number_key"]}, prune)
+    await record_counts(doc["number"], {**updated.get("windows", {}), "all": updated["total"]})
+    return updated
+
+async def record_in_rollups(docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Batch version of `record_in_rollup`: one upsert per distinct number, one leaderboard merge."""
+    stats = async_number_stats_collection()
+    now = datetime.utcnow()
+    by_number: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    for doc in docs:
+        by_number[doc["number_key"]].append(doc)
+    await stats.bulk_write(
+        [UpdateOne({"_id": number}, rollup_update_many(reports, now), upsert=True) for number, reports in by_number.items()],
+        ordered=False,
+    )
+    cursor = stats.find(
+        {"_id": {"$in": list(by_number)}},
+        {**BUCKET_KEYS_PROJECTION, **ROLLUP_FIELDS, "total": 1, "windows": window_count_expressions(now)},
+    )
+    prunes = []
+    counts = {}
+    rollups = []
+    async for updated in cursor:
+        rollups.append(updated)
+        prune = prune_update(updated, now)
+        if prune:
+            prunes.append(UpdateOne({"_id": updated["_id"]}, prune))
+        counts[updated["number"]] = {**updated.get("windows", {}), "all": updated["total"]}
+    if prunes:
+        await stats.bulk_write(prunes, ordered=False)
+    await record_counts_many(counts)
+    return rollups
+
 def normalize_number(number: str) -> str:
-    digits = ''.join(ch for ch in number if ch.isdigit())
-    # Basic Nepali mobile normalization: assume country code +977 if length 10
-    if len(digits) == 10:
-        return "+977" + digits
-    if digits.startswith("977") and len(digits) == 13:
-        return "+" + digits
-    if digits.startswith("+977") and len(digits) == 14:
-        return digits
-    return "+" + digits  # fallback
-
-def get_reports_for(number: str) -> List[Dict[str, Any]]:
-    n = normalize_number(number)
-    cursor = reports_collection().find({"number": n}).sort("created_at", -1)
-    return list(cursor)
-
-def recent_reports(number: str, minutes: int = 60) -> List[Dict[str, Any]]:
-    cutoff = datetime.utcnow() - timedelta(minutes=minutes)
-    return [r for r in get_reports_for(number) if r["created_at"] >= cutoff]
+    """E.164 display form of a number (see app.services.numbers)."""
+    return canonical_number(number).display
+
+async def get_reports_for(number: str) -> List[Dict[str, Any]]:
+    key = canonical_number(number).key
+    cursor = async_reports_collection().find({"number_key": key}).sort("created_at", -1)
+    return await cursor.to_list(length=None)
+
+async def number_snapshot(number: str) -> Dict[str, Any]:
+    """
+    Everything needed to score a number, from a single point read of its rollup.
+
+    Returns the total report count, the capped `tail` of reports (newest first)
+    and the 1h and 48h window counters; cost does not grow with report history.
+    Numbers the reported-number filter has never seen get an empty snapshot
+    without a read.
+    """
+    canonical = canonical_number(number)
+    if not reported_numbers.might_contain(canonical.key):
+        return snapshot_from_rollup(canonical.display, None)
+    return await _read_snapshot(canonical)
+
+async def _read_snapshot(canonical: PhoneNumber) -> Dict[str, Any]:
+    doc = await async_number_stats_collection().find_one({"_id": canonical.key})
+    if doc is None:
+        reported_numbers.false_positive()
+    return snapshot_from_rollup(canonical.display, doc)
 
 def classify_probability_stub(message: str) -> float:
-    # Mirror heuristic from classify endpoint for internal scoring (duplicated for now)
-    keywords = ["otp", "khalti", "esewa", "bank", "prize", "reward", "verify", "blocked"]
-    text_lower = message.lower()
-    score = 0.0
-    score += min(len(message) / 200, 0.3)
-    hits = sum(1 for k in keywords if k in text_lower)
-    score += min(hits * 0.15, 0.6)
-    return max(0.0, min(score, 0.95))
-
-def anomaly_flags(number: str) -> Dict[str, bool]:
-    recent = recent_reports(number, 60)
-    flags = {
-        "spike": len(recent) >= 3,  # 3+ reports in last hour
-        "burst": len(recent) >= 5,  # stronger flag
-        "repeated_message": False,
-    }
-    if len(recent) > 1:
-        messages = [r["message"].lower().strip() for r in recent]
-        unique = set(messages)
-        if len(unique) <= len(messages) / 2:
-            flags["repeated_message"] = True
-    return flags
-
-def risk_score(number: str) -> Dict[str, Any]:
-    reports = get_reports_for(number)
-    count = len(reports)
+    # Same heuristic as the classify endpoint (shared in app.services.scoring)
+    return keyword_probability(message)
+
+async def anomaly_flags(number: str, snapshot: Dict[str, Any] | None = None) -> Dict[str, bool]:
+    if snapshot is None:
+        snapshot = await number_snapshot(number)
+    # Same rules the streaming detector applies as reports arrive (app.services.anomalies)
+    return hour_flags(snapshot["last_hour"])
+
+# Response for a number with no reports, built once (see _clean_risk)
+_CLEAN_RISK: Dict[str, Any] | None = None
+
+async def _clean_risk(number: str) -> Dict[str, Any]:
+    global _CLEAN_RISK
+    if _CLEAN_RISK is None:
+        _CLEAN_RISK = await _score(snapshot_from_rollup(number, None))
+    return {**_CLEAN_RISK, "number": number}
+
+async def risk_score(number: str) -> Dict[str, Any]:
+    canonical = canonical_number(number)
+    if not reported_numbers.might_contain(canonical.key):
+        # Never reported: precomputed LOW-risk response, no database round trip
+        return await _clean_risk(canonical.display)
+    return await _score(await _read_snapshot(canonical))
+
+async def _score(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    number = snapshot["number"]
+    reports = snapshot["tail"]
+    count = snapshot["count"]
     latest_message = reports[-1]["message"] if reports else ""
-    ml_prob = classify_probability_stub(latest_message) if latest_message else 0.0
-    flags = anomaly_flags(number)
-    suspicious_flags = suspicious_activity_indicators(number, reports)
+    ml_prob = await model_server.predict(latest_message) if latest_message else 0.0
+    flags = await anomaly_flags(number, snapshot)
+    suspicious_flags = await suspicious_activity_indicators(number, snapshot)
+    # Near-duplicate texts sent from several numbers (app.services.campaigns), stored on the rollup
+    campaign = snapshot["campaign"]
+    if campaign and campaign["numbers"] < get_settings().campaign_min_numbers:
+        campaign = None
     anomaly_bonus = 0.0
     if flags["spike"]:
         anomaly_bonus += 0.15
@@ -77,94 +232,80 @@ def risk_score(number: str) -> Dict[str, Any]:
         anomaly_bonus += 0.1
     if suspicious_flags["suspicious_activity_detected"]:
         anomaly_bonus += 0.2  # Higher weight for post-swap activity
+    if campaign:
+        anomaly_bonus += 0.15
     score = ml_prob + 0.1 * log(1 + count) + anomaly_bonus
     score = min(score, 0.99)
     level = "HIGH" if score > 0.66 else "MEDIUM" if score > 0.33 else "LOW"
     return {
-        "number": normalize_number(number),
+        "number": snapshot["number"],
         "risk_score": round(score, 3),
         "risk_level": level,
         "report_count": count,
-        "anomalies": [k for k, v in flags.items() if v],
+        "anomalies": [k for k, v in flags.items() if v] + (["campaign"] if campaign else []),
         "suspicious_activity": suspicious_flags,
+        "campaign": campaign,
         "recent_reports": [
             {
                 "category": r["category"],
                 "created_at": r["created_at"].isoformat(),
                 "scam_probability": round(r.get("scam_probability", 0.0), 3),
             }
-            for r in reports[-10:]
+            for r in reports
         ],
     }
 
-def dashboard_summary() -> Dict[str, Any]:
-    total_reports = reports_collection().count_documents({})
-    pipeline = [
-        {"$group": {"_id": "$category", "count": {"$sum": 1}}},
-        {"$sort": {"count": -1}},
-    ]
-    cat = list(reports_collection().aggregate(pipeline))
-    categories = {c["_id"]: c["count"] for c in cat}
+async def _load_dashboard() -> Dict[str, Any]:
+    counters = await async_counters_collection().find_one({"_id": REPORT_COUNTERS_ID})
     return {
-        "total_reports": total_reports,
-        "category_distribution": categories,
-        "trending": trending(10),
+        "total_reports": (counters or {}).get("total", 0),
+        "category_distribution": category_counts(counters),
+        "trending": await trending(10),
     }
 
-def trending(limit: int = 10) -> List[Dict[str, Any]]:
-    pipeline = [
-        {"$group": {"_id": "$number", "reports": {"$sum": 1}}},
-        {"$sort": {"reports": -1}},
-        {"$limit": limit},
-    ]
-    results = list(reports_collection().aggregate(pipeline))
-    return [{"number": r["_id"], "reports": r["reports"]} for r in results]
+def _with_reports(summary: Dict[str, Any], added: Dict[str, int]) -> Dict[str, Any]:
+    categories = dict(summary["category_distribution"])
+    for category, n in added.items():
+        categories[category] = categories.get(category, 0) + n
+    return {
+        **summary,
+        "total_reports": summary["total_reports"] + sum(added.values()),
+        "category_distribution": dict(sorted(categories.items(), key=lambda kv: kv[1], reverse=True)),
+    }
 
-def suspicious_activity_indicators(number: str, reports: List[Dict[str, Any]] | None = None) -> Dict[str, Any]:
+async def dashboard_summary() -> Dict[str, Any]:
+    """Dashboard totals from maintained counters, served from an in-process SWR cache."""
+    return await _dashboard_cache.get("summary", _load_dashboard)
+
+async def suspicious_activity_indicators(number: str, snapshot: Dict[str, Any] | None = None) -> Dict[str, Any]:
     """
     Detect suspicious patterns that MAY indicate post-SIM-swap scam activity.
     NOTE: This does NOT detect actual SIM swaps (requires telecom data).
     It detects BEHAVIORS suggesting a number was hijacked or is being used for coordinated scams.
     """
-    if reports is None:
-        reports = get_reports_for(number)
+    if snapshot is None:
+        snapshot = await number_snapshot(number)
     # Patterns: recent surge + OTP focus + victim self-reports + category diversity
-    last_48h_cut = datetime.utcnow() - timedelta(hours=48)
-    recent = [r for r in reports if r["created_at"] >= last_48h_cut]
-    
-    # OTP-related categories (indicates account takeover attempts)
-    otp_like = {"OTP Theft Attempt", "Impersonation (Bank)"}
-    otp_recent = [r for r in recent if r["category"] in otp_like]
-    proportion_otp = (len(otp_recent) / len(recent)) if recent else 0.0
+    # (48h window counters come from the rollup's hour buckets)
+    recent = snapshot["last_48h"]
+    recent_count = recent["count"]
     
-    # High scam probability cluster
-    repeated_prob_high = sum(1 for r in recent if r.get("scam_probability", 0) > 0.6)
+    proportion_otp = (recent["otp"] / recent_count) if recent_count else 0.0
+    unique_categories = set(recent["categories"])
     
-    # Victim self-report detection (phrases indicating hijack)
-    victim_keywords = ["hacked", "not me", "someone using", "stolen", "hijacked", "unauthorized"]
-    victim_reports = [r for r in recent if any(kw in r["message"].lower() for kw in victim_keywords)]
-    
-    # Category diversity (multiple scam types = coordinated attack)
-    unique_categories = set(r["category"] for r in recent)
-    multi_category_attack = len(unique_categories) >= 3 and len(recent) >= 4
-    
-    flags = {
-        "recent_surge": len(recent) >= 4,  # 4+ reports in 48h
-        "otp_focus": proportion_otp >= 0.5 and len(recent) >= 2,
-        "high_prob_cluster": repeated_prob_high >= 3,
-        "victim_self_report": len(victim_reports) > 0,
-        "multi_category_attack": multi_category_attack,
-    }
+    # Recent surge, OTP focus, high-probability cluster, victim self-reports,
+    # category diversity (rules shared with the streaming detector)
+    flags = surge_flags(recent)
     
     # Possible post-swap activity if 2+ strong signals
-    possible = sum(1 for v in flags.values() if v) >= 2
+    possible = is_suspicious(flags)
     
     return {
         "suspicious_activity_detected": possible,
         "confidence": "medium" if possible else "low",
         "likely_scenario": "Possible post-SIM-swap scam or coordinated attack" if possible else "Normal activity",
         "flags": flags,
-        "recent_report_count": len(recent),
+        "recent_report_count": recent_count,
         "otp_proportion": round(proportion_otp, 3),
         "unique_categories": list(unique_categories),
         "disclaimer": "This is behavioral analysis from user reports, not telecom-level SIM swap detection."
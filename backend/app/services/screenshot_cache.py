@@ -0,0 +1,182 @@
+"""
+Cache of screenshot analyses keyed by image content.
+
+Viral scam images are uploaded over and over; a hit returns the stored OCR
+text, score and storage URL without running OCR or uploading again.
+
+  * exact tier: SHA-256 of the uploaded bytes
+  * perceptual tier (optional): 64-bit dHash of the image, matched within a
+    small Hamming distance, so re-encoded / resized copies also hit
+  * in-memory entries are bounded and evicted LRU; an optional Mongo tier
+    (`screenshot_cache` collection) persists analyses across restarts and
+    workers (exact SHA-256 and exact dHash lookups)
+
+Entries are namespaced by a variant (the OCR mode), since each mode
+extracts different text. Concurrent uploads of the same bytes share a single
+analysis.
+"""
+
+import asyncio
+import hashlib
+import io
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+from app.core.config import get_settings
+from app.db.mongo import async_screenshot_cache_collection
+
+Analysis = Dict[str, Any]
+
+def content_hash(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+def perceptual_hash(image_bytes: bytes) -> Optional[int]:
+    """64-bit difference hash (dHash); None if the bytes are not an image."""
+    try:
+        image = Image.open(io.BytesIO(image_bytes))
+        image.draft("L", (64, 64))  # JPEG: decode at reduced scale
+        pixels = list(image.convert("L").resize((9, 8), Image.LANCZOS).getdata())
+    except Exception:
+        return None
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] < pixels[row * 9 + col + 1])
+    return bits
+
+def _entry_key(variant: str, image_bytes: bytes) -> str:
+    return f"{variant}:{content_hash(image_bytes)}"
+
+def _phash_key(phash: int) -> str:
+    return f"{phash:016x}"
+
+class ScreenshotCache:
+    def __init__(self, max_entries: int = 1024, perceptual: bool = False, max_distance: int = 4, persistent: bool = False):
+        self.max_entries = max_entries
+        self.perceptual = perceptual
+        self.max_distance = max_distance
+        self.persistent = persistent
+        self._entries: "OrderedDict[str, Tuple[Optional[int], Analysis]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.perceptual_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    async def get_or_analyze(self, image_bytes: bytes, analyze: Callable[[], Awaitable[Analysis]], variant: str = "") -> Tuple[Analysis, bool]:
+        """Return (analysis, cached). `analyze` runs only on a miss."""
+        digest = _entry_key(variant, image_bytes)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(digest)
+            return entry[1], True
+
+        task = self._inflight.get(digest)
+        if task is not None:
+            self.hits += 1
+            result, _ = await asyncio.shield(task)
+            return result, True
+
+        task = asyncio.create_task(self._resolve(digest, variant, image_bytes, analyze))
+        self._inflight[digest] = task
+        return await asyncio.shield(task)
+
+    async def _resolve(self, digest: str, variant: str, image_bytes: bytes, analyze: Callable[[], Awaitable[Analysis]]) -> Tuple[Analysis, bool]:
+        try:
+            phash = await run_in_threadpool(perceptual_hash, image_bytes) if self.perceptual else None
+            if phash is not None:
+                match = self._nearest(phash, variant)
+                if match is not None:
+                    self.perceptual_hits += 1
+                    self._store(digest, phash, match)
+                    return match, True
+
+            if self.persistent:
+                stored = await self._load_persistent(digest, variant, phash)
+                if stored is not None:
+                    self.persistent_hits += 1
+                    self._store(digest, phash, stored)
+                    return stored, True
+
+            self.misses += 1
+            result = await analyze()
+            self._store(digest, phash, result)
+            if self.persistent:
+                await self._save_persistent(digest, variant, phash, result)
+            return result, False
+        finally:
+            self._inflight.pop(digest, None)
+
+    def update(self, image_bytes: bytes, result: Analysis, variant: str = "") -> None:
+        """Replace a cached analysis (e.g. after rescoring with a new model)."""
+        digest = _entry_key(variant, image_bytes)
+        entry = self._entries.get(digest)
+        if entry is not None:
+            self._entries[digest] = (entry[0], result)
+
+    def _nearest(self, phash: int, variant: str) -> Optional[Analysis]:
+        prefix = f"{variant}:"
+        best, best_distance = None, self.max_distance + 1
+        for digest, (other, result) in self._entries.items():
+            if other is None or not digest.startswith(prefix):
+                continue
+            distance = bin(phash ^ other).count("1")
+            if distance < best_distance:
+                best, best_distance = digest, distance
+        if best is None:
+            return None
+        self._entries.move_to_end(best)
+        return self._entries[best][1]
+
+    def _store(self, digest: str, phash: Optional[int], result: Analysis) -> None:
+        self._entries[digest] = (phash, result)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def _load_persistent(self, digest: str, variant: str, phash: Optional[int]) -> Optional[Analysis]:
+        query: Dict[str, Any] = {"_id": digest}
+        if phash is not None:
+            query = {"$or": [query, {"phash": _phash_key(phash), "variant": variant}]}
+        try:
+            doc = await async_screenshot_cache_collection().find_one_and_update(
+                query, {"$inc": {"hits": 1}, "$set": {"last_hit_at": datetime.utcnow()}}
+            )
+        except Exception as e:
+            print(f"⚠️ Screenshot cache lookup failed: {e}")
+            return None
+        return doc["result"] if doc else None
+
+    async def _save_persistent(self, digest: str, variant: str, phash: Optional[int], result: Analysis) -> None:
+        doc = {"result": result, "variant": variant, "created_at": datetime.utcnow(), "hits": 0}
+        if phash is not None:
+            doc["phash"] = _phash_key(phash)
+        try:
+            await async_screenshot_cache_collection().update_one({"_id": digest}, {"$setOnInsert": doc}, upsert=True)
+        except Exception as e:
+            print(f"⚠️ Screenshot cache write failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        hits = self.hits + self.perceptual_hits + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "perceptual": self.perceptual,
+            "persistent": self.persistent,
+            "hits": self.hits,
+            "perceptual_hits": self.perceptual_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+settings = get_settings()
+screenshot_cache = ScreenshotCache(
+    max_entries=settings.screenshot_cache_size,
+    perceptual=settings.screenshot_cache_perceptual,
+    max_distance=settings.screenshot_cache_max_distance,
+    persistent=settings.screenshot_cache_persist,
+)
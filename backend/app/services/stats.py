@@ -0,0 +1,268 @@
+"""
+Per-number rollup documents (`number_stats` collection) and the global
+report counters (`counters` collection, `_id: "reports"`).
+
+Each report is folded into its number's rollup with a single atomic upsert,
+so lookups read one small document instead of scanning the report history.
+
+Document layout (``_id`` is the number's integer key, see app.services.numbers)::
+
+    {
+        "_id": 9779801234567,
+        "number": "+9779801234567",
+        "total": 42,
+        "categories": {"OTP Theft Attempt": 30, ...},
+        "high_prob": 35,              # all-time scam_probability > 0.6
+        "victim": 2,                  # all-time victim self-reports
+        "tail": [...],                # oldest RECENT_REPORTS_LIMIT reports
+        "minutes": {"202401011205": {"count": 3, "messages": {<hash>: 2, ...}}},
+        "hours": {"2024010112": {"count": 5, "otp": 4, "high_prob": 5,
+                                  "victim": 0, "categories": {...}}},
+        "minute_keys": [...], "hour_keys": [...],   # bucket index for pruning
+        "first_report_at": ..., "last_report_at": ...,
+        "updated_at": ...,                          # server time of the last write
+        "alert_flags": [...],                       # flags last alerted on (app.services.anomalies)
+        "campaign": {"id", "numbers", "reports", "sample_text"},  # largest campaign (app.services.campaigns)
+    }
+
+Minute buckets back the 1h window; hour buckets are kept for 7 days and back
+the 48h SIM-swap window and the 24h/7d trending windows. Buckets that fall
+out of retention are pruned on write.
+"""
+
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+# OTP-related categories (indicates account takeover attempts)
+OTP_LIKE_CATEGORIES = ["OTP Theft Attempt", "Impersonation (Bank)"]
+
+# Victim self-report detection (phrases indicating hijack)
+VICTIM_KEYWORDS = ["hacked", "not me", "someone using", "stolen", "hijacked", "unauthorized"]
+
+# Number of reports returned in the `recent_reports` tail of a lookup
+RECENT_REPORTS_LIMIT = 10
+
+MINUTE_FORMAT = "%Y%m%d%H%M"
+HOUR_FORMAT = "%Y%m%d%H"
+MINUTE_WINDOW = timedelta(minutes=60)
+HOUR_RETENTION = timedelta(days=7)
+SURGE_WINDOW = timedelta(hours=48)
+
+# Trending windows served from the buckets: name -> (bucket field, format, span)
+TRENDING_WINDOWS = {
+    "1h": ("minutes", MINUTE_FORMAT, MINUTE_WINDOW),
+    "24h": ("hours", HOUR_FORMAT, timedelta(hours=24)),
+    "7d": ("hours", HOUR_FORMAT, HOUR_RETENTION),
+}
+
+def _field_key(value: str) -> str:
+    """Make a user-supplied string safe to use as a MongoDB field name."""
+    return value.replace("$", "＄").replace(".", "．")
+
+def _from_field_key(key: str) -> str:
+    return key.replace("＄", "$").replace("．", ".")
+
+def message_key(message: str) -> str:
+    """Short stable hash of a message, used to count distinct texts."""
+    return hashlib.blake2b(message.lower().strip().encode("utf-8"), digest_size=8).hexdigest()
+
+def is_victim_report(message: str) -> bool:
+    text = message.lower()
+    return any(kw in text for kw in VICTIM_KEYWORDS)
+
+def _retention_cutoffs(now: datetime) -> tuple[str, str]:
+    return (now - MINUTE_WINDOW).strftime(MINUTE_FORMAT), (now - HOUR_RETENTION).strftime(HOUR_FORMAT)
+
+def rollup_update(report: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Build the upsert that folds one report into its number's rollup.
+
+    Windowed buckets are only touched when the report is still inside the
+    window, so backfilling historical reports does not create stale buckets.
+    """
+    now = now or datetime.utcnow()
+    created_at = report["created_at"].replace(tzinfo=None)
+    category = _field_key(report["category"])
+    high_prob = int(report.get("scam_probability", 0) > 0.6)
+    victim = int(is_victim_report(report["message"]))
+    minute_cut, hour_cut = _retention_cutoffs(now)
+    minute = created_at.strftime(MINUTE_FORMAT)
+    hour = created_at.strftime(HOUR_FORMAT)
+
+    inc = {
+        "total": 1,
+        f"categories.{category}": 1,
+        "high_prob": high_prob,
+        "victim": victim,
+    }
+    add_to_set = {}
+    if minute >= minute_cut:
+        inc[f"minutes.{minute}.count"] = 1
+        inc[f"minutes.{minute}.messages.{message_key(report['message'])}"] = 1
+        add_to_set["minute_keys"] = minute
+    if hour >= hour_cut:
+        inc[f"hours.{hour}.count"] = 1
+        inc[f"hours.{hour}.otp"] = int(report["category"] in OTP_LIKE_CATEGORIES)
+        inc[f"hours.{hour}.high_prob"] = high_prob
+        inc[f"hours.{hour}.victim"] = victim
+        inc[f"hours.{hour}.categories.{category}"] = 1
+        add_to_set["hour_keys"] = hour
+
+    update = {
+        "$inc": inc,
+        "$setOnInsert": {"number": report["number"]},
+        "$min": {"first_report_at": created_at},
+        "$max": {"last_report_at": created_at},
+        # Server time, unlike the report times above (loaders backdate those)
+        "$currentDate": {"updated_at": True},
+        "$push": {"tail": {
+            "$each": [{
+                "category": report["category"],
+                "message": report["message"],
+                "created_at": created_at,
+                "scam_probability": report.get("scam_probability", 0.0),
+            }],
+            "$sort": {"created_at": 1},
+            "$slice": RECENT_REPORTS_LIMIT,
+        }},
+    }
+    if add_to_set:
+        update["$addToSet"] = add_to_set
+    return update
+
+def rollup_update_many(reports: List[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Build one upsert folding several reports for the same number into its
+    rollup; equivalent to applying `rollup_update` for each in turn.
+    """
+    now = now or datetime.utcnow()
+    inc: Counter = Counter()
+    add_to_set: Dict[str, set] = {}
+    tail: List[Dict[str, Any]] = []
+    first = last = None
+    for report in reports:
+        update = rollup_update(report, now)
+        inc.update(update["$inc"])
+        for field, key in update.get("$addToSet", {}).items():
+            add_to_set.setdefault(field, set()).add(key)
+        tail.extend(update["$push"]["tail"]["$each"])
+        first = min(first or update["$min"]["first_report_at"], update["$min"]["first_report_at"])
+        last = max(last or update["$max"]["last_report_at"], update["$max"]["last_report_at"])
+
+    # Only the oldest RECENT_REPORTS_LIMIT of the batch can survive the $slice
+    tail.sort(key=lambda r: r["created_at"])
+    update = {
+        "$inc": dict(inc),
+        "$setOnInsert": {"number": reports[0]["number"]},
+        "$min": {"first_report_at": first},
+        "$max": {"last_report_at": last},
+        "$currentDate": {"updated_at": True},
+        "$push": {"tail": {
+            "$each": tail[:RECENT_REPORTS_LIMIT],
+            "$sort": {"created_at": 1},
+            "$slice": RECENT_REPORTS_LIMIT,
+        }},
+    }
+    if add_to_set:
+        update["$addToSet"] = {field: {"$each": sorted(keys)} for field, keys in add_to_set.items()}
+    return update
+
+# Projection used to fetch just the bucket index after an upsert
+BUCKET_KEYS_PROJECTION = {"_id": 1, "minute_keys": 1, "hour_keys": 1}
+
+def prune_update(doc: Dict[str, Any], now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """Return an update removing buckets that left their window, or None."""
+    minute_cut, hour_cut = _retention_cutoffs(now or datetime.utcnow())
+    stale_minutes = [k for k in doc.get("minute_keys", []) if k < minute_cut]
+    stale_hours = [k for k in doc.get("hour_keys", []) if k < hour_cut]
+    if not stale_minutes and not stale_hours:
+        return None
+    unset = {f"minutes.{k}": "" for k in stale_minutes}
+    unset.update({f"hours.{k}": "" for k in stale_hours})
+    return {
+        "$unset": unset,
+        "$pull": {"minute_keys": {"$in": stale_minutes}, "hour_keys": {"$in": stale_hours}},
+    }
+
+def snapshot_from_rollup(number: str, doc: Optional[Dict[str, Any]], now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Turn a rollup document into the snapshot consumed by the risk scorers.
+
+    The 1h window has minute granularity and the 48h window hour granularity
+    (the bucket containing the cutoff is counted in full).
+    """
+    doc = doc or {}
+    now = now or datetime.utcnow()
+    minute_cut = (now - MINUTE_WINDOW).strftime(MINUTE_FORMAT)
+    hour_cut = (now - SURGE_WINDOW).strftime(HOUR_FORMAT)
+
+    minutes = [b for k, b in doc.get("minutes", {}).items() if k >= minute_cut]
+    unique_messages = set()
+    for bucket in minutes:
+        unique_messages.update(bucket.get("messages", {}).keys())
+
+    hours = [b for k, b in doc.get("hours", {}).items() if k >= hour_cut]
+    categories = set()
+    for bucket in hours:
+        categories.update(_from_field_key(c) for c, n in bucket.get("categories", {}).items() if n)
+
+    return {
+        "number": number,
+        "count": doc.get("total", 0),
+        # Newest first, matching the legacy `get_reports_for(number)[-10:]`
+        "tail": list(reversed(doc.get("tail", []))),
+        "last_hour": {
+            "count": sum(b.get("count", 0) for b in minutes),
+            "unique_messages": len(unique_messages),
+        },
+        "last_48h": {
+            "count": sum(b.get("count", 0) for b in hours),
+            "otp": sum(b.get("otp", 0) for b in hours),
+            "high_prob": sum(b.get("high_prob", 0) for b in hours),
+            "victim": sum(b.get("victim", 0) for b in hours),
+            "categories": sorted(categories),
+        },
+        "campaign": doc.get("campaign"),
+    }
+
+def _bucket_count_expression(field: str, cutoff: str) -> Dict[str, Any]:
+    """Aggregation expression summing `count` over buckets keyed >= cutoff."""
+    return {"$sum": {"$map": {
+        "input": {"$filter": {
+            "input": {"$objectToArray": {"$ifNull": [f"${field}", {}]}},
+            "cond": {"$gte": ["$$this.k", cutoff]},
+        }},
+        "in": "$$this.v.count",
+    }}}
+
+def window_count_expressions(now: Optional[datetime] = None) -> Dict[str, Any]:
+    """
+    Per-window report counts as aggregation expressions, usable both in an
+    aggregation `$project` and in a find/findAndModify projection.
+    """
+    now = now or datetime.utcnow()
+    return {
+        name: _bucket_count_expression(field, (now - span).strftime(fmt))
+        for name, (field, fmt, span) in TRENDING_WINDOWS.items()
+    }
+
+# Id of the global counters document in the `counters` collection
+REPORT_COUNTERS_ID = "reports"
+
+def counters_update(report: Dict[str, Any]) -> Dict[str, Any]:
+    """Upsert that counts one report in the global total and its category."""
+    return {"$inc": {"total": 1, f"categories.{_field_key(report['category'])}": 1}}
+
+def counters_update_many(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Upsert that counts a batch of reports in the global total and their categories."""
+    inc: Counter = Counter()
+    for report in reports:
+        inc.update(counters_update(report)["$inc"])
+    return {"$inc": dict(inc)}
+
+def category_counts(doc: Optional[Dict[str, Any]]) -> Dict[str, int]:
+    """Per-category counts from a counters or rollup document, largest first."""
+    counts = {_from_field_key(k): v for k, v in (doc or {}).get("categories", {}).items()}
+    return dict(sorted(counts.items(), key=lambda kv: kv[1], reverse=True))
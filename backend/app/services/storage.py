@@ -1,27 +1,155 @@
 import os
 from datetime import datetime
-from typing import Optional
-from supabase import create_client, Client
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Optional, Tuple
+from supabase import create_client
 import uuid
+from app.services.metrics import STORAGE_DURATION, STORAGE_ERRORS, observe
+
+# Folders uploads are written to (see StorageService.new_storage_path)
+HIGH_RISK_FOLDER = "high-risk"
+ANALYSIS_FOLDER = "analysis"
+FOLDERS = (HIGH_RISK_FOLDER, ANALYSIS_FOLDER)
+
+class LocalStorageClient:
+    """
+    Local stand-in for the Supabase client (STORAGE_BACKEND=local).
+
+    Implements the subset of `client.storage.from_(bucket)` that
+    StorageService uses, writing files under a local directory, so uploads
+    can be developed and tested without Supabase.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = Path(root)
+        self.base_url = base_url.rstrip("/")
+        self.storage = self
+
+    def from_(self, bucket: str) -> "LocalBucket":
+        return LocalBucket(self.root / bucket, f"{self.base_url}/{bucket}")
+
+    def list_buckets(self) -> list:
+        if not self.root.is_dir():
+            return []
+        return [SimpleNamespace(name=entry.name) for entry in self.root.iterdir() if entry.is_dir()]
+
+class LocalBucket:
+    def __init__(self, directory: Path, base_url: str):
+        self.directory = directory
+        self.base_url = base_url
+
+    def upload(self, path: str, file: bytes, file_options: Optional[dict] = None) -> dict:
+        target = self.directory / path
+        if target.exists() and (file_options or {}).get("upsert") != "true":
+            raise FileExistsError(f"Duplicate: {path} already exists")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(file)
+        return {"path": path}
+
+    def get_public_url(self, path: str) -> str:
+        return f"{self.base_url}/{path}"
+
+    def list(self, folder: str, options: Optional[dict] = None) -> list:
+        # Same paging as Supabase: sorted by name, `limit` (default 100) from `offset`
+        options = options or {}
+        directory = self.directory / folder
+        if not directory.is_dir():
+            return []
+        offset = options.get("offset", 0)
+        entries = sorted((entry for entry in directory.iterdir() if entry.is_file()), key=lambda e: e.name)
+        return [
+            {
+                "name": entry.name,
+                "created_at": datetime.fromtimestamp(entry.stat().st_mtime).isoformat(),
+                "metadata": {"size": entry.stat().st_size},
+            }
+            for entry in entries[offset:offset + options.get("limit", 100)]
+        ]
+
+    def remove(self, paths: list) -> list:
+        for path in paths:
+            (self.directory / path).unlink(missing_ok=True)
+        return paths
 
 class StorageService:
-    """Service for managing screenshot uploads to Supabase Storage."""
+    """Service for managing screenshot uploads to Supabase Storage (or a local stand-in)."""
     
-    def __init__(self):
+    def __init__(self, client: Any = None, bucket: Optional[str] = None):
+        self.local_dir: Optional[str] = None
+        self._client: Any = None
+        self._credentials: Optional[Tuple[str, str]] = None
+        if client is not None:
+            # Injected client (tests, local stand-ins)
+            self._client = client
+            self.bucket = bucket or "scam-screenshots"
+            return
+
+        if os.getenv("STORAGE_BACKEND", "supabase").lower() == "local":
+            self.local_dir = os.getenv("LOCAL_STORAGE_DIR", "./local_storage")
+            base_url = os.getenv("LOCAL_STORAGE_URL", "http://localhost:8000/local-storage")
+            self._client = LocalStorageClient(self.local_dir, base_url)
+            self.bucket = os.getenv("SUPABASE_BUCKET", "scam-screenshots")
+            print(f"✅ Using local screenshot storage at {self.local_dir}")
+            return
+
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_SERVICE_KEY")
         
         if not supabase_url or not supabase_key:
-            self.client = None
             self.bucket = None
             print("⚠️ Supabase credentials not configured. Storage features disabled.")
         else:
-            self.client: Client = create_client(supabase_url, supabase_key)
+            # The Supabase client (and its HTTP connection pool) is created on first
+            # use, so each API worker builds its own after the process starts
+            self._credentials = (supabase_url, supabase_key)
             self.bucket = os.getenv("SUPABASE_BUCKET", "scam-screenshots")
-    
+
+    @property
+    def client(self) -> Any:
+        if self._client is None and self._credentials is not None:
+            self._client = create_client(*self._credentials)
+        return self._client
+
     def is_available(self) -> bool:
         """Check if storage service is configured."""
-        return self.client is not None
+        return self._client is not None or self._credentials is not None
+
+    def new_storage_path(self, filename: str, is_high_risk: bool = False) -> Tuple[str, str]:
+        """
+        Generate a unique storage path for an upload.
+
+        Returns:
+            (storage_path, folder)
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        unique_id = str(uuid.uuid4())[:8]
+        ext = filename.split('.')[-1] if '.' in filename else 'jpg'
+        
+        # Determine folder based on risk level
+        folder = HIGH_RISK_FOLDER if is_high_risk else ANALYSIS_FOLDER
+        return f"{folder}/{timestamp}_{unique_id}.{ext}", folder
+
+    def put(self, file_bytes: bytes, storage_path: str) -> dict:
+        """
+        Upload bytes to an exact storage path (overwriting, so retries are safe).
+
+        Raises on failure; returns dict with 'url' and 'path'.
+        """
+        ext = storage_path.rsplit('.', 1)[-1]
+        with observe(STORAGE_DURATION, STORAGE_ERRORS, operation="upload"):
+            self.client.storage.from_(self.bucket).upload(
+                path=storage_path,
+                file=file_bytes,
+                file_options={"content-type": f"image/{ext}", "upsert": "true"}
+            )
+            public_url = self.client.storage.from_(self.bucket).get_public_url(storage_path)
+        return {
+            "url": public_url,
+            "path": storage_path,
+            "folder": storage_path.split('/')[0],
+            "uploaded_at": datetime.now().isoformat()
+        }
     
     def upload_screenshot(
         self, 
@@ -44,31 +172,8 @@ class StorageService:
             return None
         
         try:
-            # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            ext = filename.split('.')[-1] if '.' in filename else 'jpg'
-            
-            # Determine folder based on risk level
-            folder = "high-risk" if is_high_risk else "analysis"
-            storage_path = f"{folder}/{timestamp}_{unique_id}.{ext}"
-            
-            # Upload to Supabase
-            response = self.client.storage.from_(self.bucket).upload(
-                path=storage_path,
-                file=file_bytes,
-                file_options={"content-type": f"image/{ext}"}
-            )
-            
-            # Get public URL
-            public_url = self.client.storage.from_(self.bucket).get_public_url(storage_path)
-            
-            return {
-                "url": public_url,
-                "path": storage_path,
-                "folder": folder,
-                "uploaded_at": datetime.now().isoformat()
-            }
+            storage_path, _ = self.new_storage_path(filename, is_high_risk)
+            return self.put(file_bytes, storage_path)
         
         except Exception as e:
             print(f"Storage upload failed: {e}")
@@ -88,7 +193,8 @@ class StorageService:
             return False
         
         try:
-            self.client.storage.from_(self.bucket).remove([storage_path])
+            with observe(STORAGE_DURATION, STORAGE_ERRORS, operation="remove"):
+                self.client.storage.from_(self.bucket).remove([storage_path])
             return True
         except Exception as e:
             print(f"Storage deletion failed: {e}")
@@ -109,12 +215,14 @@ class StorageService:
         
         try:
             # List files in high-risk folder
-            files = self.client.storage.from_(self.bucket).list("high-risk")
+            with observe(STORAGE_DURATION, STORAGE_ERRORS, operation="list"):
+                files = self.client.storage.from_(self.bucket).list(HIGH_RISK_FOLDER)
             
-            # Get public URLs for each file
+            # Newest first, then slice (get_public_url only for returned files)
+            files = sorted(files, key=lambda f: f.get('created_at') or '', reverse=True)
             screenshots = []
             for file in files[:limit]:
-                path = f"high-risk/{file['name']}"
+                path = f"{HIGH_RISK_FOLDER}/{file['name']}"
                 url = self.client.storage.from_(self.bucket).get_public_url(path)
                 
                 screenshots.append({
@@ -125,9 +233,6 @@ class StorageService:
                     "size": file.get('metadata', {}).get('size', 0)
                 })
             
-            # Sort by creation date (newest first)
-            screenshots.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-            
             return screenshots
         
         except Exception as e:
@@ -0,0 +1,115 @@
+"""
+Materialized trending leaderboards (`leaderboards` collection).
+
+One document per window ("1h", "24h", "7d", "all") holds the top
+LEADERBOARD_SIZE numbers, so `/trending` is a single point read no matter how
+many reports exist.
+
+Boards are kept current two ways:
+  * on insert, the reported number's fresh window counts are merged into each
+    board with one atomic pipeline update (MongoDB 5.2+ for `$sortArray`)
+  * a background task periodically recomputes every board from the
+    `number_stats` rollups, which ages out counts that slid past the window
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List
+from pymongo import DESCENDING
+from app.db.mongo import async_leaderboards_collection, async_number_stats_collection
+from app.services.stats import TRENDING_WINDOWS, window_count_expressions
+
+LEADERBOARD_SIZE = 100
+WINDOWS = [*TRENDING_WINDOWS, "all"]
+DEFAULT_WINDOW = "all"
+
+# How often boards are recomputed from the rollups (seconds)
+REFRESH_INTERVAL = 60
+
+# Lowest count on each full board as last seen by this worker; inserts below
+# it skip the board write (the periodic refresh corrects any drift).
+_board_floor: Dict[str, int] = {}
+
+def _merge_pipeline(number: str, reports: int, now: datetime) -> List[Dict[str, Any]]:
+    return _merge_many_pipeline([{"number": number, "reports": reports}], now)
+
+def _merge_many_pipeline(entries: List[Dict[str, Any]], now: datetime) -> List[Dict[str, Any]]:
+    numbers = [e["number"] for e in entries]
+    others = {"$filter": {"input": {"$ifNull": ["$items", []]}, "cond": {"$not": [{"$in": ["$$this.number", numbers]}]}}}
+    merged = {"$concatArrays": [others, entries]}
+    return [{"$set": {
+        "items": {"$slice": [{"$sortArray": {"input": merged, "sortBy": {"reports": -1}}}, LEADERBOARD_SIZE]},
+        "updated_at": now,
+    }}]
+
+async def record_counts(number: str, counts: Dict[str, int]) -> None:
+    """Merge one number's current window counts into the leaderboards."""
+    boards = async_leaderboards_collection()
+    now = datetime.utcnow()
+    for window, reports in counts.items():
+        if reports <= 0 or reports < _board_floor.get(window, 0):
+            continue
+        await boards.update_one({"_id": window}, _merge_pipeline(number, reports, now), upsert=True)
+
+async def record_counts_many(counts: Dict[str, Dict[str, int]]) -> None:
+    """
+    Merge many numbers' window counts (number -> window -> count) into the
+    leaderboards with one update per board.
+    """
+    boards = async_leaderboards_collection()
+    now = datetime.utcnow()
+    for window in WINDOWS:
+        floor = _board_floor.get(window, 0)
+        entries = [
+            {"number": number, "reports": by_window[window]}
+            for number, by_window in counts.items()
+            if by_window.get(window, 0) > 0 and by_window[window] >= floor
+        ]
+        if not entries:
+            continue
+        # Only the top of the batch can make the board
+        entries.sort(key=lambda e: e["reports"], reverse=True)
+        await boards.update_one({"_id": window}, _merge_many_pipeline(entries[:LEADERBOARD_SIZE], now), upsert=True)
+
+async def _compute_board(window: str, now: datetime) -> List[Dict[str, Any]]:
+    stats = async_number_stats_collection()
+    if window == "all":
+        cursor = stats.find({}, {"number": 1, "total": 1}).sort("total", DESCENDING).limit(LEADERBOARD_SIZE)
+        return [{"number": d["number"], "reports": d["total"]} async for d in cursor]
+
+    _, _, span = TRENDING_WINDOWS[window]
+    pipeline = [
+        {"$match": {"last_report_at": {"$gte": now - span}}},
+        {"$project": {"number": 1, "reports": window_count_expressions(now)[window]}},
+        {"$match": {"reports": {"$gt": 0}}},
+        {"$sort": {"reports": -1}},
+        {"$limit": LEADERBOARD_SIZE},
+    ]
+    return [{"number": d["number"], "reports": d["reports"]} async for d in stats.aggregate(pipeline)]
+
+async def refresh_leaderboards() -> None:
+    """Recompute every board from the rollups (ages out expired counts)."""
+    boards = async_leaderboards_collection()
+    now = datetime.utcnow()
+    for window in WINDOWS:
+        items = await _compute_board(window, now)
+        await boards.update_one({"_id": window}, {"$set": {"items": items, "updated_at": now}}, upsert=True)
+        _remember_floor(window, items)
+
+async def leaderboard_refresher() -> None:
+    """Background loop started with the app."""
+    while True:
+        try:
+            await refresh_leaderboards()
+        except Exception as e:
+            print(f"⚠️ Leaderboard refresh failed: {e}")
+        await asyncio.sleep(REFRESH_INTERVAL)
+
+def _remember_floor(window: str, items: List[Dict[str, Any]]) -> None:
+    _board_floor[window] = items[-1]["reports"] if len(items) >= LEADERBOARD_SIZE else 0
+
+async def trending(limit: int = 10, window: str = DEFAULT_WINDOW) -> List[Dict[str, Any]]:
+    doc = await async_leaderboards_collection().find_one({"_id": window})
+    items = doc.get("items", []) if doc else []
+    _remember_floor(window, items)
+    return items[:limit]
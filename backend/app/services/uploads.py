@@ -0,0 +1,229 @@
+"""
+Background screenshot uploads.
+
+`/analyze-screenshot` returns its risk result as soon as OCR and scoring are
+done; the image is handed to this queue and uploaded to storage by worker
+tasks. Failed uploads are retried with exponential backoff (with jitter) up
+to `upload_max_attempts` times. The storage path is fixed when the job is
+created and uploads overwrite, so a retry never creates a second object.
+
+Job status is kept in memory and mirrored to the `upload_jobs` collection,
+so `GET /uploads/{job_id}` works from any API worker.
+"""
+
+import asyncio
+import random
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from starlette.concurrency import run_in_threadpool
+from app.core.config import get_settings
+from app.db.mongo import async_upload_jobs_collection
+from app.services.gallery import record_screenshot, screenshot_document
+from app.services.metrics import UPLOAD_QUEUE_DEPTH
+from app.services.storage import StorageService, storage_service
+
+QUEUED, UPLOADING, RETRYING, DONE, FAILED = "queued", "uploading", "retrying", "done", "failed"
+
+# Finished jobs kept in memory for status lookups (older ones are read from Mongo)
+MAX_TRACKED_JOBS = 10000
+
+class UploadQueue:
+    def __init__(self, storage: StorageService, workers: int = 2, max_attempts: int = 5,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0, queue_size: int = 1000):
+        self.storage = storage
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Jobs sleeping in backoff, and jobs a worker is uploading, by task / job id
+        self._retrying: Dict[asyncio.Task, Dict[str, Any]] = {}
+        self._active: Dict[str, Dict[str, Any]] = {}
+        self._stopping = False
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Stats
+        self.uploaded = 0
+        self.retries = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        if self._tasks:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self, drain_timeout: float = 5.0) -> None:
+        """
+        Give queued uploads a moment to finish, then stop the workers.
+
+        Jobs waiting for a retry, or still queued or uploading once the
+        drain times out, are marked failed (the image bytes only live in
+        this process).
+        """
+        self._stopping = True
+        interrupted = list(self._retrying.values())
+        for task in list(self._retrying):
+            task.cancel()
+        await asyncio.gather(*self._retrying, return_exceptions=True)
+        self._retrying.clear()
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), drain_timeout)
+            except asyncio.TimeoutError:
+                interrupted.extend(self._active.values())
+                while not self._queue.empty():
+                    job, _ = self._queue.get_nowait()
+                    self._queue.task_done()
+                    interrupted.append(job)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._active.clear()
+        for job in interrupted:
+            job.update(status=FAILED, error="Upload interrupted by shutdown")
+            self.failed += 1
+            await self._save(job)
+        if interrupted:
+            print(f"⚠️ {len(interrupted)} screenshot upload(s) not stored at shutdown")
+
+    async def submit(self, file_bytes: bytes, filename: str, is_high_risk: bool = False,
+                     metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Queue an upload; returns the job id, or None if storage is unavailable or the queue is full.
+
+        `metadata` (sha256, scam_probability) is recorded in the gallery once stored.
+        """
+        if not self.storage.is_available():
+            return None
+        if self._queue is None:
+            await self.start()
+        storage_path, _ = self.storage.new_storage_path(filename, is_high_risk)
+        job = {
+            "_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "storage_path": storage_path,
+            "image_url": None,
+            "attempts": 0,
+            "error": None,
+            "metadata": metadata or {},
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            self._queue.put_nowait((job, file_bytes))
+        except asyncio.QueueFull:
+            print("⚠️ Upload queue full; screenshot not stored")
+            return None
+        self._track(job)
+        await self._save(job)
+        return job["_id"]
+
+    async def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            try:
+                job = await async_upload_jobs_collection().find_one({"_id": job_id})
+            except Exception as e:
+                print(f"⚠️ Upload job lookup failed: {e}")
+                return None
+        return _public(job) if job else None
+
+    async def _worker(self) -> None:
+        while True:
+            job, file_bytes = await self._queue.get()
+            self._active[job["_id"]] = job
+            try:
+                await self._attempt(job, file_bytes)
+            except Exception as e:
+                print(f"⚠️ Upload worker error: {e}")
+            finally:
+                self._active.pop(job["_id"], None)
+                self._queue.task_done()
+
+    async def _attempt(self, job: Dict[str, Any], file_bytes: bytes) -> None:
+        job["attempts"] += 1
+        job["status"] = UPLOADING
+        try:
+            # Supabase's client is synchronous
+            result = await run_in_threadpool(self.storage.put, file_bytes, job["storage_path"])
+        except Exception as e:
+            job["error"] = str(e)
+            if job["attempts"] >= self.max_attempts or self._stopping:
+                job["status"] = FAILED
+                self.failed += 1
+                print(f"⚠️ Screenshot upload {job['_id']} failed after {job['attempts']} attempts: {e}")
+            else:
+                job["status"] = RETRYING
+                self.retries += 1
+                # Referenced until done, so stop() can cancel it and fail the job
+                task = asyncio.create_task(self._retry_later(job, file_bytes))
+                self._retrying[task] = job
+                task.add_done_callback(lambda t: self._retrying.pop(t, None))
+            await self._save(job)
+            return
+
+        job.update(status=DONE, image_url=result["url"], error=None)
+        self.uploaded += 1
+        await self._save(job)
+        try:
+            await record_screenshot(screenshot_document(
+                job["storage_path"], result["url"], len(file_bytes), job["metadata"], job["updated_at"]
+            ))
+        except Exception as e:
+            print(f"⚠️ Could not record screenshot metadata for {job['storage_path']}: {e}")
+
+    async def _retry_later(self, job: Dict[str, Any], file_bytes: bytes) -> None:
+        # Sleep outside the workers so a flaky backend doesn't stall other uploads
+        delay = min(self.backoff_base * 2 ** (job["attempts"] - 1), self.backoff_max)
+        await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        try:
+            self._queue.put_nowait((job, file_bytes))
+        except asyncio.QueueFull:
+            await self._queue.put((job, file_bytes))
+
+    def _track(self, job: Dict[str, Any]) -> None:
+        self._jobs[job["_id"]] = job
+        while len(self._jobs) > MAX_TRACKED_JOBS:
+            self._jobs.popitem(last=False)
+
+    async def _save(self, job: Dict[str, Any]) -> None:
+        job["updated_at"] = datetime.utcnow()
+        try:
+            await async_upload_jobs_collection().replace_one({"_id": job["_id"]}, job, upsert=True)
+        except Exception as e:
+            print(f"⚠️ Could not persist upload job {job['_id']}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "uploaded": self.uploaded,
+            "retries": self.retries,
+            "retrying": len(self._retrying),
+            "failed": self.failed,
+        }
+
+def _public(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["_id"],
+        "status": job["status"],
+        "storage_path": job["storage_path"] if job["status"] == DONE else None,
+        "image_url": job.get("image_url"),
+        "attempts": job["attempts"],
+        "error": job.get("error"),
+    }
+
+settings = get_settings()
+upload_queue = UploadQueue(
+    storage_service,
+    workers=settings.upload_workers,
+    max_attempts=settings.upload_max_attempts,
+    backoff_base=settings.upload_backoff_base,
+    backoff_max=settings.upload_backoff_max,
+    queue_size=settings.upload_queue_size,
+)
+UPLOAD_QUEUE_DEPTH.set_function(lambda: upload_queue.stats()["queued"])
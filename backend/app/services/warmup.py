@@ -0,0 +1,113 @@
+"""
+Per-worker warmup, reported by GET /health/ready.
+
+Every API worker runs the steps below once it has started accepting
+connections; the readiness endpoint answers 503 until all of them have
+succeeded, so a load balancer only routes traffic to warm workers:
+  * mongo: ping through the worker's own pool (opens the first connections)
+  * model: load the scoring model and start micro-batching
+  * number_filter: wait for the first reported-number filter build
+  * caches: prime the dashboard, trending and campaign caches
+
+A failing step is retried every WARMUP_RETRY_SECONDS (e.g. while MongoDB
+is unreachable). Once shutdown begins the endpoint reports "draining".
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from app.core.config import get_settings
+from app.db.mongo import get_async_client
+from app.services.campaigns import active_campaigns
+from app.services.model import model_server
+from app.services.number_filter import reported_numbers
+from app.services.risk import dashboard_summary
+from app.services.trending import trending, WINDOWS
+
+Step = Tuple[str, Callable[[], Awaitable[Any]]]
+
+async def _ping_mongo() -> None:
+    await get_async_client().admin.command("ping")
+
+async def _load_model() -> None:
+    # joblib load + warmup predictions off the event loop; /health keeps answering
+    if not model_server.loaded:
+        await asyncio.to_thread(model_server.load)
+    await model_server.start()
+
+async def _number_filter() -> None:
+    if reported_numbers.enabled:
+        await reported_numbers.wait_ready()
+
+async def _prime_caches() -> None:
+    await dashboard_summary()
+    for window in WINDOWS:
+        await trending(window=window)
+    await active_campaigns()
+
+STEPS: List[Step] = [
+    ("mongo", _ping_mongo),
+    ("model", _load_model),
+    ("number_filter", _number_filter),
+    ("caches", _prime_caches),
+]
+
+class Readiness:
+    def __init__(self, steps: List[Step]):
+        self._steps = steps
+        self.ready = False
+        self.draining = False
+        self.started_at: Optional[datetime] = None
+        self.ready_at: Optional[datetime] = None
+        self.steps: Dict[str, Dict[str, Any]] = {name: {"status": "pending"} for name, _ in steps}
+
+    async def warm_up(self, retry_seconds: float) -> None:
+        """Run every step in order, retrying failures, then mark the worker ready."""
+        self.ready = self.draining = False
+        self.started_at = datetime.utcnow()
+        self.steps = {name: {"status": "pending"} for name, _ in self._steps}
+        started = time.perf_counter()
+        for name, step in self._steps:
+            state = self.steps[name]
+            state.update(status="running", attempts=0)
+            while True:
+                state["attempts"] += 1
+                step_started = time.perf_counter()
+                try:
+                    await step()
+                except Exception as e:
+                    state.update(status="retrying", error=str(e))
+                    print(f"⚠️ Warmup step '{name}' failed (attempt {state['attempts']}): {e}")
+                    await asyncio.sleep(retry_seconds)
+                    continue
+                state.update(status="done", seconds=round(time.perf_counter() - step_started, 3))
+                state.pop("error", None)
+                break
+        self.ready = True
+        self.ready_at = datetime.utcnow()
+        print(f"✅ Worker warm in {time.perf_counter() - started:.2f}s")
+
+    def drain(self) -> None:
+        self.draining = True
+        self.ready = False
+
+    def stats(self) -> Dict[str, Any]:
+        if self.ready:
+            status = "ready"
+        elif self.draining:
+            status = "draining"
+        else:
+            status = "warming"
+        return {
+            "status": status,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "ready_at": self.ready_at.isoformat() if self.ready_at else None,
+            "steps": self.steps,
+        }
+
+async def warm_up() -> None:
+    """Started as a task by the app lifespan."""
+    await readiness.warm_up(get_settings().warmup_retry_seconds)
+
+readiness = Readiness(STEPS)
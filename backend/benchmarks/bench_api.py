@@ -0,0 +1,256 @@
+"""
+End-to-end API benchmark: throughput and p50/p95/p99 latency per endpoint.
+
+Seeds a dedicated database with synthetic reports (scripts/generate_reports.py)
+and drives each scenario through the ASGI app in-process at a fixed
+concurrency. Results are printed as a table and written as JSON; with
+--baseline the run fails (exit code 1) when any scenario's p95 latency or
+throughput is more than --tolerance worse than the stored baseline, or when
+a scenario returns errors.
+
+Storage backends:
+  * a real mongod (MONGODB_URI, database --db, dropped and re-seeded)
+  * --mongomock: an in-process mongomock store (no server needed). Pipeline
+    updates, $sortArray and aggregation expressions in find projections are
+    not supported by mongomock, so write-path scenarios can error there;
+    use it for read paths and CPU-bound endpoints.
+
+Usage:
+    python benchmarks/bench_api.py --reports 100000 --output bench.json
+    python benchmarks/bench_api.py --reports 100000 --baseline bench.json
+    python benchmarks/bench_api.py --mongomock --scenarios number,classify,dashboard
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+
+import httpx
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+SCENARIOS = ["number", "sim_swap", "trending", "dashboard", "reports", "classify", "screenshot"]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@lru_cache(maxsize=None)
+def build_screenshot(i: int) -> bytes:
+    # A distinct image per request so the screenshot cache does not serve it
+    image = Image.new("RGB", (1080, 1200), "white")
+    draw = ImageDraw.Draw(image)
+    for line in range(20):
+        draw.text((40, 40 + line * 50), f"Ref {i}-{line}: You won Rs 5 lakh. Share OTP to claim now.", fill="black")
+    buf = io.BytesIO()
+    image.save(buf, "PNG")
+    return buf.getvalue()
+
+
+def use_mongomock():
+    import mongomock
+    from mongomock_motor import AsyncMongoMockClient
+    import app.db.mongo as mongo
+    mongo._client = mongomock.MongoClient()
+    mongo._async_client = AsyncMongoMockClient(mock_mongo_client=mongo._client)
+
+
+def seed(count: int, seed_value: int, now: datetime):
+    """Drop the benchmark database and load synthetic reports; returns a sample of reported numbers."""
+    from app.db.mongo import get_client, _db_name
+    from scripts.generate_reports import synthesize_reports
+    from scripts.load_dummy_data import insert_batches
+    from scripts.rebuild_number_stats import rebuild_number_stats
+
+    get_client().drop_database(_db_name())
+    numbers = []
+    sample = random.Random(seed_value)
+
+    def blocks():
+        for block in synthesize_reports(count, seed=seed_value, bursts=max(count // 2000, 1),
+                                        campaigns=max(count // 5000, 1), now=now):
+            # Sample numbers the way traffic would hit them (popular numbers more often)
+            numbers.extend(r["number"] for r in sample.sample(block, min(len(block), 50)))
+            yield block
+
+    insert_batches(blocks(), batch_size=5000, workers=4)
+    rebuild_number_stats()
+    return numbers
+
+
+def scenario_request(name: str, numbers, messages, i: int):
+    """(method, path, kwargs) for the i-th request of a scenario."""
+    number = numbers[i % len(numbers)]
+    if name == "number":
+        return "GET", f"/number/{number}", {}
+    if name == "sim_swap":
+        return "GET", f"/sim_swap/{number}", {}
+    if name == "trending":
+        return "GET", "/trending", {"params": {"window": ("1h", "24h", "7d", "all")[i % 4]}}
+    if name == "dashboard":
+        return "GET", "/dashboard", {}
+    if name == "reports":
+        message = messages[i % len(messages)]
+        return "POST", "/reports", {"json": {"number": number, "category": message["category"], "message": message["message"]}}
+    if name == "classify":
+        return "POST", "/classify", {"json": {"message": messages[i % len(messages)]["message"]}}
+    if name == "screenshot":
+        return "POST", "/analyze-screenshot", {"files": {"file": ("bench.png", build_screenshot(i), "image/png")}}
+    raise ValueError(name)
+
+
+async def run_scenario(client, name, numbers, messages, requests: int, concurrency: int, warmup: int) -> dict:
+    for i in range(warmup):
+        method, path, kwargs = scenario_request(name, numbers, messages, -1 - i)
+        await client.request(method, path, **kwargs)
+
+    latencies = []
+    errors = {}
+    counter = iter(range(requests))
+
+    async def worker():
+        for i in counter:
+            method, path, kwargs = scenario_request(name, numbers, messages, i)
+            start = time.perf_counter()
+            try:
+                r = await client.request(method, path, **kwargs)
+                status = r.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(requests / elapsed, 1),
+        "mean_ms": round(statistics.fmean(latencies), 2),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions versus a baseline run, as human-readable strings."""
+    problems = []
+    for name, current in results["scenarios"].items():
+        if current["errors"]:
+            problems.append(f"{name}: errors {current['errors']}")
+        before = baseline.get("scenarios", {}).get(name)
+        if not before:
+            continue
+        if current["p95_ms"] > before["p95_ms"] * (1 + tolerance):
+            problems.append(f"{name}: p95 {current['p95_ms']}ms vs baseline {before['p95_ms']}ms")
+        if current["throughput_rps"] < before["throughput_rps"] * (1 - tolerance):
+            problems.append(f"{name}: {current['throughput_rps']} req/s vs baseline {before['throughput_rps']} req/s")
+    return problems
+
+
+async def run(args, scenarios) -> dict:
+    from app.main import app
+    from scripts.generate_reports import load_templates
+
+    now = datetime.utcnow()
+    print(f"Seeding {args.reports} reports...", file=sys.stderr)
+    started = time.perf_counter()
+    numbers = await asyncio.to_thread(seed, args.reports, args.seed, now)
+    print(f"Seeded in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    messages = load_templates()
+    random.Random(args.seed).shuffle(numbers)
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for name in scenarios:
+                requests, concurrency = args.requests, args.concurrency
+                if name == "screenshot":
+                    # OCR sheds load with 503 beyond its pool capacity; stay under it
+                    requests, concurrency = args.screenshot_requests, args.screenshot_concurrency
+                    for i in range(-args.warmup, requests):
+                        build_screenshot(i)  # rendered up front, outside the timed loop
+                results[name] = await run_scenario(client, name, numbers, messages, requests, concurrency, args.warmup)
+                print(f"{name:<10} {results[name]['throughput_rps']:>9.1f} req/s  p50 {results[name]['p50_ms']:>8.2f}ms  "
+                      f"p95 {results[name]['p95_ms']:>8.2f}ms  p99 {results[name]['p99_ms']:>8.2f}ms  "
+                      f"errors {results[name]['errors'] or 0}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--reports", type=int, default=20000, help="synthetic reports to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per scenario")
+    parser.add_argument("--screenshot-requests", type=int, default=50)
+    parser.add_argument("--screenshot-concurrency", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="fyp_bench", help="database to (re)create on the configured mongod")
+    parser.add_argument("--mongomock", action="store_true", help="use an in-process mongomock store")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    # Settings are read at import time
+    os.environ["MONGODB_DB"] = args.db
+    if args.mongomock:
+        use_mongomock()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "store": "mongomock" if args.mongomock else "mongod",
+            "reports": args.reports,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "scenarios": asyncio.run(run(args, scenarios)),
+    }
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        problems = compare(results, json.loads(Path(args.baseline).read_text()), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        if problems:
+            sys.exit(1)
+        print("No regressions against baseline", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Throughput of POST /classify/batch versus one POST /classify per message.
+
+Runs in-process through the ASGI app by default, or against a live server
+with --url. Verifies that the batch results equal the single-message
+responses and prints messages/second for both paths.
+
+Usage:
+    python benchmarks/bench_classify_batch.py --messages 5000
+    python benchmarks/bench_classify_batch.py --url http://localhost:8000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from bench_keywords import build_messages
+
+
+def make_client(url):
+    if url:
+        return httpx.AsyncClient(base_url=url, timeout=60)
+    from app.main import app
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+
+async def single_requests(client, messages, concurrency):
+    results = [None] * len(messages)
+    queue = iter(enumerate(messages))
+
+    async def worker():
+        for i, message in queue:
+            r = await client.post("/classify", json={"message": message})
+            r.raise_for_status()
+            results[i] = r.json()
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return results
+
+
+async def batch_requests(client, messages, batch_size):
+    results = []
+    for start in range(0, len(messages), batch_size):
+        body = "".join(json.dumps({"message": m}) + "\n" for m in messages[start:start + batch_size])
+        r = await client.post("/classify/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+        r.raise_for_status()
+        results.extend(json.loads(line) for line in r.text.splitlines())
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--url", default=None, help="base URL of a running server (default: in-process)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages, args.seed)
+    async with make_client(args.url) as client:
+        start = time.perf_counter()
+        single = await single_requests(client, messages, args.concurrency)
+        single_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch = await batch_requests(client, messages, args.batch_size)
+        batch_elapsed = time.perf_counter() - start
+
+    assert single == batch, "batch results differ from /classify"
+    single_rate = len(messages) / single_elapsed
+    batch_rate = len(messages) / batch_elapsed
+    print(json.dumps({
+        "messages": len(messages),
+        "single_msgs_per_s": round(single_rate, 1),
+        "batch_msgs_per_s": round(batch_rate, 1),
+        "speedup": round(batch_rate / single_rate, 1),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
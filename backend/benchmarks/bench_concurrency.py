@@ -0,0 +1,114 @@
+"""
+Concurrency benchmark for the MongoDB data layer.
+
+Simulates N parallel API clients issuing `/number/{number}` lookups inside one
+event loop (one uvicorn worker) and compares:
+
+  * blocking: the previous data layer, synchronous pymongo called from
+    `async def` code, which stalls the event loop on every query
+  * async:    the Motor-backed `app.services.risk` functions
+
+Alongside throughput it reports event-loop lag (how late a 10 ms timer fires),
+which is what every other in-flight request on the worker experiences.
+
+Requires a reachable MongoDB (MONGODB_URI / MONGODB_DB), ideally seeded with
+`python scripts/load_dummy_data.py`.
+
+Usage:
+    python benchmarks/bench_concurrency.py --clients 200 --duration 10
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongo import number_stats_collection, async_reports_collection
+from app.services.numbers import canonical_number
+from app.services.risk import risk_score
+from app.services.stats import snapshot_from_rollup
+
+
+async def blocking_lookup(number: str):
+    # Synchronous driver call made directly on the event loop thread
+    n = canonical_number(number)
+    return snapshot_from_rollup(n.display, number_stats_collection().find_one({"_id": n.key}))
+
+
+async def async_lookup(number: str):
+    return await risk_score(number)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_mode(lookup, numbers, clients: int, duration: float) -> dict:
+    latencies = []
+    lags = []
+    deadline = time.perf_counter() + duration
+
+    async def client(idx: int):
+        i = idx
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await lookup(numbers[i % len(numbers)])
+            latencies.append(time.perf_counter() - start)
+            i += clients
+
+    async def lag_probe():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    started = time.perf_counter()
+    await asyncio.gather(lag_probe(), *(client(i) for i in range(clients)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+        },
+        "loop_lag_ms": {
+            "mean": round(statistics.mean(lags) * 1000, 2) if lags else 0.0,
+            "max": round(max(lags) * 1000, 2) if lags else 0.0,
+        },
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="parallel clients (default: 200)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode (default: 10)")
+    args = parser.parse_args()
+
+    numbers = await async_reports_collection().distinct("number")
+    if not numbers:
+        print("No reports found. Seed the database first: python scripts/load_dummy_data.py")
+        return
+
+    results = {"clients": args.clients, "duration_s": args.duration}
+    for name, lookup in (("blocking", blocking_lookup), ("async", async_lookup)):
+        print(f"Running {name} mode with {args.clients} clients for {args.duration}s...")
+        results[name] = await run_mode(lookup, numbers, args.clients, args.duration)
+
+    before, after = results["blocking"]["throughput_rps"], results["async"]["throughput_rps"]
+    results["speedup"] = round(after / before, 2) if before else None
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+"""
+Micro-benchmark for keyword scoring on 2000-character messages.
+
+Compares the previous per-keyword `k in text` loops (reproduced below as a
+reference) with the shared compiled matcher in `app.services.scoring`, checks
+that both produce identical results, and prints the per-message cost.
+
+Usage:
+    python benchmarks/bench_keywords.py --messages 2000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.scoring import (
+    CLASSIFY_KEYWORDS, HIGH_PRIORITY_KEYWORDS, MEDIUM_PRIORITY_KEYWORDS, LOW_PRIORITY_KEYWORDS,
+    SUSPICIOUS_PATTERNS, analyze_text_for_scam, keyword_probability,
+)
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "dummy_reports_50.json"
+MESSAGE_LENGTH = 2000
+
+
+def legacy_keyword_probability(message: str) -> float:
+    text_lower = message.lower()
+    score = 0.0
+    score += min(len(message) / 200, 0.3)
+    hits = sum(1 for k in CLASSIFY_KEYWORDS if k in text_lower)
+    score += min(hits * 0.15, 0.6)
+    return max(0.0, min(score, 0.95))
+
+
+def legacy_analyze_text(text: str):
+    text_lower = text.lower()
+    detected_keywords = []
+    score = 0.0
+    for keyword in HIGH_PRIORITY_KEYWORDS:
+        if keyword in text_lower:
+            detected_keywords.append(keyword)
+            score += 0.25
+    for keyword in MEDIUM_PRIORITY_KEYWORDS:
+        if keyword in text_lower and keyword not in detected_keywords:
+            detected_keywords.append(keyword)
+            score += 0.15
+    for keyword in LOW_PRIORITY_KEYWORDS:
+        if keyword in text_lower and keyword not in detected_keywords:
+            detected_keywords.append(keyword)
+            score += 0.08
+    for pattern in SUSPICIOUS_PATTERNS:
+        if pattern in text_lower:
+            score += 0.20
+    import re as re_module  # the old code re-imported on every call
+    if len(re_module.findall(r'\b\d{10,}\b', text)) >= 2:
+        score += 0.15
+        detected_keywords.append("multiple phone numbers")
+    if any(money in text_lower for money in ["rs", "rupees", "lakh", "crore"]):
+        score += 0.10
+    if "http" in text_lower or "www." in text_lower or ".com" in text_lower:
+        score += 0.15
+        detected_keywords.append("contains link")
+    urgency_words = ["urgent", "immediately", "now", "today", "expire", "last chance"]
+    if sum(1 for word in urgency_words if word in text_lower) >= 2:
+        score += 0.15
+        detected_keywords.append("urgency tactics")
+    return min(score, 0.99), detected_keywords[:15]
+
+
+def build_messages(count: int, seed: int):
+    rng = random.Random(seed)
+    base = [r["message"] for r in json.loads(DATA_FILE.read_text(encoding="utf-8"))]
+    filler = re.findall(r"\w+", " ".join(base).lower())
+    messages = []
+    for _ in range(count):
+        parts = []
+        while sum(len(p) + 1 for p in parts) < MESSAGE_LENGTH:
+            parts.append(rng.choice(base) if rng.random() < 0.3 else rng.choice(filler))
+        messages.append(" ".join(parts)[:MESSAGE_LENGTH])
+    return messages
+
+
+def time_per_message(fn, messages, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for m in messages:
+            fn(m)
+        best = min(best, time.perf_counter() - start)
+    return best / len(messages) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    messages = build_messages(args.messages, args.seed)
+    for m in messages:
+        assert legacy_keyword_probability(m) == keyword_probability(m)
+        score, keywords, _ = analyze_text_for_scam(m)
+        assert legacy_analyze_text(m) == (score, keywords)
+
+    results = {
+        "messages": len(messages),
+        "message_length": MESSAGE_LENGTH,
+        "classify_us_per_message": {
+            "legacy": round(time_per_message(legacy_keyword_probability, messages, args.repeat), 2),
+            "compiled": round(time_per_message(keyword_probability, messages, args.repeat), 2),
+        },
+        "screenshot_us_per_message": {
+            "legacy": round(time_per_message(legacy_analyze_text, messages, args.repeat), 2),
+            "compiled": round(time_per_message(analyze_text_for_scam, messages, args.repeat), 2),
+        },
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
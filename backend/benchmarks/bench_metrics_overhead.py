@@ -0,0 +1,87 @@
+"""
+Cost of the Prometheus instrumentation on the POST /classify hot path.
+
+Runs /classify in-process through two ASGI stacks of the same app, with and
+without MetricsMiddleware, alternating rounds to cancel out drift, and adds
+the measured cost of the per-call scoring histogram observation (which both
+stacks pay). Exits 1 when the total exceeds --budget of the uninstrumented
+request latency.
+
+Usage:
+    python benchmarks/bench_metrics_overhead.py --requests 5000 --rounds 5 --budget 0.05
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.main import app
+from app.middleware.metrics import MetricsMiddleware
+from app.services.metrics import SCORING_DURATION
+
+MESSAGE = "Your eSewa account is blocked. Share the OTP code within 10 minutes to verify."
+
+
+def bare_stack():
+    """The app's middleware stack without MetricsMiddleware."""
+    instrumented = app.user_middleware
+    app.user_middleware = [m for m in instrumented if m.cls is not MetricsMiddleware]
+    try:
+        return app.build_middleware_stack()
+    finally:
+        app.user_middleware = instrumented
+
+
+async def per_request_us(asgi_app, requests: int) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(requests):
+            r = await client.post("/classify", json={"message": MESSAGE})
+            r.raise_for_status()
+        return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="requests per round and stack")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=0.05, help="allowed overhead as a fraction of request latency")
+    args = parser.parse_args()
+
+    stacks = {"bare": bare_stack(), "instrumented": app.build_middleware_stack()}
+    if not any(m.cls is MetricsMiddleware for m in app.user_middleware):
+        sys.exit("MetricsMiddleware is not installed (METRICS_ENABLED=false?)")
+
+    samples = {name: [] for name in stacks}
+    async with app.router.lifespan_context(app):
+        for name, stack in stacks.items():
+            await per_request_us(stack, 200)  # warm up
+        for _ in range(args.rounds):
+            for name, stack in stacks.items():
+                samples[name].append(await per_request_us(stack, args.requests))
+
+    bare = statistics.median(samples["bare"])
+    instrumented = statistics.median(samples["instrumented"])
+    observe_us = min(timeit.repeat(lambda: SCORING_DURATION.labels("message").observe(0.0001), number=10000, repeat=5)) / 10000 * 1e6
+    overhead = instrumented - bare + observe_us
+
+    print(f"/classify without metrics:  {bare:8.1f} µs/request")
+    print(f"/classify with metrics:     {instrumented:8.1f} µs/request")
+    print(f"Scoring histogram observe:  {observe_us:8.2f} µs/call")
+    print(f"Instrumentation overhead:   {overhead:8.1f} µs/request ({overhead / bare:.1%}, budget {args.budget:.0%})")
+    if overhead > bare * args.budget:
+        print("❌ Over budget")
+        sys.exit(1)
+    print("✅ Within budget")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+OCR latency and keyword recall per mode over a folder of screenshots.
+
+For every image in --folder, runs the previous path (full-resolution image
+straight into Tesseract, "raw") and the preprocessed "fast" and "accurate"
+modes from app.services.ocr. A sidecar `<image>.txt` holds the true text;
+recall is the share of scam keywords in the true text that the OCR output
+also contains. Without a folder, --generate renders synthetic 4000px phone
+screenshots (light and dark mode) from the dummy reports.
+
+Usage:
+    python benchmarks/bench_ocr.py --generate 20 --folder /tmp/ocr-samples
+    python benchmarks/bench_ocr.py --folder path/to/screenshots
+"""
+
+import argparse
+import io
+import json
+import random
+import statistics
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytesseract
+from PIL import Image, ImageDraw, ImageFont
+from app.services.ocr import OCR_MODES, preprocess, _configure_tesseract
+from app.services.scoring import SCREENSHOT_MATCHER
+
+DATA_FILE = Path(__file__).parent.parent / "data" / "dummy_reports_50.json"
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".webp"}
+
+
+def generate_samples(folder: Path, count: int, seed: int) -> None:
+    rng = random.Random(seed)
+    messages = [r["message"] for r in json.loads(DATA_FILE.read_text(encoding="utf-8"))]
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", 96)
+    except OSError:
+        font = ImageFont.load_default(size=96)
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        text = " ".join(rng.sample(messages, 3))
+        dark = i % 2 == 1
+        image = Image.new("RGB", (3000, 6000), (18, 18, 24) if dark else (250, 250, 250))
+        draw = ImageDraw.Draw(image)
+        y = 300
+        for line in textwrap.wrap(text, 45):
+            draw.text((150, y), line, font=font, fill=(235, 235, 235) if dark else (20, 20, 20))
+            y += 130
+        stem = folder / f"sample_{i:03d}"
+        if i % 3 == 0:
+            image.save(f"{stem}.png")
+        else:
+            image.save(f"{stem}.jpg", quality=85)
+        Path(f"{stem}.txt").write_text(text, encoding="utf-8")
+
+
+def ocr_raw(image_bytes: bytes) -> str:
+    return pytesseract.image_to_string(Image.open(io.BytesIO(image_bytes))).strip()
+
+
+def ocr_mode(image_bytes: bytes, mode: str) -> str:
+    settings = OCR_MODES[mode]
+    image = preprocess(image_bytes, mode)
+    return pytesseract.image_to_string(image, config=f"--psm {settings['psm']} --dpi {settings['dpi']}").strip()
+
+
+def keyword_recall(truth: str, text: str) -> float:
+    expected = SCREENSHOT_MATCHER.find(truth.lower())
+    if not expected:
+        return 1.0
+    return len(expected & SCREENSHOT_MATCHER.find(text.lower())) / len(expected)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folder", type=Path, default=Path("ocr-samples"))
+    parser.add_argument("--generate", type=int, default=0, help="render N synthetic screenshots into --folder first")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if not _configure_tesseract():
+        print("⚠️ Tesseract not found; set TESSERACT_PATH or put tesseract on PATH.")
+    if args.generate:
+        generate_samples(args.folder, args.generate, args.seed)
+
+    images = sorted(p for p in args.folder.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+    if not images:
+        sys.exit(f"No images in {args.folder}")
+
+    runners = {"raw": ocr_raw, **{mode: (lambda b, m=mode: ocr_mode(b, m)) for mode in OCR_MODES}}
+    results = {name: {"latency": [], "recall": []} for name in runners}
+    for path in images:
+        image_bytes = path.read_bytes()
+        truth_file = path.with_suffix(".txt")
+        truth = truth_file.read_text(encoding="utf-8") if truth_file.exists() else None
+        for name, run in runners.items():
+            start = time.perf_counter()
+            text = run(image_bytes)
+            results[name]["latency"].append((time.perf_counter() - start) * 1000)
+            if truth is not None:
+                results[name]["recall"].append(keyword_recall(truth, text))
+
+    print(f"{len(images)} images from {args.folder}")
+    print(f"{'mode':<10} {'p50 ms':>9} {'p95 ms':>9} {'keyword recall':>15}")
+    for name, r in results.items():
+        recall = f"{statistics.mean(r['recall']):.3f}" if r["recall"] else "n/a"
+        print(f"{name:<10} {statistics.median(r['latency']):>9.0f} {percentile(r['latency'], 95):>9.0f} {recall:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Flood /analyze-screenshot and measure how responsive the rest of the API stays.
+
+Keeps --uploads concurrent screenshot uploads in flight for --duration
+seconds while a prober hits /health and /number/{number}. Prints the upload
+status mix (200 / 503 fast-fail / 504 timeout) and probe latency percentiles.
+Needs a running server with Tesseract installed.
+
+Usage:
+    python benchmarks/bench_ocr_load.py --url http://localhost:8000 --uploads 16 --duration 20
+"""
+
+import argparse
+import asyncio
+import io
+import statistics
+import time
+from collections import Counter
+
+import httpx
+from PIL import Image, ImageDraw
+
+
+def build_screenshot() -> bytes:
+    image = Image.new("RGB", (1080, 1920), "white")
+    draw = ImageDraw.Draw(image)
+    for i in range(40):
+        draw.text((40, 40 + i * 45), "Congratulations! You won Rs 5 lakh. Share OTP to claim now.", fill="black")
+    buf = io.BytesIO()
+    image.save(buf, "PNG")
+    return buf.getvalue()
+
+
+async def uploader(client, image, deadline, statuses):
+    while time.perf_counter() < deadline:
+        r = await client.post("/analyze-screenshot", files={"file": ("bench.png", image, "image/png")})
+        statuses[r.status_code] += 1
+        if r.status_code == 503:
+            await asyncio.sleep(0.05)
+
+
+async def prober(client, deadline, number, latencies):
+    while time.perf_counter() < deadline:
+        for path in ("/health", f"/number/{number}"):
+            start = time.perf_counter()
+            await client.get(path)
+            latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.05)
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--uploads", type=int, default=16, help="concurrent uploads")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--number", default="9801234567")
+    args = parser.parse_args()
+
+    image = build_screenshot()
+    statuses = Counter()
+    latencies = []
+    async with httpx.AsyncClient(base_url=args.url, timeout=120) as client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            prober(client, deadline, args.number, latencies),
+            *(uploader(client, image, deadline, statuses) for _ in range(args.uploads)),
+        )
+        ocr_stats = (await client.get("/health/ocr")).json()
+
+    print(f"Uploads: {dict(statuses)} ({statuses[200] / args.duration:.1f} OCR/s)")
+    print(
+        f"Probe latency ms: p50={statistics.median(latencies):.1f} "
+        f"p95={percentile(latencies, 95):.1f} max={max(latencies):.1f}"
+    )
+    print(f"OCR pool: {ocr_stats}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
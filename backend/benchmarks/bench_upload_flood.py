@@ -0,0 +1,138 @@
+"""
+Flood /analyze-screenshot with oversized uploads and watch server memory.
+
+Starts the API under uvicorn (or targets --url/--pid), then keeps
+--concurrency clients sending --size MB uploads for --duration seconds: half
+declare an honest Content-Length (rejected before the body is read), half
+stream chunked bodies with no length (cut off at the running byte cap).
+Prints the status mix and the server's RSS before, at peak and after; with
+streaming intake the RSS stays flat instead of growing with --size.
+
+Usage:
+    python benchmarks/bench_upload_flood.py --size 200 --concurrency 32 --duration 15
+    python benchmarks/bench_upload_flood.py --url http://localhost:8000 --pid 12345
+"""
+
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).parent.parent
+CHUNK = b"\0" * (256 * 1024)
+BOUNDARY = "floodboundary"
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def multipart_parts(size_bytes: int):
+    head = (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.png\"\r\n"
+        "Content-Type: image/png\r\n\r\n"
+    ).encode() + b"\x89PNG\r\n\x1a\n"
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+    return head, size_bytes // len(CHUNK), tail
+
+
+async def chunked_body(size_bytes: int):
+    head, chunks, tail = multipart_parts(size_bytes)
+    yield head
+    for _ in range(chunks):
+        yield CHUNK
+    yield tail
+
+
+async def flood_client(client, size_bytes, chunked, deadline, statuses):
+    head, chunks, tail = multipart_parts(size_bytes)
+    headers = {"Content-Type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if not chunked:
+        headers["Content-Length"] = str(len(head) + chunks * len(CHUNK) + len(tail))
+    while time.perf_counter() < deadline:
+        try:
+            r = await client.post("/analyze-screenshot", content=chunked_body(size_bytes), headers=headers)
+            statuses[r.status_code] += 1
+        except httpx.HTTPError as e:
+            # The server may close the connection mid-upload once it has answered 413
+            statuses[type(e).__name__] += 1
+
+
+async def sample_rss(pid, deadline, samples):
+    while time.perf_counter() < deadline:
+        samples.append(rss_mb(pid))
+        await asyncio.sleep(0.1)
+
+
+def start_server(port: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ, "OCR_WORKERS": os.environ.get("OCR_WORKERS", "1")},
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.kill()
+    sys.exit("Server did not start")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url")
+    parser.add_argument("--pid", type=int, help="server pid for RSS sampling (with --url)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--size", type=int, default=200, help="upload size in MB")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url, pid = args.url, args.pid
+    else:
+        server = start_server(args.port)
+        url, pid = f"http://127.0.0.1:{args.port}", server.pid
+
+    try:
+        before = rss_mb(pid) if pid else 0.0
+        statuses = Counter()
+        samples = []
+        deadline = time.perf_counter() + args.duration
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            await asyncio.gather(
+                sample_rss(pid, deadline, samples) if pid else asyncio.sleep(0),
+                *(
+                    flood_client(client, args.size * 1024 * 1024, i % 2 == 1, deadline, statuses)
+                    for i in range(args.concurrency)
+                ),
+            )
+        await asyncio.sleep(1)
+        after = rss_mb(pid) if pid else 0.0
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+    print(f"Responses: {dict(statuses)}")
+    if pid:
+        print(f"Server RSS MB: before={before:.1f} peak={max(samples, default=before):.1f} after={after:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
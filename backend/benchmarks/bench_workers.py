@@ -0,0 +1,248 @@
+"""
+Multi-worker throughput: req/s and latency for 1..N API workers.
+
+For each worker count the API is started with scripts/serve.py on a free
+port, the benchmark waits until GET /health/ready has answered 200 often
+enough to have reached every worker, and then several load-generator
+processes drive a request mix against it for --duration seconds. Results
+are printed as a table (with scaling efficiency relative to one worker)
+and written as JSON.
+
+With --pin (Linux), worker count N runs on exactly N CPUs (the first N
+allowed to this process) and the load generators on the rest, so the sweep
+measures throughput per core count rather than per process count. Without
+spare CPUs for the load generators, the numbers for high N understate the
+server.
+
+The database is seeded like bench_api.py (--db, dropped first; needs a real
+mongod since the workers are separate processes). --no-seed reuses what is
+there; with --skip-ready the benchmark only waits for GET /health, for
+CPU-bound scenarios (classify) without a database.
+
+Usage:
+    python benchmarks/bench_workers.py --workers 1,2,4,8 --pin --output workers.json
+    python benchmarks/bench_workers.py --scenarios classify --no-seed --skip-ready
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.bench_api import percentile, scenario_request, seed
+
+BACKEND_DIR = Path(__file__).parent.parent
+SCENARIOS = ["number", "sim_swap", "trending", "dashboard", "classify"]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def default_worker_counts() -> str:
+    counts, n = [], 1
+    while n <= (os.cpu_count() or 1):
+        counts.append(n)
+        n *= 2
+    return ",".join(map(str, counts))
+
+
+def start_server(workers: int, port: int, env: dict, cpus=None) -> subprocess.Popen:
+    def pin():
+        os.sched_setaffinity(0, cpus)
+
+    return subprocess.Popen(
+        [sys.executable, "scripts/serve.py", "--workers", str(workers), "--port", str(port),
+         "--host", "127.0.0.1", "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, preexec_fn=pin if cpus else None,
+    )
+
+
+def existing_numbers(count: int):
+    """A sample of already reported numbers (--no-seed)."""
+    from app.db.mongo import number_stats_collection
+    pipeline = [{"$sample": {"size": count}}, {"$project": {"number": 1}}]
+    return [doc["number"] for doc in number_stats_collection().aggregate(pipeline)]
+
+
+def wait_ready(base_url: str, workers: int, path: str, timeout: float) -> float:
+    """Poll until `path` answered 200 enough times in a row to have hit every worker; returns seconds waited."""
+    started = time.perf_counter()
+    streak = 0
+    with httpx.Client(base_url=base_url, timeout=2) as client:
+        while streak < 4 * workers:
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"{workers} worker(s) not ready on {path} after {timeout}s")
+            try:
+                ok = client.get(path).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            streak = streak + 1 if ok else 0
+            if not ok:
+                time.sleep(0.2)
+    return time.perf_counter() - started
+
+
+def generate_load(base_url: str, scenarios, numbers, messages, concurrency: int, duration: float, offset: int) -> dict:
+    """One load-generator process: `concurrency` clients cycling through the scenario mix."""
+
+    async def run():
+        latencies = []
+        errors = {}
+        started = time.perf_counter()
+        deadline = started + duration
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, timeout=30, limits=limits) as client:
+            async def worker(w: int):
+                i = offset + w
+                while time.perf_counter() < deadline:
+                    name = scenarios[i % len(scenarios)]
+                    method, path, kwargs = scenario_request(name, numbers, messages, i)
+                    i += concurrency
+                    start = time.perf_counter()
+                    try:
+                        status = (await client.request(method, path, **kwargs)).status_code
+                    except Exception as e:
+                        status = type(e).__name__
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    if status != 200:
+                        errors[str(status)] = errors.get(str(status), 0) + 1
+
+            await asyncio.gather(*(worker(w) for w in range(concurrency)))
+        return {"latencies": latencies, "errors": errors, "elapsed": time.perf_counter() - started}
+
+    return asyncio.run(run())
+
+
+def measure(base_url: str, args, scenarios, numbers, messages, loader_cpus=None) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    per_loader = max(1, args.concurrency // args.loaders)
+    with ctx.Pool(args.loaders, initializer=os.sched_setaffinity if loader_cpus else None,
+                  initargs=(0, loader_cpus) if loader_cpus else ()) as pool:
+        parts = pool.starmap(generate_load, [
+            (base_url, scenarios, numbers, messages, per_loader, args.duration, n * 100_003)
+            for n in range(args.loaders)
+        ])
+    latencies = [ms for part in parts for ms in part["latencies"]]
+    errors = {}
+    for part in parts:
+        for status, n in part["errors"].items():
+            errors[status] = errors.get(status, 0) + n
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        # Each generator times its own run, so process start-up is not counted
+        "throughput_rps": round(sum(len(part["latencies"]) / part["elapsed"] for part in parts), 1),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default=default_worker_counts(), help="comma-separated worker counts")
+    parser.add_argument("--scenarios", default="number,sim_swap,trending,dashboard,classify",
+                        help="request mix, comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=15, help="seconds of load per worker count")
+    parser.add_argument("--concurrency", type=int, default=64, help="in-flight requests across all load generators")
+    parser.add_argument("--loaders", type=int, default=max(1, min(4, (os.cpu_count() or 1) // 2)),
+                        help="load-generator processes")
+    parser.add_argument("--pin", action="store_true", help="run N workers on N CPUs, load generators on the rest")
+    parser.add_argument("--reports", type=int, default=20000, help="synthetic reports to seed")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", default="fyp_bench", help="database to (re)create on the configured mongod")
+    parser.add_argument("--no-seed", action="store_true", help="use the existing database")
+    parser.add_argument("--skip-ready", action="store_true", help="wait for /health instead of /health/ready")
+    parser.add_argument("--ready-timeout", type=float, default=120)
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.workers.split(",") if n.strip()]
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    cpus = sorted(os.sched_getaffinity(0)) if args.pin else None
+    if cpus and max(counts) > len(cpus):
+        parser.error(f"--pin: {max(counts)} workers need {max(counts)} CPUs, {len(cpus)} available")
+
+    # Settings are read at import time, here and in the workers
+    os.environ["MONGODB_DB"] = args.db
+    from scripts.generate_reports import load_templates
+    messages = load_templates()
+    if args.no_seed and {"number", "sim_swap"} & set(scenarios):
+        numbers = existing_numbers(1000)
+    elif args.no_seed:
+        numbers = ["9800000000"]  # unused by the other scenarios
+    else:
+        print(f"Seeding {args.reports} reports...", file=sys.stderr)
+        numbers = seed(args.reports, args.seed, datetime.utcnow())
+        random.Random(args.seed).shuffle(numbers)
+
+    env = dict(os.environ)
+    results = {}
+    for workers in counts:
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server_cpus = cpus[:workers] if cpus else None
+        loader_cpus = (cpus[workers:] or None) if cpus else None
+        server = start_server(workers, port, env, server_cpus)
+        try:
+            ready_s = wait_ready(base_url, workers, "/health" if args.skip_ready else "/health/ready", args.ready_timeout)
+            result = measure(base_url, args, scenarios, numbers, messages, loader_cpus)
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        result["ready_seconds"] = round(ready_s, 2)
+        result["cpus"] = len(server_cpus) if server_cpus else None
+        results[str(workers)] = result
+        print(f"{workers:>3} worker(s) {result['throughput_rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f}ms  "
+              f"p99 {result['p99_ms']:>8.2f}ms  errors {result['errors'] or 0}  (ready in {ready_s:.1f}s)",
+              file=sys.stderr)
+
+    # Throughput per worker relative to a single worker (1.0 = linear scaling)
+    single = results.get("1", {}).get("throughput_rps")
+    if single:
+        for workers, result in results.items():
+            result["scaling_efficiency"] = round(result["throughput_rps"] / (single * int(workers)), 3)
+
+    output = json.dumps({
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "pinned": args.pin,
+            "scenarios": scenarios,
+            "concurrency": args.concurrency,
+            "loaders": args.loaders,
+            "duration": args.duration,
+        },
+        "workers": results,
+    }, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Backfill the `screenshots` metadata collection from files already in storage.
+
+Uploads made by the API are recorded automatically; run this once to make
+screenshots stored before the gallery moved to MongoDB show up in it.
+Existing documents are left untouched, so it is safe to re-run.
+
+Usage:
+    python scripts/backfill_screenshots.py
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo import UpdateOne
+from app.db.mongo import screenshots_collection
+from app.services.gallery import screenshot_document
+from app.services.storage import FOLDERS, storage_service
+
+BATCH_SIZE = 1000
+# Storage listings return at most `limit` files (100 unless set), so page through them
+PAGE_SIZE = 1000
+
+
+def _created_at(value) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return datetime.utcnow()
+
+
+def list_folder(bucket, folder: str):
+    """Every file in a storage folder, one page at a time."""
+    offset = 0
+    while True:
+        page = bucket.list(folder, {"limit": PAGE_SIZE, "offset": offset, "sortBy": {"column": "name", "order": "asc"}})
+        yield from page
+        if len(page) < PAGE_SIZE:
+            return
+        offset += len(page)
+
+
+def backfill_screenshots() -> int:
+    """Upsert a metadata document per stored file; returns the number of new documents."""
+    if not storage_service.is_available():
+        sys.exit("⚠️ Storage is not configured")
+    bucket = storage_service.client.storage.from_(storage_service.bucket)
+    inserted = 0
+    for folder in FOLDERS:
+        ops = []
+        for file in list_folder(bucket, folder):
+            path = f"{folder}/{file['name']}"
+            doc = screenshot_document(
+                path,
+                bucket.get_public_url(path),
+                (file.get("metadata") or {}).get("size", 0),
+                {},
+                _created_at(file.get("created_at")),
+            )
+            ops.append(UpdateOne({"_id": path}, {"$setOnInsert": doc}, upsert=True))
+            if len(ops) >= BATCH_SIZE:
+                inserted += screenshots_collection().bulk_write(ops, ordered=False).upserted_count
+                ops = []
+        if ops:
+            inserted += screenshots_collection().bulk_write(ops, ordered=False).upserted_count
+    return inserted
+
+
+if __name__ == "__main__":
+    print("Backfilling screenshot metadata from storage...")
+    total = backfill_screenshots()
+    print(f"✅ Recorded {total} new screenshots")
@@ -0,0 +1,193 @@
+"""
+Synthesize realistic scam reports at any volume from the dummy data files.
+
+Messages, categories and scam probabilities are drawn from the templates in
+data/dummy_reports*.json. On top of that background traffic:
+
+  * reported numbers follow a Zipf distribution (a few numbers get most of
+    the reports, most numbers are reported once or twice)
+  * SIM-swap bursts: quiet numbers suddenly get 4-15 OTP/bank reports,
+    some of them victim self-reports, inside a 48h window
+  * campaigns: one message text sent from many numbers within a few hours
+
+Everything is driven by one seed, so the same arguments always produce the
+same reports (timestamps are relative to --now).
+
+Usage:
+    python scripts/generate_reports.py --count 100000 --seed 42 > reports.ndjson
+    (or import `synthesize_reports` — see scripts/load_dummy_data.py)
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.numbers import PhoneNumber, canonical_number
+from app.services.stats import OTP_LIKE_CATEGORIES
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+TEMPLATE_FILES = ["dummy_reports.json", "dummy_reports_50.json"]
+
+# Background rows are drawn in fixed-size blocks so the output for a seed
+# does not depend on how the caller batches its writes
+BLOCK_SIZE = 10000
+
+DIGITS = re.compile(r"\d+")
+VICTIM_MESSAGES = [
+    "My number was hacked, someone is sending OTP requests from it. This is not me.",
+    "Someone using my SIM is asking my contacts for money. My number was stolen.",
+    "Unauthorized SIM replacement on my number, I did not request it. Hijacked.",
+]
+
+
+def load_templates() -> List[Dict[str, Any]]:
+    templates = []
+    for name in TEMPLATE_FILES:
+        with open(DATA_DIR / name, encoding="utf-8") as f:
+            for report in json.load(f):
+                templates.append({
+                    "category": report["category"],
+                    "message": report["message"],
+                    "scam_probability": report.get("scam_probability", 0.5),
+                })
+    return templates
+
+
+def _number(index: int) -> PhoneNumber:
+    # Spread pool indices over the 98/97 mobile ranges (stable per index)
+    prefix = ("98", "97")[index % 2]
+    return canonical_number(f"{prefix}{(index * 2654435761) % 100_000_000:08d}")
+
+
+def _vary(message: str, rng: random.Random) -> str:
+    """Change the digits (amounts, phone numbers, codes) in a template message."""
+    return DIGITS.sub(lambda m: "".join(rng.choice("0123456789") for _ in m.group()), message)
+
+
+def _report(number: PhoneNumber, template: Dict[str, Any], created_at: datetime, prob: float, message: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "number": number.display,
+        "number_key": number.key,
+        "category": template["category"],
+        "message": message or template["message"],
+        "scam_probability": round(min(max(prob, 0.01), 0.99), 3),
+        "created_at": created_at,
+    }
+
+
+def _background(count: int, numbers: int, zipf_s: float, days: float, now: datetime,
+                templates: List[Dict[str, Any]], np_rng: np.random.Generator, rng: random.Random) -> Iterator[List[Dict[str, Any]]]:
+    weights = 1.0 / np.arange(1, numbers + 1) ** zipf_s
+    weights /= weights.sum()
+    base_probs = np.array([t["scam_probability"] for t in templates])
+    span = days * 86400
+    for start in range(0, count, BLOCK_SIZE):
+        n = min(BLOCK_SIZE, count - start)
+        number_idx = np_rng.choice(numbers, size=n, p=weights)
+        template_idx = np_rng.integers(len(templates), size=n)
+        seconds_ago = np_rng.random(n) * span
+        probs = base_probs[template_idx] + np_rng.normal(0, 0.03, n)
+        vary = np_rng.random(n) < 0.5
+        block = []
+        for i in range(n):
+            template = templates[template_idx[i]]
+            block.append(_report(
+                _number(int(number_idx[i])),
+                template,
+                now - timedelta(seconds=float(seconds_ago[i])),
+                float(probs[i]),
+                _vary(template["message"], rng) if vary[i] else None,
+            ))
+        yield block
+
+
+def _bursts(bursts: int, numbers: int, days: float, now: datetime,
+            templates: List[Dict[str, Any]], rng: random.Random) -> List[Dict[str, Any]]:
+    otp_templates = [t for t in templates if t["category"] in OTP_LIKE_CATEGORIES]
+    reports = []
+    for _ in range(bursts):
+        # A number from the quiet end of the Zipf pool, or a brand new one
+        number = _number(rng.randrange(numbers // 2, numbers * 2))
+        window_end = now - timedelta(hours=rng.uniform(0, max(days * 24 - 48, 0)))
+        for _ in range(rng.randint(4, 15)):
+            created_at = window_end - timedelta(hours=rng.uniform(0, 48))
+            if rng.random() < 0.2:
+                template = {"category": "Other", "message": rng.choice(VICTIM_MESSAGES)}
+                reports.append(_report(number, template, created_at, rng.uniform(0.3, 0.6)))
+            else:
+                template = rng.choice(otp_templates)
+                reports.append(_report(number, template, created_at, template["scam_probability"] + rng.gauss(0, 0.03),
+                                       _vary(template["message"], rng)))
+    return reports
+
+
+def _campaigns(campaigns: int, numbers: int, days: float, now: datetime,
+               templates: List[Dict[str, Any]], rng: random.Random) -> List[Dict[str, Any]]:
+    scam_templates = [t for t in templates if t["scam_probability"] > 0.6]
+    reports = []
+    for _ in range(campaigns):
+        template = rng.choice(scam_templates)
+        message = _vary(template["message"], rng)  # one text for the whole campaign
+        start = now - timedelta(hours=rng.uniform(6, days * 24))
+        senders = [_number(rng.randrange(numbers * 2)) for _ in range(rng.randint(5, 50))]
+        for _ in range(rng.randint(len(senders), len(senders) * 4)):
+            created_at = start + timedelta(hours=rng.uniform(0, 6))
+            reports.append(_report(rng.choice(senders), template, created_at, template["scam_probability"] + rng.gauss(0, 0.02), message))
+    return reports
+
+
+def synthesize_reports(count: int, seed: int = 42, numbers: Optional[int] = None, zipf_s: float = 1.1,
+                       bursts: int = 0, campaigns: int = 0, days: float = 30,
+                       now: Optional[datetime] = None) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield blocks of report documents (ready for insert_many).
+
+    `count` background reports come first, then the burst and campaign
+    reports. `numbers` is the size of the Zipf pool (default count // 10).
+    """
+    now = now or datetime.utcnow()
+    numbers = max(numbers or count // 10, 1)
+    templates = load_templates()
+    np_rng = np.random.default_rng(seed)
+    rng = random.Random(seed)
+    yield from _background(count, numbers, zipf_s, days, now, templates, np_rng, rng)
+    extra = _bursts(bursts, numbers, days, now, templates, rng) + _campaigns(campaigns, numbers, days, now, templates, rng)
+    for start in range(0, len(extra), BLOCK_SIZE):
+        yield extra[start:start + BLOCK_SIZE]
+
+
+def add_generator_args(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--count", type=int, default=100000, help="background reports")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--numbers", type=int, help="distinct numbers in the Zipf pool (default count/10)")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Zipf exponent for number popularity")
+    parser.add_argument("--bursts", type=int, default=50, help="SIM-swap style 48h bursts")
+    parser.add_argument("--campaigns", type=int, default=20, help="repeated-message campaigns")
+    parser.add_argument("--days", type=float, default=30, help="spread reports over the last N days")
+    parser.add_argument("--now", type=datetime.fromisoformat, help="reference time (ISO), for reproducible timestamps")
+
+
+def generator_kwargs(args: argparse.Namespace) -> Dict[str, Any]:
+    return {
+        "count": args.count, "seed": args.seed, "numbers": args.numbers, "zipf_s": args.zipf,
+        "bursts": args.bursts, "campaigns": args.campaigns, "days": args.days, "now": args.now,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_generator_args(parser)
+    args = parser.parse_args()
+    out = sys.stdout
+    for block in synthesize_reports(**generator_kwargs(args)):
+        out.write("".join(json.dumps({**r, "created_at": r["created_at"].isoformat()}) + "\n" for r in block))
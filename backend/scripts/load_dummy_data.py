@@ -2,12 +2,21 @@
 Script to load dummy scam report data into MongoDB for ML training.
 Run this script to populate the database with realistic scam patterns.
 
+By default the 50 reports in data/dummy_reports_50.json are loaded. With
+--synthetic, any number of reports is generated from the dummy files (see
+scripts/generate_reports.py) and written in batches, optionally from
+several writer threads.
+
 Usage:
     python scripts/load_dummy_data.py
+    python scripts/load_dummy_data.py --synthetic --count 1000000 --seed 42 --workers 4
 """
 
+import argparse
 import json
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 import random
@@ -15,97 +24,153 @@ import random
 # Add parent directory to path to import app modules
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from pymongo.errors import BulkWriteError
 from app.db.mongo import reports_collection
-from app.services.risk import classify_probability_stub, normalize_number
+from app.services.numbers import canonical_number, display_number
+from scripts.generate_reports import synthesize_reports, add_generator_args, generator_kwargs
+from scripts.rebuild_number_stats import rebuild_number_stats
 
 
-def load_dummy_data():
-    """Load dummy reports from JSON file into MongoDB."""
-    
-    # Path to dummy data file
+def dummy_reports():
+    """Reports from data/dummy_reports_50.json, as one batch."""
     data_file = Path(__file__).parent.parent / "data" / "dummy_reports_50.json"
-    
-    if not data_file.exists():
-        print(f"Error: Dummy data file not found at {data_file}")
-        return
-    
-    # Load JSON data
     with open(data_file, 'r', encoding='utf-8') as f:
-        dummy_reports = json.load(f)
-    
-    print(f"Loading {len(dummy_reports)} dummy reports into MongoDB...")
-    print("=" * 60)
-    
-    # Clear existing data
-    print("Clearing existing reports...")
-    reports_collection().delete_many({})
-    
-    success_count = 0
-    error_count = 0
-    
+        reports = json.load(f)
+
     # Base time for calculating timestamps
     base_time = datetime.now(timezone.utc)
-    
-    for idx, report in enumerate(dummy_reports, 1):
-        try:
-            # Use hours_ago from JSON if available, otherwise random
-            hours_ago = report.get('hours_ago', random.randint(1, 168))
-            
-            # Calculate created_at timestamp
-            created_at = base_time - timedelta(hours=hours_ago)
-            
-            # Use scam_probability from JSON
-            scam_prob = report.get('scam_probability', 0.5)
-            
-            # Insert directly into MongoDB
-            document = {
-                "number": normalize_number(report['number']),
-                "category": report['category'],
-                "message": report['message'],
-                "scam_probability": scam_prob,
-                "created_at": created_at
-            }
-            
-            reports_collection().insert_one(document)
-            success_count += 1
-            
-            # Show progress every 10 reports
-            if idx % 10 == 0:
-                print(f"Processed {idx}/{len(dummy_reports)} reports...")
-        
-        except Exception as e:
-            error_count += 1
-            print(f"Error adding report #{idx}: {str(e)}")
-    
+    documents = []
+    for report in reports:
+        # Use hours_ago from JSON if available, otherwise random
+        hours_ago = report.get('hours_ago', random.randint(1, 168))
+        number = canonical_number(report['number'])
+        documents.append({
+            "number": number.display,
+            "number_key": number.key,
+            "category": report['category'],
+            "message": report['message'],
+            "scam_probability": report.get('scam_probability', 0.5),
+            "created_at": base_time - timedelta(hours=hours_ago),
+        })
+    yield documents
+
+
+def _insert(batch):
+    try:
+        return len(reports_collection().insert_many(batch, ordered=False).inserted_ids), 0
+    except BulkWriteError as e:
+        failed = len(e.details.get("writeErrors", []))
+        return len(batch) - failed, failed
+
+
+def insert_batches(blocks, batch_size=5000, workers=1):
+    """Write report blocks with unordered insert_many; returns (inserted, failed)."""
+    inserted = failed = 0
+
+    def batches():
+        for block in blocks:
+            for start in range(0, len(block), batch_size):
+                yield block[start:start + batch_size]
+
+    # Keep at most 2 batches per writer in flight so memory stays bounded
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for batch in batches():
+            pending.add(pool.submit(_insert, batch))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ok, bad = future.result()
+                    inserted, failed = inserted + ok, failed + bad
+                print(f"Inserted {inserted} reports...", end="\r")
+        for future in pending:
+            ok, bad = future.result()
+            inserted, failed = inserted + ok, failed + bad
+    return inserted, failed
+
+
+def summary():
+    """Database summary from a single aggregation."""
+    cutoff = datetime.utcnow() - timedelta(hours=48)
+    by_number = {"$group": {"_id": "$number_key", "n": {"$sum": 1}}}
+    pipeline = [{"$facet": {
+        "total": [{"$count": "n"}],
+        "numbers": [by_number, {"$count": "n"}],
+        "top_numbers": [by_number, {"$sort": {"n": -1}}, {"$limit": 5}],
+        "categories": [{"$group": {"_id": "$category", "n": {"$sum": 1}}}, {"$sort": {"_id": 1}}],
+        "last_48h": [{"$match": {"created_at": {"$gte": cutoff}}}, {"$count": "n"}],
+        "high_prob": [{"$match": {"scam_probability": {"$gt": 0.6}}}, {"$count": "n"}],
+    }}]
+    facets = next(reports_collection().aggregate(pipeline, allowDiskUse=True))
+
+    def count(name):
+        return facets[name][0]["n"] if facets[name] else 0
+
+    return {
+        "total": count("total"),
+        "numbers": count("numbers"),
+        "last_48h": count("last_48h"),
+        "high_prob": count("high_prob"),
+        "top_numbers": [(display_number(d["_id"]), d["n"]) for d in facets["top_numbers"]],
+        "categories": [(d["_id"], d["n"]) for d in facets["categories"]],
+    }
+
+
+def load_dummy_data(blocks, batch_size=5000, workers=1, append=False):
+    """Load report blocks into MongoDB, rebuild rollups and print a summary."""
+    if not append:
+        print("Clearing existing reports...")
+        reports_collection().delete_many({})
+
+    print("=" * 60)
+    started = time.perf_counter()
+    success_count, error_count = insert_batches(blocks, batch_size, workers)
+    elapsed = time.perf_counter() - started
     print("=" * 60)
-    print(f"\n✅ Successfully loaded: {success_count} reports")
+    print(f"\n✅ Successfully loaded: {success_count} reports in {elapsed:.1f}s "
+          f"({success_count / elapsed if elapsed else 0:.0f} reports/s)")
+    print(f"   Rebuilt rollups for {rebuild_number_stats()} numbers")
     if error_count > 0:
         print(f"❌ Failed: {error_count} reports")
-    
+
     # Show summary statistics
+    stats = summary()
     print("\n📊 Database Summary:")
-    total_reports = reports_collection().count_documents({})
-    print(f"   Total reports in DB: {total_reports}")
-    
-    # Count unique numbers
-    unique_numbers = reports_collection().distinct("number")
-    print(f"   Unique phone numbers: {len(unique_numbers)}")
-    
-    # Count by category
+    print(f"   Total reports in DB: {stats['total']}")
+    print(f"   Unique phone numbers: {stats['numbers']}")
+    print(f"   Reports in last 48h: {stats['last_48h']}")
+    print(f"   High scam probability (>0.6): {stats['high_prob']}")
+
+    print("\n🔝 Most reported numbers:")
+    for number, n in stats["top_numbers"]:
+        print(f"   {number}: {n}")
+
     print("\n📋 Reports by Category:")
-    categories = reports_collection().distinct("category")
-    for cat in sorted(categories):
-        count = reports_collection().count_documents({"category": cat})
-        print(f"   {cat}: {count}")
-    
+    for cat, n in stats["categories"]:
+        print(f"   {cat}: {n}")
+
     print("\n✨ Dummy data loading complete!")
     print("\nℹ️  Note: Some numbers have clustered reports (last 48h) to simulate")
     print("   SIM swap patterns. This will help train anomaly detection.")
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", action="store_true", help="generate reports instead of loading the 50 dummy ones")
+    add_generator_args(parser)
+    parser.add_argument("--batch-size", type=int, default=5000, help="reports per insert_many")
+    parser.add_argument("--workers", type=int, default=1, help="parallel writer threads")
+    parser.add_argument("--append", action="store_true", help="keep existing reports")
+    args = parser.parse_args()
+
     try:
-        load_dummy_data()
+        if args.synthetic:
+            print(f"Generating {args.count} synthetic reports (seed {args.seed})...")
+            blocks = synthesize_reports(**generator_kwargs(args))
+        else:
+            print("Loading dummy reports from data/dummy_reports_50.json...")
+            blocks = dummy_reports()
+        load_dummy_data(blocks, args.batch_size, args.workers, args.append)
     except KeyboardInterrupt:
         print("\n\n⚠️  Loading interrupted by user.")
     except Exception as e:
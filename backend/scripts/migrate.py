@@ -0,0 +1,44 @@
+"""
+Create the MongoDB indexes the API relies on.
+
+API workers no longer create indexes on startup (unless
+MONGODB_CREATE_INDEXES_ON_STARTUP is set), so run this once per deploy,
+before starting them. Index creation is idempotent: existing indexes are
+left as they are and the script is safe to re-run.
+
+Usage:
+    python scripts/migrate.py
+    python scripts/migrate.py --list
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.db.mongo import ensure_indexes, index_plan, _db_name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list", action="store_true", help="print the planned indexes without creating them")
+    args = parser.parse_args()
+
+    if args.list:
+        for collection, keys, options in index_plan():
+            print(f"{collection}: {keys} {options or ''}")
+        sys.exit(0)
+
+    print(f"Creating indexes in '{_db_name()}'...")
+    started = time.perf_counter()
+    try:
+        names = ensure_indexes()
+    except Exception as e:
+        print(f"❌ Index creation failed: {e}")
+        sys.exit(1)
+    for (collection, _, _), name in zip(index_plan(), names):
+        print(f"   {collection}.{name}")
+    print(f"✅ {len(names)} indexes in place ({time.perf_counter() - started:.1f}s)")
@@ -0,0 +1,131 @@
+"""
+Migrate stored reports to integer number keys.
+
+Adds `number_key` (E.164 digits as int64, see app.services.numbers) to every
+report that lacks it and re-canonicalizes `number`. It then swaps the
+(number, created_at) index for (number_key, created_at) and rebuilds the
+`number_stats` rollups, which are now keyed by the integer.
+
+Index sizes and per-number lookup latency are measured before and after
+(old string-keyed queries vs new integer-keyed ones) and printed side by
+side. Safe to re-run; already migrated reports are skipped.
+
+Usage:
+    python scripts/migrate_number_keys.py
+    python scripts/migrate_number_keys.py --measure-only
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo import ASCENDING, UpdateOne
+from app.db.mongo import get_client, _db_name, reports_collection, number_stats_collection
+from app.services.numbers import InvalidNumber, canonical_number
+from scripts.rebuild_number_stats import rebuild_number_stats
+
+BATCH_SIZE = 1000
+LEGACY_INDEX = [("number", ASCENDING), ("created_at", ASCENDING)]
+KEYED_INDEX = [("number_key", ASCENDING), ("created_at", ASCENDING)]
+
+
+def index_sizes():
+    """Index sizes in bytes for the collections that are keyed by number."""
+    db = get_client().get_database(_db_name())
+    return {name: db.command("collStats", name).get("indexSizes", {}) for name in ("reports", "number_stats")}
+
+
+def lookup_latency(numbers, keyed: bool, repeat: int = 3):
+    """Median ms for the /number lookups (history scan + rollup read) of each sampled number."""
+    reports = reports_collection()
+    stats = number_stats_collection()
+    timings = {"reports": [], "number_stats": []}
+    for _ in range(repeat):
+        for number in numbers:
+            canonical = canonical_number(number)
+            query = {"number_key": canonical.key} if keyed else {"number": canonical.display}
+            stats_id = canonical.key if keyed else canonical.display
+            start = time.perf_counter()
+            list(reports.find(query, {"_id": 1}).sort("created_at", -1).limit(10))
+            timings["reports"].append((time.perf_counter() - start) * 1000)
+            start = time.perf_counter()
+            stats.find_one({"_id": stats_id})
+            timings["number_stats"].append((time.perf_counter() - start) * 1000)
+    return {name: round(statistics.median(values), 3) if values else 0.0 for name, values in timings.items()}
+
+
+def measure(numbers, keyed: bool):
+    return {"index_bytes": index_sizes(), "lookup_ms": lookup_latency(numbers, keyed)}
+
+
+def migrate_reports():
+    """Set number_key on reports missing it; returns (migrated, invalid)."""
+    reports = reports_collection()
+    ops = []
+    migrated = invalid = 0
+    for report in reports.find({"number_key": {"$exists": False}}, {"number": 1}):
+        try:
+            canonical = canonical_number(report["number"])
+        except InvalidNumber:
+            invalid += 1
+            continue
+        ops.append(UpdateOne({"_id": report["_id"]}, {"$set": {"number": canonical.display, "number_key": canonical.key}}))
+        if len(ops) >= BATCH_SIZE:
+            migrated += reports.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        migrated += reports.bulk_write(ops, ordered=False).modified_count
+    return migrated, invalid
+
+
+def swap_indexes():
+    reports = reports_collection()
+    reports.create_index(KEYED_INDEX)
+    legacy = "_".join(f"{field}_{direction}" for field, direction in LEGACY_INDEX)
+    if legacy in reports.index_information():
+        reports.drop_index(legacy)
+
+
+def print_comparison(before, after):
+    print("\n📏 Index sizes (bytes):")
+    for collection in ("reports", "number_stats"):
+        for name, size in before["index_bytes"][collection].items():
+            print(f"   before  {collection}.{name}: {size}")
+        for name, size in after["index_bytes"][collection].items():
+            print(f"   after   {collection}.{name}: {size}")
+    print("\n⏱️  Median lookup latency (ms):")
+    for name in ("reports", "number_stats"):
+        print(f"   {name}: {before['lookup_ms'][name]} -> {after['lookup_ms'][name]}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=200, help="numbers sampled for the latency measurement")
+    parser.add_argument("--measure-only", action="store_true", help="only measure the current layout")
+    args = parser.parse_args()
+
+    # Legacy documents only have the display string, so sample by that
+    numbers = reports_collection().distinct("number")
+    numbers = random.Random(42).sample(numbers, min(args.sample, len(numbers)))
+    keyed = reports_collection().find_one({"number_key": {"$exists": False}}) is None
+
+    before = measure(numbers, keyed)
+    if args.measure_only:
+        print(before)
+        sys.exit(0)
+
+    print("Adding integer number keys to reports...")
+    migrated, invalid = migrate_reports()
+    print(f"✅ Migrated {migrated} reports")
+    if invalid:
+        print(f"⚠️ {invalid} reports have numbers that are not valid E.164 and were left unchanged")
+    swap_indexes()
+    print(f"✅ Rebuilt rollups for {rebuild_number_stats()} numbers")
+
+    print_comparison(before, measure(numbers, keyed=True))
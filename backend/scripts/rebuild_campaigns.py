@@ -0,0 +1,66 @@
+"""
+Rebuild the near-duplicate message campaigns from the raw reports.
+
+The API assigns campaigns on every POST /reports. Run this after loading
+reports directly into MongoDB (e.g. load_dummy_data.py), or after changing
+CAMPAIGN_SIMILARITY, to recluster the whole history. Reports are replayed
+oldest first, in the same batches the bulk endpoint uses.
+
+Usage:
+    python scripts/rebuild_campaigns.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo import UpdateOne
+from app.db.mongo import (
+    async_reports_collection, async_campaigns_collection, async_campaign_members_collection,
+    async_number_stats_collection,
+)
+from app.services.campaigns import assign_campaigns, record_campaigns
+
+BATCH_SIZE = 1000
+
+
+async def _flush(batch):
+    started = await assign_campaigns(batch)
+    await record_campaigns(batch, started)
+    ops = [UpdateOne({"_id": doc["_id"]}, {"$set": {"campaign_id": doc["campaign_id"]}}) for doc in batch if "campaign_id" in doc]
+    if ops:
+        await async_reports_collection().bulk_write(ops, ordered=False)
+
+
+async def rebuild_campaigns() -> int:
+    """Drop and rebuild every campaign; returns the number of campaigns written."""
+    reports = async_reports_collection()
+    await async_campaigns_collection().delete_many({})
+    await async_campaign_members_collection().delete_many({})
+    await reports.update_many({"campaign_id": {"$exists": True}}, {"$unset": {"campaign_id": ""}})
+    await async_number_stats_collection().update_many({"campaign": {"$exists": True}}, {"$unset": {"campaign": ""}})
+
+    cursor = reports.find(
+        {"number_key": {"$exists": True}},
+        {"number": 1, "number_key": 1, "message": 1, "created_at": 1},
+    ).sort("created_at", 1)
+    batch = []
+    async for report in cursor:
+        batch.append(report)
+        if len(batch) >= BATCH_SIZE:
+            await _flush(batch)
+            batch = []
+    if batch:
+        await _flush(batch)
+    return await async_campaigns_collection().count_documents({})
+
+
+if __name__ == "__main__":
+    print("Rebuilding message campaigns...")
+    started = time.perf_counter()
+    total = asyncio.run(rebuild_campaigns())
+    print(f"✅ Rebuilt {total} campaigns in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,83 @@
+"""
+Rebuild the `number_stats` rollups and global report counters from the raw
+reports.
+
+The API keeps both up to date on every POST /reports. Run this after
+loading reports directly into MongoDB (e.g. load_dummy_data.py) or to repair
+drift. Each number's campaign summary is restored from `campaign_members`
+(run scripts/rebuild_campaigns.py first if the campaigns are out of date).
+
+Usage:
+    python scripts/rebuild_number_stats.py
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pymongo import UpdateOne
+from app.db.mongo import (
+    ensure_indexes, reports_collection, number_stats_collection, counters_collection,
+    campaigns_collection, campaign_members_collection,
+)
+from app.services.campaigns import campaign_summary
+from app.services.stats import rollup_update, counters_update, REPORT_COUNTERS_ID
+
+BATCH_SIZE = 1000
+
+
+def rebuild_number_stats() -> int:
+    """Drop and rebuild every rollup; returns the number of rollups written."""
+    # The scan below sorts on the (number_key, created_at) index; loaders may run before scripts/migrate.py
+    ensure_indexes()
+    stats = number_stats_collection()
+    stats.delete_many({})
+    now = datetime.utcnow()
+
+    # Ordered by (number_key, created_at) so the compound index serves the scan
+    cursor = reports_collection().find(
+        {"number_key": {"$exists": True}},
+        {"_id": 0, "number": 1, "number_key": 1, "category": 1, "message": 1, "created_at": 1, "scam_probability": 1},
+    ).sort([("number_key", 1), ("created_at", 1)])
+
+    ops = []
+    totals = {"total": 0}
+    for report in cursor:
+        ops.append(UpdateOne({"_id": report["number_key"]}, rollup_update(report, now), upsert=True))
+        for field, n in counters_update(report)["$inc"].items():
+            totals[field] = totals.get(field, 0) + n
+        if len(ops) >= BATCH_SIZE:
+            stats.bulk_write(ops, ordered=True)
+            ops = []
+    if ops:
+        stats.bulk_write(ops, ordered=True)
+
+    counters_collection().replace_one({"_id": REPORT_COUNTERS_ID}, {}, upsert=True)
+    counters_collection().update_one({"_id": REPORT_COUNTERS_ID}, {"$inc": totals})
+    restore_campaigns()
+    return stats.count_documents({})
+
+
+def restore_campaigns() -> int:
+    """Put each number's largest campaign back on its rollup; returns the campaigns applied."""
+    stats = number_stats_collection()
+    members = campaign_members_collection()
+    applied = 0
+    # Smallest first, so a number in several campaigns ends up with the largest
+    cursor = campaigns_collection().find({}, {"number_count": 1, "reports": 1, "sample": 1}).sort("number_count", 1)
+    for campaign in cursor:
+        # Member ids are "<campaign>:<number_key>"; an anchored prefix is an _id index range
+        keys = [m["number_key"] for m in members.find({"_id": {"$regex": f"^{campaign['_id']}:"}}, {"number_key": 1})]
+        if keys:
+            stats.update_many({"_id": {"$in": keys}}, {"$set": {"campaign": campaign_summary(campaign)}})
+            applied += 1
+    return applied
+
+
+if __name__ == "__main__":
+    print("Rebuilding number_stats rollups...")
+    total = rebuild_number_stats()
+    print(f"✅ Rebuilt rollups for {total} numbers")
@@ -0,0 +1,95 @@
+"""
+Run the API with N worker processes.
+
+Each worker is a separate uvicorn process with its own event loop, MongoDB
+pool, model copy, OCR pool and in-memory state (caches, number filter,
+/live subscribers). Workers start with a fresh interpreter
+and create their clients in the app lifespan, so nothing is shared across
+a fork; GET /health/ready on a worker answers 200 once it is warm.
+
+Before exec'ing uvicorn this launcher:
+  * optionally runs the index migration (--migrate, same as scripts/migrate.py)
+  * points PROMETHEUS_MULTIPROC_DIR at an empty directory so /metrics
+    aggregates every worker
+  * splits the CPUs between the workers' OCR pools unless OCR_WORKERS is set
+
+Sizing: each worker opens up to MONGODB_MAX_POOL_SIZE connections, so the
+deployment needs workers x MONGODB_MAX_POOL_SIZE on the MongoDB side.
+benchmarks/bench_workers.py measures throughput for 1..N workers.
+
+Usage:
+    python scripts/serve.py                      # WEB_CONCURRENCY or one worker per CPU
+    python scripts/serve.py --workers 4 --port 8000 --migrate
+
+With gunicorn, use the uvicorn worker class; the per-process client
+handling also covers --preload (clients created in the parent are dropped
+in the forked workers):
+    gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w 4 -b 0.0.0.0:8000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from dotenv import load_dotenv
+load_dotenv()
+
+import uvicorn
+from app.core.config import get_settings
+
+
+def prepare_metrics_dir(path: str) -> None:
+    """Start from an empty multiprocess directory; samples of old worker pids would be aggregated too."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=settings.web_concurrency, help="worker processes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=settings.port)
+    parser.add_argument("--migrate", action="store_true", help="create indexes before starting the workers")
+    parser.add_argument("--metrics-dir", help="PROMETHEUS_MULTIPROC_DIR to use (default: a fresh temp dir)")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    workers = max(1, args.workers)
+
+    if args.migrate:
+        from app.db.mongo import ensure_indexes, close_clients
+        print(f"✅ {len(ensure_indexes())} indexes in place")
+        close_clients()
+
+    if workers > 1 and settings.metrics_enabled:
+        metrics_dir = args.metrics_dir or os.environ.get("PROMETHEUS_MULTIPROC_DIR") \
+            or os.path.join(tempfile.gettempdir(), f"prometheus-{args.port}")
+        prepare_metrics_dir(metrics_dir)
+        # Inherited by the workers, read when app.services.metrics is imported
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+    if not os.getenv("OCR_WORKERS"):
+        os.environ["OCR_WORKERS"] = str(max(1, (os.cpu_count() or 1) // workers))
+
+    print(f"Starting {workers} worker(s) on {args.host}:{args.port} "
+          f"(OCR_WORKERS={os.environ['OCR_WORKERS']}, up to {workers * settings.mongodb_max_pool_size} "
+          f"MongoDB connections)")
+    uvicorn.run(
+        "app.main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        log_level=args.log_level,
+        # On shutdown, give in-flight requests up to 30s to finish
+        timeout_graceful_shutdown=30,
+    )
+
+
+if __name__ == "__main__":
+    main()
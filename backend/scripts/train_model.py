@@ -0,0 +1,60 @@
+"""
+Train the TF-IDF + logistic-regression scam classifier served by the API.
+
+Labels come from the dummy datasets (scam_probability >= 0.5 is a scam). The
+fitted pipeline is written to MODEL_PATH, where app.services.model loads it
+at startup.
+
+Usage:
+    python scripts/train_model.py
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+from app.core.config import get_settings
+
+DATA_FILES = ["dummy_reports.json", "dummy_reports_50.json"]
+SCAM_THRESHOLD = 0.5
+
+
+def load_examples():
+    data_dir = Path(__file__).parent.parent / "data"
+    messages, labels = [], []
+    for name in DATA_FILES:
+        with open(data_dir / name, "r", encoding="utf-8") as f:
+            for report in json.load(f):
+                messages.append(report["message"])
+                labels.append(int(report["scam_probability"] >= SCAM_THRESHOLD))
+    return messages, labels
+
+
+def train_model() -> str:
+    """Fit the pipeline and save it; returns the model path."""
+    messages, labels = load_examples()
+    print(f"Training on {len(messages)} messages ({sum(labels)} scam)...")
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(lowercase=True, ngram_range=(1, 2), sublinear_tf=True)),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+    pipeline.fit(messages, labels)
+
+    model_path = get_settings().model_path
+    os.makedirs(os.path.dirname(model_path) or ".", exist_ok=True)
+    joblib.dump(pipeline, model_path)
+    print(f"✅ Saved model to {model_path}")
+    return model_path
+
+
+if __name__ == "__main__":
+    train_model()
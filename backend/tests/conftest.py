@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Import app modules the same way the scripts do
+sys.path.insert(0, str(Path(__file__).parent.parent))
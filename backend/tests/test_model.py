@@ -0,0 +1,69 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.services.model import ModelServer
+from app.services.scoring import keyword_probability
+
+
+class FailingModel:
+    def predict_proba(self, texts):
+        raise RuntimeError("boom")
+
+
+class ConstantModel:
+    def predict_proba(self, texts):
+        return np.array([[0.1, 0.9]] * len(texts))
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def serve(model):
+    server = ModelServer("unused.pkl", max_batch_size=8, max_wait_ms=5)
+    server.model = model
+    return server
+
+
+def test_failed_batch_falls_back_to_heuristic():
+    messages = ["Share your OTP code now to unblock your account", "Meeting moved to 3pm"]
+
+    async def scenario():
+        server = serve(FailingModel())
+        await server.start()
+        try:
+            return await asyncio.gather(*(server.predict(m) for m in messages))
+        finally:
+            await server.stop()
+
+    assert run(scenario()) == [keyword_probability(m) for m in messages]
+
+
+def test_batched_predictions_use_the_model():
+    async def scenario():
+        server = serve(ConstantModel())
+        await server.start()
+        try:
+            return await asyncio.gather(*(server.predict(f"message {i}") for i in range(5)))
+        finally:
+            await server.stop()
+
+    assert run(scenario()) == pytest.approx([0.9] * 5)
+
+
+def test_stop_resolves_queued_predictions_and_falls_back():
+    async def scenario():
+        server = serve(ConstantModel())
+        await server.start()
+        pending = [asyncio.create_task(server.predict(f"share otp {i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        await server.stop()
+        results = await asyncio.wait_for(asyncio.gather(*pending), 1)
+        return results, server._queue, await server.predict("share otp now")
+
+    results, queue, after = run(scenario())
+    assert len(results) == 3
+    assert queue is None
+    assert after == keyword_probability("share otp now")
@@ -0,0 +1,24 @@
+import pytest
+
+from app.services.numbers import InvalidNumber, canonical_number
+
+
+@pytest.mark.parametrize("raw, display", [
+    ("9801234567", "+9779801234567"),
+    ("+977 980-123-4567", "+9779801234567"),
+    ("९८०१२३४५६७", "+9779801234567"),
+    ("009779801234567", "+9779801234567"),
+    ("01-4412345", "+97714412345"),
+    # 10 digits always get +977, as the legacy normalize_number did
+    ("0123456789", "+9770123456789"),
+])
+def test_canonical_number(raw, display):
+    number = canonical_number(raw)
+    assert number.display == display
+    assert number.key == int(display[1:])
+
+
+@pytest.mark.parametrize("raw", ["", "0", "977", "00", "abc", "1234567890123456"])
+def test_invalid_number(raw):
+    with pytest.raises(InvalidNumber):
+        canonical_number(raw)
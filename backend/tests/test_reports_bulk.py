@@ -0,0 +1,70 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings
+from app.routers import reports
+
+
+@pytest.fixture
+def client(monkeypatch):
+    chunks = []
+
+    async def fake_add_reports(items):
+        chunks.append(list(items))
+        return [{"number": number} for number, _, _ in items], []
+
+    monkeypatch.setattr(reports, "add_reports", fake_add_reports)
+    monkeypatch.setattr(get_settings(), "reports_bulk_chunk_size", 3)
+    app = FastAPI()
+    app.include_router(reports.router)
+    with TestClient(app) as client:
+        client.chunks = chunks
+        yield client
+
+
+def report(i):
+    return {"number": f"98{i:08d}", "category": "Lottery", "message": f"you won prize {i}"}
+
+
+def test_ndjson_is_written_in_chunks_with_line_errors(client):
+    lines = [json.dumps(report(i)) for i in range(7)]
+    lines.insert(2, '{"number": "1", "category": "Lottery", "message": "short number"}')  # line 3
+    lines.insert(5, "")                                                                   # line 6, skipped
+    lines.insert(6, "not json")                                                           # line 7
+
+    def body():
+        # Split mid-line so lines span stream chunks
+        data = "\n".join(lines).encode()
+        for start in range(0, len(data), 50):
+            yield data[start:start + 50]
+
+    response = client.post("/reports/bulk", content=body(), headers={"content-type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["inserted"] == 7
+    assert [e["index"] for e in result["errors"]] == [3, 7]
+    assert [len(chunk) for chunk in client.chunks] == [3, 3, 1]
+
+
+def test_ndjson_stops_at_max_items(client, monkeypatch):
+    monkeypatch.setattr(get_settings(), "reports_bulk_max_items", 4)
+    body = "\n".join(json.dumps(report(i)) for i in range(6))
+
+    result = client.post("/reports/bulk", content=body, headers={"content-type": "application/x-ndjson"}).json()
+
+    assert result["inserted"] == 4
+    assert [e["index"] for e in result["errors"]] == [5]
+
+
+def test_json_array_reports_item_indexes(client):
+    items = [report(0), {"number": "98"}, report(2), report(3), report(4)]
+
+    result = client.post("/reports/bulk", json=items).json()
+
+    assert result["inserted"] == 4
+    assert [e["index"] for e in result["errors"]] == [1]
+    assert [len(chunk) for chunk in client.chunks] == [3, 1]
@@ -10,8 +10,12 @@ interface AnalysisResult {
   explanation: string;
   image_url?: string;
   storage_path?: string;
+  upload_job_id?: string;
 }
 
+const UPLOAD_POLL_INTERVAL_MS = 1000;
+const UPLOAD_POLL_ATTEMPTS = 15;
+
 export default function ScreenshotAnalyzer() {
   const [file, setFile] = useState<File | null>(null);
   const [preview, setPreview] = useState<string | null>(null);
@@ -67,8 +71,11 @@ export default function ScreenshotAnalyzer() {
         throw new Error(errData.detail || "Analysis failed");
       }
 
-      const data = await resp.json();
+      const data: AnalysisResult = await resp.json();
       setResult(data);
+      if (data.upload_job_id && !data.image_url) {
+        pollUpload(baseUrl, data.upload_job_id);
+      }
     } catch (err: any) {
       setError(err.message || "Failed to analyze screenshot");
     } finally {
@@ -76,6 +83,33 @@ export default function ScreenshotAnalyzer() {
     }
   }
 
+  // Screenshots are stored in the background; pick up the URL once saved
+  async function pollUpload(baseUrl: string, jobId: string) {
+    for (let attempt = 0; attempt < UPLOAD_POLL_ATTEMPTS; attempt++) {
+      await new Promise((resolve) =>
+        setTimeout(resolve, UPLOAD_POLL_INTERVAL_MS)
+      );
+      const resp = await fetch(`${baseUrl}/uploads/${jobId}`).catch(
+        () => null
+      );
+      if (!resp?.ok) continue;
+      const job = await resp.json();
+      if (job.status === "done") {
+        setResult((prev) =>
+          prev && prev.upload_job_id === jobId
+            ? {
+                ...prev,
+                image_url: job.image_url,
+                storage_path: job.storage_path,
+              }
+            : prev
+        );
+        return;
+      }
+      if (job.status === "failed") return;
+    }
+  }
+
   function handleClear() {
     setFile(null);
     setPreview(null);
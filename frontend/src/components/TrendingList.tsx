@@ -1,13 +1,32 @@
 "use client";
 import { useEffect, useState } from "react";
 import clsx from "clsx";
-import { fetchTrending } from "../lib/api";
+import { fetchTrending, subscribeLive } from "../lib/api";
 
 interface TrendingItem {
   number: string;
   reports: number;
 }
 
+interface TrendingDelta {
+  window: string;
+  changed: (TrendingItem & { rank: number })[];
+  removed: string[];
+}
+
+const LIMIT = 10;
+
+// Apply a /live trending delta (absolute ranks and counts) to the current list
+function applyDelta(items: TrendingItem[], delta: TrendingDelta): TrendingItem[] {
+  const ranked = new Map(items.map((it, index) => [it.number, { ...it, rank: index + 1 }]));
+  delta.removed.forEach((number) => ranked.delete(number));
+  delta.changed.forEach((it) => ranked.set(it.number, it));
+  return Array.from(ranked.values())
+    .sort((a, b) => a.rank - b.rank)
+    .slice(0, LIMIT)
+    .map(({ number, reports }) => ({ number, reports }));
+}
+
 export default function TrendingList() {
   const [items, setItems] = useState<TrendingItem[]>([]);
   const [error, setError] = useState<string | null>(null);
@@ -27,8 +46,16 @@ export default function TrendingList() {
       }
     }
     load();
+    // Live updates instead of polling
+    const close = subscribeLive({
+      snapshot: (data) => active && setItems((data.trending?.all || []).slice(0, LIMIT)),
+      trending: (delta: TrendingDelta) => {
+        if (active && delta.window === "all") setItems((items) => applyDelta(items, delta));
+      },
+    });
     return () => {
       active = false;
+      close();
     };
   }, []);
 
@@ -37,3 +37,15 @@ export async function fetchDashboard() {
   if (!r.ok) throw new Error('Dashboard fetch failed')
   return r.json()
 }
+
+type LiveHandlers = Partial<Record<'snapshot' | 'report' | 'reports' | 'dashboard' | 'trending', (data: any) => void>>
+
+// Server-Sent Events from GET /live; EventSource reconnects on its own and
+// every (re)connect starts with a fresh `snapshot`. Returns a close function.
+export function subscribeLive(handlers: LiveHandlers) {
+  const source = new EventSource(`${BASE}/live`)
+  for (const [event, handler] of Object.entries(handlers)) {
+    source.addEventListener(event, (e) => handler?.(JSON.parse((e as MessageEvent).data)))
+  }
+  return () => source.close()
+}